@@ -0,0 +1,195 @@
+"""
+Benchmark del control de admisión bajo sobrecarga.
+
+Levanta la API real con uvicorn sobre una base temporal, con y sin
+ADMISSION_ENABLED, y la satura con muchos clientes concurrentes: la mitad
+crea reservas (escrituras) y la otra mitad lista reservas (lecturas).
+
+Con --lock-ms otro proceso toma el lock de escritura de la base (BEGIN
+IMMEDIATE) durante lock-ms de cada 2 * lock-ms, como un pico de contención
+(migración, carga masiva, otro worker): las escrituras de la API esperan
+busy_timeout y ocupan hilos del threadpool mientras tanto.
+
+Reporta, por modo y clase de ruta: respuestas OK por segundo, 503 (rechazos
+rápidos), otros errores / timeouts del cliente y p50 / p99 de las respuestas
+OK, en JSON. Con admisión, el p99 de las admitidas debe quedar acotado y el
+exceso salir como 503 en milisegundos; sin admisión todas esperan el lock.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_admission.py --clients 128 --seconds 10 --lock-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESERVA = {
+    "nombre_destino": "Cartagena",
+    "fecha_inicio": "2025-06-01",
+    "fecha_fin": "2025-06-08",
+    "monto_reserva": 1500000,
+    "cuotas_reserva": 3,
+}
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(admission: bool, profile: str, extra_env: dict):
+    tmp_dir = tempfile.mkdtemp(prefix="aventa_bench_")
+    db_path = os.path.join(tmp_dir, "bench.sqlite")
+    port = _free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        DB_AUTO_MIGRATE="1",
+        DB_PROFILE=profile,
+        ADMISSION_ENABLED="1" if admission else "0",
+        **extra_env,
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(base_url + "/", timeout=1)
+            return process, base_url, db_path
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit("El servidor no arrancó")
+
+
+def hold_write_lock(db_path: str, lock_ms: float, stop: threading.Event):
+    """
+    Toma y suelta el lock de escritura de SQLite en ciclos de lock_ms.
+    """
+    connection = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    while not stop.is_set():
+        connection.execute("BEGIN IMMEDIATE")
+        stop.wait(lock_ms / 1000)
+        connection.execute("COMMIT")
+        stop.wait(lock_ms / 1000)
+    connection.close()
+
+
+async def run_load(base_url: str, clients: int, seconds: float, timeout: float) -> dict:
+    stats = {
+        name: {"ok": [], "rejected": [], "errors": 0}
+        for name in ("read", "write")
+    }
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        await client.post("/api/users/", json={
+            "nombre_usuario": "Bench", "correo_usuario": "bench@aventa.com", "telefono_usuario": "3000000000"
+        })
+        deadline = time.perf_counter() + seconds
+
+        async def worker(index: int):
+            name = "write" if index % 2 else "read"
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    if name == "write":
+                        response = await client.post("/api/reservas/", json={**RESERVA, "id_usuario": 1})
+                    else:
+                        response = await client.get("/api/reservas/", params={"limit": 100})
+                except httpx.HTTPError:
+                    stats[name]["errors"] += 1
+                    continue
+                elapsed = time.perf_counter() - start
+                if response.status_code == 200:
+                    stats[name]["ok"].append(elapsed)
+                elif response.status_code == 503:
+                    stats[name]["rejected"].append(elapsed)
+                    # Respeta Retry-After acotado: un cliente real no reintenta en bucle
+                    await asyncio.sleep(min(float(response.headers.get("retry-after", 1)), 1.0))
+                else:
+                    stats[name]["errors"] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(clients)))
+        elapsed = time.perf_counter() - started
+        metrics = (await client.get("/metrics")).text
+
+    report = {}
+    for name, values in stats.items():
+        ok, rejected = values["ok"], values["rejected"]
+        report[name] = {
+            "ok": len(ok),
+            "ok_per_sec": round(len(ok) / elapsed, 1),
+            "p50_ms": round(statistics.median(ok) * 1000, 1) if ok else None,
+            "p99_ms": round(_percentile(ok, 99) * 1000, 1) if ok else None,
+            "rejected_503": len(rejected),
+            "rejected_p99_ms": round(_percentile(rejected, 99) * 1000, 1) if rejected else None,
+            "errors": values["errors"],
+        }
+    report["admission_metrics"] = [
+        line for line in metrics.splitlines() if line.startswith("admission_") and not line.startswith("#")
+    ]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=128)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--timeout", type=float, default=30, help="timeout del cliente HTTP (s)")
+    parser.add_argument("--profile", default="production")
+    parser.add_argument("--modes", default="off,on")
+    parser.add_argument("--lock-ms", type=float, default=0, help="picos de lock de escritura externo (ms)")
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes.split(","):
+        process, base_url, db_path = start_server(mode == "on", args.profile, {})
+        stop = threading.Event()
+        locker = None
+        if args.lock_ms > 0:
+            locker = threading.Thread(target=hold_write_lock, args=(db_path, args.lock_ms, stop))
+            locker.start()
+        try:
+            report = asyncio.run(run_load(base_url, args.clients, args.seconds, args.timeout))
+        finally:
+            stop.set()
+            if locker is not None:
+                locker.join()
+            process.terminate()
+            process.wait()
+        results.append({
+            "admission": mode, "clients": args.clients, "profile": args.profile, "lock_ms": args.lock_ms, **report
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
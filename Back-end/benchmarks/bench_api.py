@@ -0,0 +1,324 @@
+"""
+Suite de carga de la API completa (main:app) sobre una base SQLite temporal.
+
+1. Siembra la base con datos sintéticos deterministas (usuarios y reservas)
+   del tamaño indicado: --size 10k | 100k | 1m, o --users / --reservas.
+2. Ejecuta una mezcla de operaciones contra la app real, en proceso (ASGI, sin
+   red) o contra un servidor ya levantado con --base-url:
+   list, get, create, update, delete y search.
+3. Imprime un JSON con p50/p95/p99, peticiones por segundo y errores por
+   operación y en total, el RSS máximo del proceso y las versiones de
+   FastAPI / pydantic / SQLAlchemy y el commit, para comparar entre commits.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_api.py --size 10k --requests 5000 --concurrency 16
+    python benchmarks/bench_api.py --size 100k --mix get=50,list=20,search=20,create=10 --output result.json
+    python benchmarks/bench_api.py --db /tmp/bench.sqlite --skip-seed    # reutiliza una base ya sembrada
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from importlib.metadata import PackageNotFoundError, version
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_MIX = "list=20,get=35,create=10,update=10,delete=5,search=20"
+SEED_BATCH_SIZE = 10_000
+
+NOMBRES = ["Ana", "Luis", "María", "Carlos", "Sofía", "Andrés", "Valentina", "Jorge", "Camila", "Mateo"]
+APELLIDOS = ["Gómez", "Rodríguez", "Martínez", "López", "García", "Pérez", "Sánchez", "Ramírez", "Torres", "Díaz"]
+DESTINOS = [
+    "Cartagena", "Medellín", "San Andrés", "Santa Marta", "Bogotá", "Cali", "Cusco", "Lima",
+    "Cancún", "Madrid", "Barcelona", "París", "Roma", "Buenos Aires", "Punta Cana", "Miami",
+]
+BUSQUEDAS = ["ana", "mar", "carlos", "gom", "rodr", "car", "san", "med", "par", "buenos"]
+
+
+# ==================== DATOS SINTÉTICOS ====================
+
+def synthetic_user(rng: random.Random, index: int) -> dict:
+    nombre = f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}"
+    return {
+        "nombre_usuario": nombre,
+        "correo_usuario": f"usuario{index}@bench.aventa.com",
+        "telefono_usuario": f"3{rng.randint(100000000, 999999999)}",
+    }
+
+
+def synthetic_reserva(rng: random.Random) -> dict:
+    inicio = date(2024, 1, 1) + timedelta(days=rng.randint(0, 730))
+    return {
+        "nombre_destino": rng.choice(DESTINOS),
+        "fecha_inicio": inicio,
+        "fecha_fin": inicio + timedelta(days=rng.randint(1, 21)),
+        "monto_reserva": rng.randint(200, 20000) * 1000,
+        "cuotas_reserva": rng.choice([1, 3, 6, 12]),
+    }
+
+
+def seed_database(engine, users: int, reservas: int, seed: int) -> float:
+    """
+    Crea el esquema (runner de migraciones) y siembra la base. Retorna: segundos empleados.
+    """
+    from sqlalchemy import insert
+
+    from database.migrations.runner import upgrade
+    from models.models import Reserva, User
+
+    start = time.perf_counter()
+    upgrade(engine)
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        for offset in range(0, users, SEED_BATCH_SIZE):
+            batch = range(offset, min(users, offset + SEED_BATCH_SIZE))
+            conn.execute(insert(User), [synthetic_user(rng, i) for i in batch])
+        for offset in range(0, reservas, SEED_BATCH_SIZE):
+            count = min(reservas, offset + SEED_BATCH_SIZE) - offset
+            conn.execute(insert(Reserva), [synthetic_reserva(rng) for _ in range(count)])
+    return time.perf_counter() - start
+
+
+# ==================== CARGA ====================
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise SystemExit(f"Operación desconocida en --mix: {name}")
+        mix[name] = int(weight)
+    return mix
+
+
+class Workload:
+    """
+    Genera las peticiones de cada operación; recuerda los usuarios creados
+    para que `delete` borre solo datos propios del benchmark.
+    """
+
+    def __init__(self, users: int, reservas: int, seed: int):
+        self.rng = random.Random(seed + 1)
+        self.users = max(users, 1)
+        self.reservas = max(reservas, 1)
+        self.created_users = []
+        self.counter = 0
+
+    def next_index(self) -> int:
+        self.counter += 1
+        return self.counter
+
+
+async def op_list(client, w: Workload):
+    path = w.rng.choice(["/api/users/", "/api/reservas/", "/api/plan/"])
+    return await client.get(path, params={"limit": 50})
+
+
+async def op_get(client, w: Workload):
+    return await client.get(f"/api/users/{w.rng.randint(1, w.users)}")
+
+
+async def op_create(client, w: Workload):
+    if w.rng.random() < 0.5:
+        body = synthetic_user(w.rng, f"{os.getpid()}-{time.time_ns()}-{w.next_index()}")
+        response = await client.post("/api/users/", json=body)
+        if response.status_code == 200:
+            w.created_users.append(response.json()["user"]["id_usuario"])
+        return response
+    body = synthetic_reserva(w.rng)
+    body["fecha_inicio"] = body["fecha_inicio"].isoformat()
+    body["fecha_fin"] = body["fecha_fin"].isoformat()
+    return await client.post("/api/reservas/", json=body)
+
+
+async def op_update(client, w: Workload):
+    body = synthetic_reserva(w.rng)
+    body["fecha_inicio"] = body["fecha_inicio"].isoformat()
+    body["fecha_fin"] = body["fecha_fin"].isoformat()
+    return await client.put(f"/api/reservas/{w.rng.randint(1, w.reservas)}", json=body)
+
+
+async def op_delete(client, w: Workload):
+    if not w.created_users:
+        return await op_create(client, w)
+    return await client.delete(f"/api/users/{w.created_users.pop()}")
+
+
+async def op_search(client, w: Workload):
+    path = w.rng.choice(["/api/users/search", "/api/reservas/search"])
+    return await client.get(path, params={"q": w.rng.choice(BUSQUEDAS)})
+
+
+OPERATIONS = {
+    "list": op_list,
+    "get": op_get,
+    "create": op_create,
+    "update": op_update,
+    "delete": op_delete,
+    "search": op_search,
+}
+
+
+async def run_load(client, workload: Workload, mix: dict, requests: int, concurrency: int, warmup: int) -> dict:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    remaining = [warmup + requests]
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            measured = remaining[0] < requests
+            name = workload.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await OPERATIONS[name](client, workload)
+                failed = response.status_code >= 500
+            except Exception:
+                failed = True
+            if measured:
+                latencies[name].append(time.perf_counter() - start)
+                errors[name] += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    report = {name: _summary(latencies[name], errors[name], elapsed) for name in names}
+    everything = [value for values in latencies.values() for value in values]
+    report["total"] = _summary(everything, sum(errors.values()), elapsed)
+    return report
+
+
+def _percentile(values, pct):
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def _summary(values, errors: int, elapsed: float) -> dict:
+    if not values:
+        return {"requests": 0, "errors": errors}
+    values = sorted(values)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 1),
+        "p50_ms": round(statistics.median(values) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+        "p99_ms": round(_percentile(values, 99) * 1000, 3),
+    }
+
+
+# ==================== ENTORNO ====================
+
+def _package_versions() -> dict:
+    versions = {}
+    for package in ("fastapi", "starlette", "pydantic", "sqlalchemy"):
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+    versions["python"] = sys.version.split()[0]
+    return versions
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss viene en KiB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="10k", help="usuarios y reservas a sembrar")
+    parser.add_argument("--users", type=int, help="sobrescribe la cantidad de usuarios de --size")
+    parser.add_argument("--reservas", type=int, help="sobrescribe la cantidad de reservas de --size")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="pesos por operación, ej. get=50,list=50")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="archivo SQLite a usar (por defecto uno temporal)")
+    parser.add_argument("--skip-seed", action="store_true", help="no siembra (la base de --db ya tiene datos)")
+    parser.add_argument("--base-url", help="servidor ya levantado; si no, se usa main:app en proceso")
+    parser.add_argument("--output", help="archivo donde guardar el JSON además de imprimirlo")
+    args = parser.parse_args()
+
+    users = args.users if args.users is not None else SIZES[args.size]
+    reservas = args.reservas if args.reservas is not None else SIZES[args.size]
+    mix = parse_mix(args.mix)
+
+    import httpx
+
+    seed_seconds = None
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="aventa_bench_"), "bench.sqlite")
+        # La URL debe fijarse antes de importar la app (el engine se crea al importar)
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+        from database.database import engine
+
+        if not args.skip_seed:
+            seed_seconds = round(seed_database(engine, users, reservas, args.seed), 2)
+
+        from main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    async def run():
+        async with client:
+            return await run_load(
+                client, Workload(users, reservas, args.seed), mix, args.requests, args.concurrency, args.warmup
+            )
+
+    results = asyncio.run(run())
+    report = {
+        "commit": _git_commit(),
+        "versions": _package_versions(),
+        "config": {
+            "users": users,
+            "reservas": reservas,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "target": args.base_url or "in-process",
+            "api_mode": os.getenv("API_MODE", "sync"),
+            "db_profile": os.getenv("DB_PROFILE", "production"),
+        },
+        "seed_seconds": seed_seconds,
+        "results": results,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark de perfiles del engine SQLite (default vs production).
+
+Ejecuta tráfico mixto de lectura/escritura desde varios hilos (como el
+threadpool de FastAPI) contra una base temporal y reporta throughput,
+latencias y errores "database is locked" por perfil, en JSON.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_engine.py --threads 16 --seconds 5 --write-ratio 0.2
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database.database import create_db_engine  # noqa: E402
+
+SEED_ROWS = 5000
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_profile(profile: str, threads: int, seconds: float, write_ratio: float) -> dict:
+    tmp_dir = tempfile.mkdtemp(prefix="aventa_bench_")
+    url = f"sqlite:///{os.path.join(tmp_dir, 'bench.sqlite')}"
+    engine = create_db_engine(url, profile)
+    Session = sessionmaker(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE users (id_usuario INTEGER PRIMARY KEY, nombre_usuario TEXT, "
+            "correo_usuario TEXT, telefono_usuario TEXT)"
+        ))
+        conn.execute(
+            text("INSERT INTO users (nombre_usuario, correo_usuario, telefono_usuario) VALUES (:n, :c, :t)"),
+            [{"n": f"user{i}", "c": f"user{i}@mail.com", "t": "3000000000"} for i in range(SEED_ROWS)],
+        )
+
+    latencies = {"read": [], "write": []}
+    errors = {"count": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed):
+        rng = random.Random(seed)
+        local = {"read": [], "write": []}
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            kind = "write" if rng.random() < write_ratio else "read"
+            start = time.perf_counter()
+            db = Session()
+            try:
+                if kind == "write":
+                    db.execute(
+                        text("INSERT INTO users (nombre_usuario, correo_usuario, telefono_usuario) VALUES (:n, :c, :t)"),
+                        {"n": "bench", "c": "bench@mail.com", "t": "3000000000"},
+                    )
+                    db.commit()
+                else:
+                    db.execute(
+                        text("SELECT * FROM users WHERE id_usuario = :id"),
+                        {"id": rng.randint(1, SEED_ROWS)},
+                    ).fetchall()
+                local[kind].append(time.perf_counter() - start)
+            except Exception:
+                db.rollback()
+                local_errors += 1
+            finally:
+                db.close()
+        with lock:
+            latencies["read"].extend(local["read"])
+            latencies["write"].extend(local["write"])
+            errors["count"] += local_errors
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    engine.dispose()
+
+    result = {"profile": profile, "errors": errors["count"]}
+    total = 0
+    for kind, values in latencies.items():
+        total += len(values)
+        result[kind] = {
+            "ops": len(values),
+            "p50_ms": round(statistics.median(values) * 1000, 3) if values else None,
+            "p99_ms": round(_percentile(values, 99) * 1000, 3) if values else None,
+        }
+    result["ops_per_sec"] = round(total / seconds, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--profiles", nargs="+", default=["default", "production"])
+    args = parser.parse_args()
+
+    results = [run_profile(p, args.threads, args.seconds, args.write_ratio) for p in args.profiles]
+    if len(results) >= 2 and results[0]["ops_per_sec"]:
+        results.append({"speedup": round(results[-1]["ops_per_sec"] / results[0]["ops_per_sec"], 2)})
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
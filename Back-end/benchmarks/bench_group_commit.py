@@ -0,0 +1,130 @@
+"""
+Benchmark del group commit de reservas.
+
+Varios hilos (como el threadpool de FastAPI) crean reservas durante unos
+segundos contra una base temporal, en dos modos:
+
+- "individual": Session + add + commit por reserva (create_reserva por defecto).
+- "group_commit": GroupCommitter.submit(...).result() (RESERVA_GROUP_COMMIT=1).
+
+Reporta, por perfil del engine y modo: filas/s, latencias p50/p95/p99,
+errores y tamaño promedio de lote, en JSON.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_group_commit.py --threads 32 --seconds 5 --profiles default,production
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database.database import create_db_engine  # noqa: E402
+from database.group_commit import GroupCommitter  # noqa: E402
+from models.models import Base, Reserva as ReservaModel  # noqa: E402
+
+VALUES = {
+    "nombre_destino": "Cartagena",
+    "fecha_inicio": date(2025, 6, 1),
+    "fecha_fin": date(2025, 6, 8),
+    "monto_reserva": 1500000,
+    "cuotas_reserva": 3,
+}
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run(profile: str, mode: str, threads: int, seconds: float, max_batch: int, wait_ms: float) -> dict:
+    tmp_dir = tempfile.mkdtemp(prefix="aventa_bench_")
+    engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.sqlite')}", profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    committer = GroupCommitter(engine, ReservaModel.__table__, max_batch=max_batch, max_wait_ms=wait_ms)
+
+    latencies = []
+    errors = {"count": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if mode == "group_commit":
+                    committer.submit(dict(VALUES)).result()
+                else:
+                    db = Session()
+                    try:
+                        db.add(ReservaModel(**VALUES))
+                        db.commit()
+                    finally:
+                        db.close()
+            except Exception:
+                local_errors += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors["count"] += local_errors
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    committer.stop()
+    engine.dispose()
+
+    result = {
+        "profile": profile,
+        "mode": mode,
+        "rows": len(latencies),
+        "rows_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3) if latencies else None,
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3) if latencies else None,
+        "errors": errors["count"],
+    }
+    if mode == "group_commit":
+        result["batches"] = committer.stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--profiles", default="default,production")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--wait-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    results = [
+        run(profile, mode, args.threads, args.seconds, args.max_batch, args.wait_ms)
+        for profile in args.profiles.split(",")
+        for mode in ("individual", "group_commit")
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark del motor de cotizaciones.
+
+- "loop": una cotización a la vez en Python (como lo hacía el cliente).
+- "numpy": el lote completo con routers.quotes.cotizador.quote_batch.
+- "endpoint": POST /api/quotes/batch de punta a punta (validación, cálculo y JSON),
+  contra una base temporal con planes sembrados.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_quotes.py --montos 125 --planes 20 --cuotas 20 --repeat 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def quote_loop(montos, descuentos, cuotas, redondeo):
+    resultados = []
+    for monto, descuento, n_cuotas in zip(montos, descuentos, cuotas):
+        total = (monto * (100 - descuento) + 50) // 100
+        valor_cuota = (total // n_cuotas) // redondeo * redondeo
+        resultados.append((total, valor_cuota, total - valor_cuota * (n_cuotas - 1)))
+    return resultados
+
+
+def _median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--montos", type=int, default=125)
+    parser.add_argument("--planes", type=int, default=20)
+    parser.add_argument("--cuotas", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="aventa_bench_"), "bench.sqlite")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DB_AUTO_MIGRATE"] = "1"
+
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from routers.quotes.cotizador import build_combinations, quote_batch
+
+    body = {
+        "montos": [100000 + 1000 * i for i in range(args.montos)],
+        "id_planes": list(range(1, args.planes + 1)),
+        "cuotas": list(range(1, args.cuotas + 1)),
+        "redondeo": 100,
+    }
+
+    with TestClient(app) as client:
+        for i in range(args.planes):
+            client.post("/api/plan/", json={"nombre_plan": f"Plan {i}", "categoria_plan": "bench", "descuento_plan": i % 50})
+
+        montos, planes, cuotas = build_combinations(body["montos"], body["id_planes"], body["cuotas"], "producto")
+        descuentos = planes % 50
+        montos_l, descuentos_l, cuotas_l = montos.tolist(), descuentos.tolist(), cuotas.tolist()
+
+        results = {
+            "cotizaciones": len(montos),
+            "loop_ms": _median_ms(lambda: quote_loop(montos_l, descuentos_l, cuotas_l, 100), args.repeat),
+            "numpy_ms": _median_ms(lambda: quote_batch(montos, descuentos, cuotas, 100), args.repeat),
+            "endpoint_ms": _median_ms(lambda: client.post("/api/quotes/batch", json=body), args.repeat),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark de serialización de listados (ruta anterior vs ruta rápida).
+
+- "orm": entidades ORM completas -> dict escrito a mano -> jsonable_encoder -> json.dumps
+  (lo que hacía FastAPI al devolver un dict desde el handler).
+- "columns": tuplas de columnas (USER_COLUMNS) -> rows_to_dicts -> orjson.
+
+Usa una base temporal con usuarios sembrados y mide tiempo por página y
+memoria asignada (tracemalloc) para páginas de distintos tamaños, en JSON.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_serialization.py --rows 20000 --page-sizes 100 1000 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database.database import Base, create_db_engine  # noqa: E402
+from models.models import User, USER_COLUMNS  # noqa: E402
+from utils import rows_to_dicts, dumps  # noqa: E402
+
+
+def serialize_orm(db, limit: int) -> bytes:
+    users = db.query(User).order_by(User.id_usuario).limit(limit).all()
+    users_dict = []
+    for user in users:
+        users_dict.append({
+            'id_usuario': user.id_usuario,
+            'nombre_usuario': user.nombre_usuario,
+            'correo_usuario': user.correo_usuario,
+            'telefono_usuario': user.telefono_usuario,
+            'fecha_creacion': user.fecha_creacion,
+            'fecha_actualizacion': user.fecha_actualizacion,
+        })
+    payload = jsonable_encoder({"usuarios": users_dict, "next_cursor": None, "limit": limit})
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def serialize_columns(db, limit: int) -> bytes:
+    users = db.query(*USER_COLUMNS).order_by(User.id_usuario).limit(limit).all()
+    return dumps({"usuarios": rows_to_dicts(users), "next_cursor": None, "limit": limit})
+
+
+STRATEGIES = {"orm": serialize_orm, "columns": serialize_columns}
+
+
+def measure(Session, strategy, limit: int, repeat: int) -> dict:
+    fn = STRATEGIES[strategy]
+    timings = []
+    for _ in range(repeat):
+        db = Session()
+        try:
+            start = time.perf_counter()
+            body = fn(db, limit)
+            timings.append(time.perf_counter() - start)
+        finally:
+            db.close()
+
+    db = Session()
+    try:
+        tracemalloc.start()
+        fn(db, limit)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+
+    return {
+        "strategy": strategy,
+        "page_size": limit,
+        "p50_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "body_bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--page-sizes", nargs="+", type=int, default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="aventa_bench_")
+    engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.sqlite')}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {
+                "nombre_usuario": f"Usuario {i}",
+                "correo_usuario": f"user{i}@mail.com",
+                "telefono_usuario": "3000000000",
+                "fecha_creacion": now,
+                "fecha_actualizacion": now,
+            }
+            for i in range(args.rows)
+        ])
+    Session = sessionmaker(bind=engine)
+
+    results = []
+    for limit in args.page_sizes:
+        orm = measure(Session, "orm", limit, args.repeat)
+        columns = measure(Session, "columns", limit, args.repeat)
+        results.extend([orm, columns, {"page_size": limit, "speedup": round(orm["p50_ms"] / columns["p50_ms"], 2)}])
+    engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
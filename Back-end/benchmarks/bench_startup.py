@@ -0,0 +1,104 @@
+"""
+Benchmark de arranque de un worker.
+
+Mide, en procesos nuevos (como un worker recién creado al autoescalar):
+- "import": tiempo de `import main`.
+- "ready": desde que se lanza uvicorn hasta que responde la primera petición
+  (incluye intérprete, imports, lifespan/chequeo de esquema y primera conexión).
+
+La base temporal se prepara una sola vez con el runner de migraciones, como
+en un despliegue real. Imprime un JSON con mediana / mínimo / máximo.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict) -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_ready(env: dict, timeout: float = 30.0) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn terminó con código {process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/users/?limit=1", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("uvicorn no respondió a tiempo")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _summary(values) -> dict:
+    return {
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "min_ms": round(min(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--db", help="archivo SQLite a usar (por defecto uno temporal)")
+    parser.add_argument("--skip-prepare", action="store_true", help="no aplicar migraciones antes de medir")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="aventa_bench_"), "bench.sqlite")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    if not args.skip_prepare:
+        subprocess.check_call(
+            [sys.executable, "-m", "database.migrations.runner", "upgrade"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+        )
+
+    # Una pasada previa compila los .pyc, igual que una imagen ya construida
+    measure_import(env)
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    ready = [measure_ready(env) for _ in range(args.runs)]
+    print(json.dumps({"runs": args.runs, "import": _summary(imports), "ready": _summary(ready)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
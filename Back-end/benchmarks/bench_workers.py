@@ -0,0 +1,297 @@
+"""
+Benchmark y verificación del modo de varios workers (serve.py).
+
+Por cada cantidad de workers levanta serve.py sobre una base temporal, la
+llena con reservas y mide:
+
+- lecturas: GET /reservas/ (página de 50) y GET /reservas/{id} desde varios
+  procesos cliente durante --seconds. Reporta peticiones OK por segundo y
+  p50 / p99. Con un worker por núcleo libre el throughput debería crecer
+  casi lineal. Los clientes también usan CPU: en una máquina chica conviene
+  correrlos en otra.
+- correctitud con escrituras concurrentes entre workers:
+  - cada escritor actualiza reservas y enseguida repite el GET de la fila con
+    el ETag de antes, por una conexión nueva (puede caer en otro worker). Un
+    304 ahí es una lectura vieja (`stale_304`);
+  - cada alta va con Idempotency-Key y se reintenta una vez: la cantidad de
+    filas nuevas debe ser igual a la de claves distintas;
+  - un suscriptor SSE debe recibir todos los seq del registro, sin huecos;
+  - el resumen de reportes y change_log deben quedar consistentes.
+
+Resultado registrado (1 núcleo, --workers 1,2 --seconds 5 --rows 2000
+--clients 16 --writers 2): lecturas 145.8 -> 97.8 ok/s (speedup 0.67; con un
+solo núcleo los workers compiten por la CPU), sin 304 viejos, sin altas
+duplicadas, change_log contiguo, SSE sin huecos ni desorden y el resumen
+consistente. El escalado de lecturas con varios núcleos no está medido: hay
+que correrlo en una máquina con núcleos libres.
+
+Uso (desde Back-end/):
+    python benchmarks/bench_workers.py --workers 1,2,4 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from database.resumen import CHECK_RESUMEN  # noqa: E402
+
+RESERVA = {
+    "nombre_destino": "Cartagena",
+    "fecha_inicio": "2025-06-01",
+    "fecha_fin": "2025-06-08",
+    "monto_reserva": 1500000,
+    "cuotas_reserva": 3,
+    "id_usuario": 1,
+}
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int):
+    tmp_dir = tempfile.mkdtemp(prefix="aventa_workers_")
+    db_path = os.path.join(tmp_dir, "bench.sqlite")
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    process = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            httpx.get(base_url + "/", timeout=1)
+            # Los workers terminan de arrancar a destiempo: se da margen al último
+            time.sleep(1 + workers * 0.5)
+            return process, base_url, db_path
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit("El servidor no arrancó")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def seed(base_url: str, rows: int):
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        client.post("/api/users/", json={
+            "nombre_usuario": "Bench", "correo_usuario": "bench@aventa.com", "telefono_usuario": "3000000000"
+        }).raise_for_status()
+        for start in range(0, rows, 1000):
+            batch = [
+                {**RESERVA, "nombre_destino": f"Destino {index % 50}", "monto_reserva": 1000 + index}
+                for index in range(start, min(rows, start + 1000))
+            ]
+            client.post("/api/reservas/bulk", json=batch).raise_for_status()
+
+
+# ==================== LECTURAS ====================
+
+def _read_client(base_url: str, clients: int, seconds: float, rows: int, queue):
+    async def run():
+        latencies, errors = [], 0
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+            deadline = time.perf_counter() + seconds
+
+            async def loop():
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    if random.random() < 0.5:
+                        path, params = "/api/reservas/", {"limit": 50}
+                    else:
+                        path, params = f"/api/reservas/{random.randint(1, rows)}", None
+                    start = time.perf_counter()
+                    try:
+                        response = await client.get(path, params=params)
+                    except httpx.HTTPError:
+                        errors += 1
+                        continue
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+
+            await asyncio.gather(*(loop() for _ in range(clients)))
+        return latencies, errors
+
+    queue.put(asyncio.run(run()))
+
+
+def measure_reads(base_url: str, procs: int, clients: int, seconds: float, rows: int) -> dict:
+    queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_read_client, args=(base_url, max(1, clients // procs), seconds, rows, queue))
+        for _ in range(procs)
+    ]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    latencies = [value for values, _ in results for value in values]
+    return {
+        "ok_per_sec": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "errors": sum(errors for _, errors in results),
+    }
+
+
+# ==================== CORRECTITUD ====================
+
+def _sse_listener(base_url: str, seqs: list, ready: threading.Event, stop: threading.Event):
+    try:
+        with httpx.Client(base_url=base_url, timeout=None) as client:
+            with client.stream("GET", "/api/changes/stream") as stream:
+                for line in stream.iter_lines():
+                    if line.startswith("event: ready"):
+                        ready.set()
+                    elif line.startswith("data:") and '"seq"' in line:
+                        seqs.append(json.loads(line[5:])["seq"])
+                    if stop.is_set():
+                        return
+    except httpx.HTTPError:
+        # El servidor se apagó con el stream abierto
+        return
+
+
+def check_writes(base_url: str, db_path: str, writers: int, seconds: float, rows: int) -> dict:
+    seqs, ready, stop = [], threading.Event(), threading.Event()
+    listener = threading.Thread(target=_sse_listener, args=(base_url, seqs, ready, stop), daemon=True)
+    listener.start()
+    ready.wait(10)
+
+    stats = {"updates": 0, "stale_304": 0, "keys": 0, "creates_ok": 0, "errors": 0}
+    lock = threading.Lock()
+    created_before = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM reserva").fetchone()[0]
+
+    def writer(index: int):
+        deadline = time.time() + seconds
+        while time.time() < deadline:
+            reserva_id = random.randint(1, rows)
+            path = f"/api/reservas/{reserva_id}"
+            try:
+                # Conexión nueva en cada paso: el kernel reparte entre los workers
+                etag = httpx.get(base_url + path).headers.get("etag")
+                body = {**RESERVA, "monto_reserva": random.randint(1000, 10 ** 6)}
+                if httpx.put(base_url + path, json=body).status_code != 200:
+                    with lock:
+                        stats["errors"] += 1
+                    continue
+                response = httpx.get(base_url + path, headers={"If-None-Match": etag} if etag else {})
+                with lock:
+                    stats["updates"] += 1
+                    stats["stale_304"] += response.status_code == 304
+
+                key = f"bench-{index}-{uuid.uuid4()}"
+                statuses = [
+                    httpx.post(base_url + "/api/reservas/", json=RESERVA, headers={"Idempotency-Key": key}).status_code
+                    for _ in range(2)
+                ]
+                with lock:
+                    stats["keys"] += 1
+                    stats["creates_ok"] += statuses[0] == 200
+            except httpx.HTTPError:
+                with lock:
+                    stats["errors"] += 1
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Los workers publican lo ajeno cada CHANGES_POLL_INTERVAL: margen para los últimos eventos
+    time.sleep(1)
+    stop.set()
+    httpx.get(base_url + "/api/users/")
+
+    connection = sqlite3.connect(db_path)
+    created = connection.execute("SELECT COUNT(*) FROM reserva").fetchone()[0] - created_before
+    first_seq, last_seq, log_rows = connection.execute(
+        "SELECT MIN(seq), MAX(seq), COUNT(*) FROM change_log"
+    ).fetchone()
+    resumen_diffs = connection.execute(CHECK_RESUMEN).fetchall()
+    connection.close()
+
+    received = sorted(set(seqs))
+    missing = 0
+    if received:
+        missing = (received[-1] - received[0] + 1) - len(received)
+    return {
+        **stats,
+        "rows_created": created,
+        "duplicate_creates": created - stats["creates_ok"],
+        "change_log_contiguous": log_rows == (last_seq - first_seq + 1) if log_rows else True,
+        "sse_events": len(seqs),
+        "sse_missing": missing,
+        "sse_out_of_order": seqs != sorted(seqs),
+        "resumen_consistente": not resumen_diffs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--client-procs", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    results = []
+    for workers in sorted({int(value) for value in args.workers.split(",")}):
+        process, base_url, db_path = start_server(workers)
+        try:
+            seed(base_url, args.rows)
+            reads = measure_reads(base_url, args.client_procs, args.clients, args.seconds, args.rows)
+            writes = check_writes(base_url, db_path, args.writers, args.seconds, args.rows)
+        finally:
+            stop_server(process)
+        results.append({"workers": workers, "cpu_count": os.cpu_count(), "reads": reads, "writes": writes})
+
+    base = results[0]["reads"]["ok_per_sec"] or 1
+    for result in results:
+        result["reads"]["speedup"] = round(result["reads"]["ok_per_sec"] / base, 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
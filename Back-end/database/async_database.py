@@ -0,0 +1,61 @@
+"""
+Capa de datos asíncrona (AsyncEngine + AsyncSession con el driver aiosqlite).
+
+Se usa cuando la API arranca con API_MODE=async. Reutiliza la URL y el perfil
+de pragmas del engine síncrono; el engine se crea la primera vez que se pide,
+así el modo síncrono no necesita tener aiosqlite instalado.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database.database import DB_PROFILE, apply_sqlite_pragmas, database_url, get_engine_settings
+from database.profiler import install_query_profiler
+
+async_engine = None
+AsyncSessionLocal = None
+
+
+def to_async_url(url: str) -> str:
+    """
+    Convierte la URL síncrona de SQLite a la del driver aiosqlite.
+    """
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+
+def create_async_db_engine(url: str = database_url, profile: str = DB_PROFILE):
+    """
+    Crea el AsyncEngine aplicando los mismos PRAGMA del perfil en cada conexión.
+    """
+    settings = get_engine_settings(profile)
+    db_engine = create_async_engine(
+        to_async_url(url),
+        echo=False,
+        pool_size=settings["pool_size"],
+        max_overflow=settings["max_overflow"],
+        pool_timeout=settings["pool_timeout"],
+    )
+
+    apply_sqlite_pragmas(db_engine.sync_engine, settings["pragmas"])
+    return db_engine
+
+
+def init_async_db():
+    """
+    Inicializa (una sola vez) el AsyncEngine y la fábrica de sesiones.
+    """
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        async_engine = create_async_db_engine()
+        install_query_profiler(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return async_engine
+
+
+async def get_async_db():
+    init_async_db()
+    async with AsyncSessionLocal() as db:
+        yield db
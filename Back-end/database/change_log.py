@@ -0,0 +1,264 @@
+"""
+Registro de cambios compartido entre procesos (varios workers sobre la misma base).
+
+Con un solo proceso el feed de cambios, las versiones de los ETag y las cachés
+viven en memoria y se actualizan cuando los handlers publican. Con varios
+workers cada uno solo ve sus propias escrituras. Por eso la base misma anota
+cada cambio: los triggers de users, reserva y plan insertan en change_log
+(seq, tabla, op, id) dentro de la misma transacción que el cambio, igual que
+las tablas FTS y el resumen. El registro cubre handlers, /bulk y el group
+commit sin cambios.
+
+SQLite tiene un solo escritor a la vez. Por eso los seq (AUTOINCREMENT) quedan
+confirmados en orden y sin huecos, y todos los workers ven la misma secuencia.
+Cada worker la sigue con `ChangeLogFollower`:
+
+- lee las entradas con seq > el último que aplicó y las filas actuales de
+  esos ids, y las publica en su ChangeFeed con el seq global. Con eso suben
+  las versiones de tabla / fila y se vacía la caché de planes, y los
+  suscriptores SSE de ese worker reciben el evento;
+- un hilo consulta cada `interval` segundos (la demora máxima del SSE entre
+  workers) y despierta antes si el mismo worker acaba de escribir;
+- `refresh()` compara MAX(seq) con lo aplicado. Es una búsqueda en el
+  extremo del índice y se hace antes de cada GET con versión (en el
+  threadpool, fuera del event loop), así que un 304 nunca se responde con una
+  versión vieja.
+
+El registro guarda las últimas CHANGE_LOG_RETENTION entradas (el trigger de
+recorte corre cada 1000 inserciones). change_log_epoch guarda un valor al
+azar por base, que va en los ETag en lugar del inicio del proceso: los workers
+comparten ETag y uno nuevo sirve después de un reinicio, salvo que se
+reemplace la base.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+logger = logging.getLogger("aventa.change_log")
+
+CHANGE_LOG_TABLE = "change_log"
+CHANGE_LOG_RETENTION = 100000
+
+# Tabla de la base -> (nombre de la tabla en los eventos, llave primaria)
+LOGGED_TABLES = {
+    "users": ("users", "id_usuario"),
+    "reserva": ("reservas", "id_reserva"),
+    "plan": ("plan", "id_plan"),
+}
+
+CHANGE_LOG_DDL = [
+    f"""CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabla TEXT NOT NULL,
+        op TEXT NOT NULL,
+        entity_id INTEGER NOT NULL,
+        ts REAL NOT NULL DEFAULT ((julianday('now') - 2440587.5) * 86400.0)
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS change_log_trim AFTER INSERT ON {CHANGE_LOG_TABLE}
+        WHEN NEW.seq % 1000 = 0 BEGIN
+        DELETE FROM {CHANGE_LOG_TABLE} WHERE seq <= NEW.seq - {CHANGE_LOG_RETENTION};
+    END""",
+    "CREATE TABLE IF NOT EXISTS change_log_epoch (epoch TEXT NOT NULL)",
+    """INSERT INTO change_log_epoch (epoch)
+        SELECT lower(hex(randomblob(6))) WHERE NOT EXISTS (SELECT 1 FROM change_log_epoch)""",
+]
+
+
+def _triggers(table: str) -> List[str]:
+    event_table, pk = LOGGED_TABLES[table]
+    insert = f"INSERT INTO {CHANGE_LOG_TABLE} (tabla, op, entity_id) VALUES ('{event_table}'"
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_change_log_ai AFTER INSERT ON {table} BEGIN
+        {insert}, 'insert', NEW.{pk});
+    END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_change_log_au AFTER UPDATE ON {table} BEGIN
+        {insert}, 'update', NEW.{pk});
+    END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_change_log_ad AFTER DELETE ON {table} BEGIN
+        {insert}, 'delete', OLD.{pk});
+    END""",
+    ]
+
+
+CHANGE_LOG_TRIGGERS = {table: _triggers(table) for table in LOGGED_TABLES}
+
+# Entradas leídas por consulta y filas por IN al completar los eventos
+READ_BATCH = 5000
+ROWS_CHUNK = 500
+
+# (seq, tabla, op, id, fila o None, momento)
+LogEvent = Tuple[int, str, str, int, Optional[dict], float]
+
+
+def sqlite_path(engine) -> Optional[str]:
+    """
+    Ruta del archivo SQLite del engine, o None si no es un archivo (memoria / otro motor).
+    """
+    if engine.url.get_backend_name() != "sqlite":
+        return None
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    return database
+
+
+def log_position(engine) -> Tuple[str, int, int]:
+    """
+    Retorna: (epoch de la base, seq más viejo conservado, último seq)
+    """
+    with engine.connect() as connection:
+        epoch = connection.exec_driver_sql("SELECT epoch FROM change_log_epoch").scalar()
+        oldest, last = connection.exec_driver_sql(
+            f"SELECT MIN(seq), MAX(seq) FROM {CHANGE_LOG_TABLE}"
+        ).one()
+    return epoch, oldest or 0, last or 0
+
+
+# ==================== SEGUIDOR ====================
+
+class ChangeLogFollower:
+    """
+    Aplica las entradas nuevas de change_log en `publish`, en orden de seq.
+
+    - tables: nombre de la tabla en los eventos -> (columnas públicas, llave primaria)
+    - publish: recibe una lista de LogEvent (ej. ChangeFeed.extend)
+    - interval: segundos entre consultas del hilo de fondo
+    """
+
+    def __init__(self, engine, tables: Dict[str, Tuple[Sequence, object]],
+                 publish: Callable[[List[LogEvent]], None], interval: float = 0.1):
+        self.engine = engine
+        self.tables = tables
+        self.publish = publish
+        self.interval = interval
+        self.last_seq = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Conexión propia para el chequeo de refresh(): no depende del pool
+        self._probe: Optional[sqlite3.Connection] = None
+        self._probe_lock = threading.Lock()
+
+    def start(self, from_seq: int):
+        """
+        Empieza a seguir el registro desde `from_seq` (las entradas posteriores se aplican).
+        """
+        self.last_seq = from_seq
+        path = sqlite_path(self.engine)
+        if path is not None:
+            self._probe = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.catch_up()
+        self._thread = threading.Thread(target=self._run, name="change-log-follower", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._probe is not None:
+            self._probe.close()
+
+    def notify(self):
+        """
+        Despierta al hilo de fondo (después de una escritura en este worker).
+        """
+        self._wake.set()
+
+    def head(self) -> int:
+        """
+        Último seq confirmado en la base.
+        """
+        if self._probe is None:
+            with self.engine.connect() as connection:
+                return connection.exec_driver_sql(f"SELECT MAX(seq) FROM {CHANGE_LOG_TABLE}").scalar() or 0
+        with self._probe_lock:
+            return self._probe.execute(f"SELECT MAX(seq) FROM {CHANGE_LOG_TABLE}").fetchone()[0] or 0
+
+    def is_behind(self) -> bool:
+        return self.head() > self.last_seq
+
+    def refresh(self):
+        """
+        Aplica las entradas pendientes, si las hay (chequeo de una consulta si no).
+        """
+        if self.is_behind():
+            self.catch_up()
+
+    def catch_up(self) -> int:
+        """
+        Aplica todas las entradas con seq > last_seq. Retorna: cuántas se aplicaron
+        """
+        applied = 0
+        with self._lock:
+            while True:
+                with self.engine.connect() as connection:
+                    entries = connection.exec_driver_sql(
+                        f"SELECT seq, tabla, op, entity_id, ts FROM {CHANGE_LOG_TABLE} "
+                        f"WHERE seq > ? ORDER BY seq LIMIT {READ_BATCH}",
+                        (self.last_seq,),
+                    ).all()
+                    if not entries:
+                        return applied
+                    if entries[0][0] != self.last_seq + 1 and self.last_seq:
+                        logger.warning(
+                            "change_log recortado: se esperaba seq %d y el más viejo es %d",
+                            self.last_seq + 1, entries[0][0],
+                        )
+                    events = self._events(connection, entries)
+                self.publish(events)
+                self.last_seq = entries[-1][0]
+                applied += len(entries)
+                if len(entries) < READ_BATCH:
+                    return applied
+
+    def _events(self, connection, entries) -> List[LogEvent]:
+        """
+        Completa las entradas con la fila actual (una consulta IN por tabla y bloque).
+        Si la fila ya no existe (se borró después) el insert / update sale como
+        delete: el borrado llega enseguida con un seq mayor.
+        """
+        wanted: Dict[str, set] = {}
+        for _, table, op, entity_id, _ in entries:
+            if op != "delete" and table in self.tables:
+                wanted.setdefault(table, set()).add(entity_id)
+
+        rows: Dict[Tuple[str, int], dict] = {}
+        for table, ids in wanted.items():
+            columns, pk_column = self.tables[table]
+            ids = sorted(ids)
+            for start in range(0, len(ids), ROWS_CHUNK):
+                result = connection.execute(
+                    select(*columns).where(pk_column.in_(ids[start:start + ROWS_CHUNK]))
+                )
+                for row in result.mappings():
+                    rows[(table, row[pk_column.key])] = dict(row)
+
+        events = []
+        for seq, table, op, entity_id, ts in entries:
+            data = None
+            if op != "delete":
+                data = rows.get((table, entity_id))
+                if data is None:
+                    op = "delete"
+            events.append((seq, table, op, entity_id, data, ts))
+        return events
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.refresh()
+            except Exception:
+                # La base puede estar ocupada (lock) o rotando el WAL: se reintenta
+                logger.exception("No se pudo leer change_log")
+                time.sleep(self.interval)
@@ -1,17 +1,111 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from database.profiler import install_query_profiler
+
 
 sqlliteName = "AventaTravel_Group.sqlite"
 base_dir = os.path.dirname(os.path.abspath(__file__))
-database_url = f"sqlite:///{os.path.join(base_dir, sqlliteName)}"
+database_url = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(base_dir, sqlliteName)}")
+
+
+# ==================== PERFILES DEL ENGINE ====================
+# "default": comportamiento original de SQLite (rollback journal, synchronous=FULL).
+# "production": WAL + pragmas para concurrencia de lectura/escritura desde el threadpool.
+# Ambos activan foreign_keys: SQLite solo valida las FK si se pide en cada conexión.
+ENGINE_PROFILES = {
+    "default": {
+        "pragmas": {
+            "foreign_keys": "ON",
+        },
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "production": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -64000,       # en KiB (negativo) -> 64 MB
+            "mmap_size": 268435456,     # 256 MB
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,       # ms
+            "foreign_keys": "ON",
+        },
+        "pool_size": 20,
+        "max_overflow": 20,
+    },
+}
+
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+
+
+def get_engine_settings(profile: str = DB_PROFILE) -> dict:
+    """
+    Retorna la configuración del perfil, con los overrides de variables de entorno:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT y DB_PRAGMA_<NOMBRE> (ej. DB_PRAGMA_CACHE_SIZE).
+    """
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Perfil de base de datos desconocido: {profile}")
+
+    base = ENGINE_PROFILES[profile]
+    pragmas = dict(base["pragmas"])
+    for key, value in os.environ.items():
+        if key.startswith("DB_PRAGMA_"):
+            pragmas[key[len("DB_PRAGMA_"):].lower()] = value
+
+    return {
+        "pragmas": pragmas,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", base["pool_size"])),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", base["max_overflow"])),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+    }
 
 
-engine = create_engine(database_url, echo=False,
-    connect_args={"check_same_thread": False} if "sqlite" in database_url else {}
-)
+def apply_sqlite_pragmas(engine, pragmas: dict):
+    """
+    Aplica los PRAGMA en cada conexión nueva del pool.
+    """
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(url: str = database_url, profile: str = DB_PROFILE):
+    """
+    Crea el engine de SQLAlchemy con el perfil indicado.
+    """
+    if "sqlite" not in url:
+        return create_engine(url, echo=False)
+
+    settings = get_engine_settings(profile)
+    pool_args = {}
+    if ":memory:" not in url and url.rstrip("/") != "sqlite:":
+        pool_args = {
+            "pool_size": settings["pool_size"],
+            "max_overflow": settings["max_overflow"],
+            "pool_timeout": settings["pool_timeout"],
+        }
+
+    db_engine = create_engine(
+        url,
+        echo=False,
+        connect_args={"check_same_thread": False},
+        **pool_args,
+    )
+    apply_sqlite_pragmas(db_engine, settings["pragmas"])
+    return db_engine
+
+
+engine = create_db_engine()
+install_query_profiler(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -24,4 +118,3 @@ def get_db():
         yield db
     finally:
         db.close()
-
@@ -0,0 +1,56 @@
+"""
+Índices de texto completo (SQLite FTS5) para la búsqueda de usuarios y destinos.
+
+Las tablas FTS son de contenido externo: guardan solo el índice invertido y
+leen el texto de users / reserva. Los triggers las mantienen sincronizadas en
+cada INSERT, UPDATE y DELETE, sin cambios en los handlers.
+"""
+
+# Índices de prefijos de 2 a 4 caracteres para que el typeahead no recorra el vocabulario
+_FTS_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4'"
+
+USERS_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        nombre_usuario, correo_usuario, telefono_usuario,
+        content = 'users', content_rowid = 'id_usuario', {_FTS_OPTIONS}
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts (rowid, nombre_usuario, correo_usuario, telefono_usuario)
+        VALUES (NEW.id_usuario, NEW.nombre_usuario, NEW.correo_usuario, NEW.telefono_usuario);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts (users_fts, rowid, nombre_usuario, correo_usuario, telefono_usuario)
+        VALUES ('delete', OLD.id_usuario, OLD.nombre_usuario, OLD.correo_usuario, OLD.telefono_usuario);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE ON users BEGIN
+        INSERT INTO users_fts (users_fts, rowid, nombre_usuario, correo_usuario, telefono_usuario)
+        VALUES ('delete', OLD.id_usuario, OLD.nombre_usuario, OLD.correo_usuario, OLD.telefono_usuario);
+        INSERT INTO users_fts (rowid, nombre_usuario, correo_usuario, telefono_usuario)
+        VALUES (NEW.id_usuario, NEW.nombre_usuario, NEW.correo_usuario, NEW.telefono_usuario);
+    END""",
+]
+
+RESERVA_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS reserva_fts USING fts5(
+        nombre_destino,
+        content = 'reserva', content_rowid = 'id_reserva', {_FTS_OPTIONS}
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS reserva_fts_ai AFTER INSERT ON reserva BEGIN
+        INSERT INTO reserva_fts (rowid, nombre_destino) VALUES (NEW.id_reserva, NEW.nombre_destino);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reserva_fts_ad AFTER DELETE ON reserva BEGIN
+        INSERT INTO reserva_fts (reserva_fts, rowid, nombre_destino)
+        VALUES ('delete', OLD.id_reserva, OLD.nombre_destino);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reserva_fts_au AFTER UPDATE OF nombre_destino ON reserva BEGIN
+        INSERT INTO reserva_fts (reserva_fts, rowid, nombre_destino)
+        VALUES ('delete', OLD.id_reserva, OLD.nombre_destino);
+        INSERT INTO reserva_fts (rowid, nombre_destino) VALUES (NEW.id_reserva, NEW.nombre_destino);
+    END""",
+]
+
+# Reconstruye el índice a partir del contenido actual de la tabla
+REBUILD_FTS = [
+    "INSERT INTO users_fts (users_fts) VALUES ('rebuild')",
+    "INSERT INTO reserva_fts (reserva_fts) VALUES ('rebuild')",
+]
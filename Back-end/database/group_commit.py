@@ -0,0 +1,175 @@
+"""
+Group commit: varias inserciones concurrentes en una sola transacción.
+
+Cada INSERT con su propio commit paga un fsync de SQLite, así que la tasa de
+escritura queda limitada por la latencia del disco. `GroupCommitter` encola las
+filas que llegan desde muchas peticiones. Un hilo escritor las inserta juntas y
+hace un solo commit cuando se junta `max_batch` filas o pasa `max_wait_ms`
+desde la primera fila del lote.
+
+- Durabilidad: el Future de cada fila se resuelve (con su id) solo después del
+  commit del lote. Quien recibe un id ya tiene su fila confirmada en disco.
+- Plazo de espera: `wait` / `wait_async` cancelan la fila si su plazo vence
+  mientras sigue en la cola (el escritor la descarta). Si el lote ya la tomó,
+  no se puede cancelar y se espera su commit: una petición nunca responde un
+  error por una fila que después queda confirmada.
+- Aislamiento de errores: en SQLite una violación de restricción (FK, NOT NULL,
+  UNIQUE) deshace solo esa sentencia y la transacción sigue activa. La fila que
+  falla recibe su excepción y las demás se confirman igual. Ante cualquier otro
+  error se deshace el lote y cada fila se reintenta en su propia transacción.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger("aventa.group_commit")
+
+# Marca para detener el hilo escritor (después de vaciar la cola)
+_STOP = object()
+
+
+class GroupCommitter:
+    """
+    Cola de inserciones sobre `table` con un hilo escritor dedicado.
+    `submit()` retorna un Future que se resuelve con la llave primaria asignada.
+    """
+
+    def __init__(self, engine, table: Table, max_batch: int = 256, max_wait_ms: float = 2.0):
+        self.engine = engine
+        self.table = table
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._insert = insert(table)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+
+    def submit(self, values: dict) -> Future:
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((values, future))
+        return future
+
+    @staticmethod
+    def wait(future: Future, timeout: float):
+        """
+        Espera el id de una fila (handlers síncronos).
+        Retorna: la llave primaria, o TimeoutError si la fila se canceló sin insertarse
+        """
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise
+        # El lote ya la tomó: su resultado llega con el commit
+        return future.result()
+
+    @staticmethod
+    async def wait_async(future: Future, timeout: float):
+        """
+        Igual que `wait`, para handlers asíncronos (no bloquea el event loop).
+        """
+        wrapped = asyncio.wrap_future(future)
+        # asyncio.wait no cancela al vencer el plazo: la cancelación se decide aquí
+        done, _ = await asyncio.wait((wrapped,), timeout=timeout)
+        if not done and future.cancel():
+            raise asyncio.TimeoutError
+        return await wrapped
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Confirma lo que quede en la cola y detiene el hilo escritor.
+        """
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+            thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "lotes": self.batches,
+            "filas": self.rows,
+            "filas_por_lote": round(self.rows / self.batches, 2) if self.batches else 0,
+        }
+
+    # ---------- hilo escritor ----------
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    # Lo que ya está encolado entra sin esperar; después, hasta max_wait
+                    timeout = deadline - time.monotonic()
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[dict, Future]]):
+        batch = [(values, future) for values, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        inserted = []
+        try:
+            with self.engine.begin() as conn:
+                for values, future in batch:
+                    try:
+                        result = conn.execute(self._insert, values)
+                    except IntegrityError as e:
+                        # Solo esta sentencia se deshizo; la transacción del lote sigue
+                        future.set_exception(e)
+                        continue
+                    inserted.append((future, result.inserted_primary_key[0]))
+        except Exception:
+            logger.exception("Falló el lote de %d filas; se reintenta fila por fila", len(batch))
+            self._flush_one_by_one([(values, future) for values, future in batch if not future.done()])
+            return
+
+        self.batches += 1
+        self.rows += len(inserted)
+        for future, pk in inserted:
+            future.set_result(pk)
+
+    def _flush_one_by_one(self, batch: List[Tuple[dict, Future]]):
+        for values, future in batch:
+            try:
+                with self.engine.begin() as conn:
+                    pk = conn.execute(self._insert, values).inserted_primary_key[0]
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += 1
+            future.set_result(pk)
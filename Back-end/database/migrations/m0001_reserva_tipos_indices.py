@@ -0,0 +1,274 @@
+"""
+Migración 0001: tipos e índices de las tablas reserva y users.
+
+- reserva.nombre_destino pasa de INTEGER a VARCHAR(150)
+- reserva.fecha_inicio / fecha_fin pasan de VARCHAR(100) a DATE (texto ISO YYYY-MM-DD)
+- índices ix_reserva_nombre_destino y ix_reserva_fechas (fecha_inicio, fecha_fin)
+- índice único ix_users_correo_usuario
+
+SQLite no permite cambiar el tipo de una columna, así que reserva se reconstruye
+en línea: se crea una tabla sombra con los tipos e índices nuevos, unos triggers
+replican en ella las escrituras concurrentes y las filas existentes se copian
+en lotes cortos (cada lote es una transacción). Solo el intercambio final de
+tablas toma el lock de escritura, y dura lo que tarda un DROP + RENAME.
+
+Las columnas de reserva que esta migración no conoce (ej. un id_usuario de
+una versión anterior del esquema) pasan tal cual a la tabla nueva, con su
+tipo, NOT NULL, DEFAULT y REFERENCES: no se descarta ningún dato. Si alguna
+de esas llaves foráneas tiene valores sin fila referida, la migración se
+detiene con un reporte, igual que con los correos duplicados.
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import List
+
+VERSION = 1
+DESCRIPTION = "Tipos DATE/VARCHAR e índices en reserva, índice único en users.correo_usuario"
+
+BATCH_SIZE = 5000
+SHADOW_TABLE = "reserva_migracion"
+COLUMNS = ["id_reserva", "nombre_destino", "fecha_inicio", "fecha_fin", "monto_reserva", "cuotas_reserva"]
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d"]
+
+SHADOW_COLUMNS = [
+    "id_reserva INTEGER NOT NULL",
+    "nombre_destino VARCHAR(150) NOT NULL",
+    "fecha_inicio DATE NOT NULL",
+    "fecha_fin DATE NOT NULL",
+    "monto_reserva INTEGER NOT NULL",
+    "cuotas_reserva INTEGER NOT NULL",
+]
+
+
+def create_shadow_table(extra_definitions: List[str]) -> str:
+    """
+    CREATE TABLE de la tabla sombra, con las columnas conservadas al final.
+    """
+    body = ",\n    ".join(SHADOW_COLUMNS + extra_definitions + ["PRIMARY KEY (id_reserva)"])
+    return f"CREATE TABLE {SHADOW_TABLE} (\n    {body}\n)"
+
+
+CREATE_INDEXES = [
+    f"CREATE INDEX ix_reserva_nombre_destino ON {SHADOW_TABLE} (nombre_destino)",
+    f"CREATE INDEX ix_reserva_fechas ON {SHADOW_TABLE} (fecha_inicio, fecha_fin)",
+]
+
+# Las escrituras que llegan mientras se copian los lotes se replican en la tabla sombra
+_NEW_VALUES = (
+    "NEW.id_reserva, CAST(NEW.nombre_destino AS TEXT), "
+    "COALESCE(date(NEW.fecha_inicio), NEW.fecha_inicio), "
+    "COALESCE(date(NEW.fecha_fin), NEW.fecha_fin), "
+    "NEW.monto_reserva, NEW.cuotas_reserva"
+)
+
+
+def create_triggers(extra_columns: List[str]) -> List[str]:
+    columns = ", ".join(COLUMNS + [f'"{name}"' for name in extra_columns])
+    values = ", ".join([_NEW_VALUES] + [f'NEW."{name}"' for name in extra_columns])
+    return [
+        f"""CREATE TRIGGER m0001_reserva_ai AFTER INSERT ON reserva BEGIN
+        INSERT OR REPLACE INTO {SHADOW_TABLE} ({columns}) VALUES ({values});
+    END""",
+        f"""CREATE TRIGGER m0001_reserva_au AFTER UPDATE ON reserva BEGIN
+        DELETE FROM {SHADOW_TABLE} WHERE id_reserva = OLD.id_reserva;
+        INSERT OR REPLACE INTO {SHADOW_TABLE} ({columns}) VALUES ({values});
+    END""",
+        f"""CREATE TRIGGER m0001_reserva_ad AFTER DELETE ON reserva BEGIN
+        DELETE FROM {SHADOW_TABLE} WHERE id_reserva = OLD.id_reserva;
+    END""",
+    ]
+
+
+class MigrationError(Exception):
+    pass
+
+
+# ==================== UTILIDADES ====================
+
+@contextmanager
+def write_transaction(engine):
+    """
+    Transacción BEGIN IMMEDIATE sobre la conexión sqlite3 cruda: toma el lock de
+    escritura desde el inicio, así lectura y escritura del lote son atómicas y el
+    DDL queda dentro de la misma transacción.
+    """
+    raw = engine.raw_connection()
+    dbapi_connection = raw.driver_connection
+    previous = dbapi_connection.isolation_level
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    finally:
+        cursor.close()
+        dbapi_connection.isolation_level = previous
+        raw.close()
+
+
+def to_iso_date(value) -> str:
+    """
+    Normaliza una fecha guardada como texto libre a YYYY-MM-DD.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    raw = str(value).strip()
+    try:
+        return date.fromisoformat(raw[:10]).isoformat()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(raw)
+
+
+def _column_types(cursor, table: str) -> dict:
+    rows = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+    return {row[1]: (row[2] or "").upper() for row in rows}
+
+
+def is_applied(cursor) -> bool:
+    """
+    La migración está aplicada si reserva ya tiene fechas DATE y existe el índice único del correo.
+    """
+    reserva = _column_types(cursor, "reserva")
+    indexes = {row[1] for row in cursor.execute("PRAGMA index_list(users)").fetchall()}
+    reserva_ok = not reserva or reserva.get("fecha_inicio") == "DATE"
+    users_ok = not _column_types(cursor, "users") or "ix_users_correo_usuario" in indexes
+    return reserva_ok and users_ok
+
+
+# ==================== PASOS ====================
+
+def _upgrade_users(engine):
+    with write_transaction(engine) as cursor:
+        if not _column_types(cursor, "users"):
+            return
+        duplicados = cursor.execute(
+            "SELECT correo_usuario, COUNT(*) FROM users "
+            "GROUP BY correo_usuario HAVING COUNT(*) > 1 LIMIT 10"
+        ).fetchall()
+        if duplicados:
+            lista = ", ".join(f"{correo} ({n})" for correo, n in duplicados)
+            raise MigrationError(f"Hay correos duplicados en users, corríjalos antes de migrar: {lista}")
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_correo_usuario ON users (correo_usuario)"
+        )
+
+
+def _cleanup_shadow(engine):
+    with write_transaction(engine) as cursor:
+        for trigger in ("m0001_reserva_ai", "m0001_reserva_au", "m0001_reserva_ad"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+
+
+def _check_references(engine, extra_columns: List[dict], references: dict):
+    """
+    Las llaves foráneas conservadas deben apuntar a filas existentes: si no, la
+    copia fallaría a mitad de camino. Se reportan antes de empezar.
+    """
+    with write_transaction(engine) as cursor:
+        for column in extra_columns:
+            reference = references.get(column["name"])
+            if reference is None:
+                continue
+            table, target = reference
+            huerfanas = cursor.execute(
+                f'SELECT id_reserva, "{column["name"]}" FROM reserva '
+                f'WHERE "{column["name"]}" IS NOT NULL AND "{column["name"]}" NOT IN '
+                f'(SELECT "{target}" FROM "{table}") LIMIT 10'
+            ).fetchall()
+            if huerfanas:
+                lista = ", ".join(f"reserva {id_reserva} -> {value!r}" for id_reserva, value in huerfanas)
+                raise MigrationError(
+                    f"reserva.{column['name']} tiene valores sin fila en {table}, corríjalos antes de migrar: {lista}"
+                )
+
+
+def _copy_batches(engine, batch_size: int, extra_columns: List[str]) -> int:
+    columns = COLUMNS + [f'"{name}"' for name in extra_columns]
+    select_batch = (
+        f"SELECT {', '.join(columns)} FROM reserva "
+        "WHERE id_reserva > ? ORDER BY id_reserva LIMIT ?"
+    )
+    insert_row = (
+        f"INSERT OR REPLACE INTO {SHADOW_TABLE} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+
+    copied = 0
+    last_id = 0
+    while True:
+        # Cada lote es una transacción corta; mientras dura, los triggers no pueden intercalarse
+        with write_transaction(engine) as cursor:
+            rows = cursor.execute(select_batch, (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            batch = []
+            for id_reserva, destino, inicio, fin, monto, cuotas, *extra in rows:
+                try:
+                    inicio, fin = to_iso_date(inicio), to_iso_date(fin)
+                except ValueError as e:
+                    raise MigrationError(f"Fecha no reconocida en reserva {id_reserva}: {e}")
+                batch.append((id_reserva, str(destino), inicio, fin, monto, cuotas, *extra))
+            cursor.executemany(insert_row, batch)
+        copied += len(rows)
+        last_id = rows[-1][0]
+    return copied
+
+
+def _upgrade_reserva(engine, batch_size: int) -> dict:
+    from database.migrations.rebuild import column_sql, foreign_keys, table_columns
+
+    with write_transaction(engine) as cursor:
+        old_columns = _column_types(cursor, "reserva")
+        extra_columns = [column for column in table_columns(cursor, "reserva") if column["name"] not in COLUMNS]
+        references = foreign_keys(cursor, "reserva")
+    if not old_columns or old_columns.get("fecha_inicio") == "DATE":
+        return {"reserva": "sin cambios"}
+
+    _check_references(engine, extra_columns, references)
+    extra_names = [column["name"] for column in extra_columns]
+    extra_definitions = [column_sql(column, references.get(column["name"])) for column in extra_columns]
+
+    _cleanup_shadow(engine)
+    with write_transaction(engine) as cursor:
+        cursor.execute(create_shadow_table(extra_definitions))
+        for statement in CREATE_INDEXES + create_triggers(extra_names):
+            cursor.execute(statement)
+
+    try:
+        copied = _copy_batches(engine, batch_size, extra_names)
+    except Exception:
+        _cleanup_shadow(engine)
+        raise
+
+    # Intercambio final: la única parte que bloquea escrituras, sin copiar datos
+    with write_transaction(engine) as cursor:
+        cursor.execute("DROP TABLE reserva")
+        cursor.execute(f"ALTER TABLE {SHADOW_TABLE} RENAME TO reserva")
+
+    return {"reserva": "reconstruida", "filas_copiadas": copied, "columnas_conservadas": extra_names}
+
+
+# ==================== ENTRADA ====================
+
+def upgrade(engine, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    _upgrade_users(engine)
+    return _upgrade_reserva(engine, batch_size)
@@ -0,0 +1,40 @@
+"""
+Migración 0002: índices para las consultas de solapamiento de fechas en reserva.
+
+- ix_reserva_destino_fechas (nombre_destino, fecha_inicio, fecha_fin)
+- ix_reserva_duracion sobre julianday(fecha_fin) - julianday(fecha_inicio): permite
+  obtener la duración máxima con un solo recorrido del índice y así acotar el
+  rango de fecha_inicio en las consultas de intervalos.
+
+Solo crea índices (CREATE INDEX IF NOT EXISTS); cada uno bloquea escrituras
+mientras se construye, sin bloquear lecturas en modo WAL.
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from database.migrations.m0001_reserva_tipos_indices import write_transaction
+
+VERSION = 2
+DESCRIPTION = "Índices de intervalos (destino + fechas, duración) en reserva"
+
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_reserva_destino_fechas "
+    "ON reserva (nombre_destino, fecha_inicio, fecha_fin)",
+    "CREATE INDEX IF NOT EXISTS ix_reserva_duracion "
+    "ON reserva (julianday(fecha_fin) - julianday(fecha_inicio))",
+]
+
+
+def upgrade(engine) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    created = []
+    for statement in CREATE_INDEXES:
+        with write_transaction(engine) as cursor:
+            if not cursor.execute("PRAGMA table_info(reserva)").fetchall():
+                return {"reserva": "sin cambios"}
+            cursor.execute(statement)
+        created.append(statement.split()[5])
+    return {"reserva": "índices creados", "indices": created}
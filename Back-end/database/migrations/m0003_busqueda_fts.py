@@ -0,0 +1,26 @@
+"""
+Migración 0003: tablas FTS5 (users_fts, reserva_fts) y sus triggers de sincronización.
+
+Crea las tablas de texto completo si no existen y reconstruye su índice a
+partir del contenido actual. La reconstrucción bloquea escrituras mientras
+dura (lecturas libres en modo WAL).
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from database.fts import REBUILD_FTS, RESERVA_FTS_DDL, USERS_FTS_DDL
+from database.migrations.m0001_reserva_tipos_indices import write_transaction
+
+VERSION = 3
+DESCRIPTION = "Búsqueda de texto completo (FTS5) sobre users y reserva"
+
+
+def upgrade(engine) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    with write_transaction(engine) as cursor:
+        for statement in USERS_FTS_DDL + RESERVA_FTS_DDL + REBUILD_FTS:
+            cursor.execute(statement)
+    return {"fts": "users_fts y reserva_fts sincronizadas"}
@@ -0,0 +1,100 @@
+"""
+Migración 0004: relaciones de reserva con users y plan.
+
+- reserva.id_usuario -> users.id_usuario (nullable)
+- reserva.id_plan -> plan.id_plan (nullable)
+- índices ix_reserva_id_usuario e ix_reserva_id_plan: las validaciones EXISTS
+  antes de borrar un usuario o un plan y los listados por usuario los usan.
+
+Si la columna no existe se agrega con ADD COLUMN (SQLite lo permite con
+REFERENCES cuando admite NULL) y las filas existentes quedan sin relación.
+
+Si ya existe (ej. el id_usuario VARCHAR de la primera versión del esquema,
+que m0001 conserva) se mantienen sus valores: la tabla se reconstruye con la
+columna INTEGER y su llave foránea, convirtiendo cada valor a entero. Antes se
+verifica que todos sean enteros con fila referida; si no, la migración se
+detiene con un reporte y no cambia nada.
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from database.migrations.m0001_reserva_tipos_indices import MigrationError, write_transaction
+from database.migrations.rebuild import foreign_keys, rebuild_table, table_columns, table_definitions
+
+VERSION = 4
+DESCRIPTION = "Llaves foráneas reserva -> users y reserva -> plan, con índices"
+
+NEW_COLUMNS = {
+    "id_usuario": "ALTER TABLE reserva ADD COLUMN id_usuario INTEGER REFERENCES users (id_usuario)",
+    "id_plan": "ALTER TABLE reserva ADD COLUMN id_plan INTEGER REFERENCES plan (id_plan)",
+}
+
+# Columna -> (tabla referida, columna referida)
+REFERENCES = {
+    "id_usuario": ("users", "id_usuario"),
+    "id_plan": ("plan", "id_plan"),
+}
+
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_reserva_id_usuario ON reserva (id_usuario)",
+    "CREATE INDEX IF NOT EXISTS ix_reserva_id_plan ON reserva (id_plan)",
+]
+
+
+def _needs_conversion(column: dict, reference, target) -> bool:
+    return column["type"].upper() != "INTEGER" or column["notnull"] or reference != target
+
+
+def _check_values(cursor, name: str, target):
+    """
+    Todo valor no nulo debe ser un entero con fila en la tabla referida.
+    """
+    table, key = target
+    invalidas = cursor.execute(
+        f'SELECT id_reserva, "{name}" FROM reserva WHERE "{name}" IS NOT NULL AND ('
+        f'CAST("{name}" AS TEXT) NOT GLOB \'[0-9]*\' OR CAST("{name}" AS TEXT) GLOB \'*[^0-9]*\' '
+        f'OR CAST("{name}" AS INTEGER) NOT IN (SELECT "{key}" FROM "{table}")) LIMIT 10'
+    ).fetchall()
+    if invalidas:
+        lista = ", ".join(f"reserva {id_reserva} -> {value!r}" for id_reserva, value in invalidas)
+        raise MigrationError(
+            f"reserva.{name} tiene valores que no son un id de {table}, corríjalos antes de migrar: {lista}"
+        )
+
+
+def upgrade(engine) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    with write_transaction(engine) as cursor:
+        columns = {column["name"]: column for column in table_columns(cursor, "reserva")}
+        if not columns:
+            return {"reserva": "sin cambios"}
+        references = foreign_keys(cursor, "reserva")
+
+        added, converted = [], []
+        for name, statement in NEW_COLUMNS.items():
+            if name not in columns:
+                cursor.execute(statement)
+                added.append(name)
+            elif _needs_conversion(columns[name], references.get(name), REFERENCES[name]):
+                _check_values(cursor, name, REFERENCES[name])
+                converted.append(name)
+
+        if converted:
+            overrides = {
+                name: f'"{name}" INTEGER REFERENCES "{REFERENCES[name][0]}" ("{REFERENCES[name][1]}")'
+                for name in converted
+            }
+            definitions, constraints = table_definitions(cursor, "reserva", overrides)
+            names = list(columns)
+            expressions = [
+                f'CAST("{name}" AS INTEGER)' if name in converted else f'"{name}"' for name in names
+            ]
+            rebuild_table(cursor, "reserva", definitions, names, expressions, constraints)
+
+        for statement in CREATE_INDEXES:
+            cursor.execute(statement)
+
+    return {"reserva": "relaciones agregadas", "columnas": added, "convertidas": converted}
@@ -0,0 +1,26 @@
+"""
+Migración 0005: tabla reserva_resumen (reportes por destino, mes y plan) y sus triggers.
+
+Crea la tabla y los triggers si no existen y la llena desde reserva con un
+GROUP BY por dimensión. Bloquea escrituras mientras dura (lecturas libres en
+modo WAL).
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from database.migrations.m0001_reserva_tipos_indices import write_transaction
+from database.resumen import REBUILD_RESUMEN, RESUMEN_DDL
+
+VERSION = 5
+DESCRIPTION = "Resumen incremental de reservas por destino, mes y plan"
+
+
+def upgrade(engine) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    with write_transaction(engine) as cursor:
+        for statement in RESUMEN_DDL + REBUILD_RESUMEN:
+            cursor.execute(statement)
+    return {"reserva_resumen": "creada y calculada"}
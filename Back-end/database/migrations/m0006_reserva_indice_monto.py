@@ -0,0 +1,30 @@
+"""
+Migración 0006: índice ix_reserva_monto (monto_reserva) para el listado de reservas.
+
+Sirve a ?monto_min= (rango) y a ?sort=monto_reserva / -monto_reserva: el índice
+ya está ordenado por (monto_reserva, id_reserva), que es el keyset del cursor.
+
+Solo crea el índice (CREATE INDEX IF NOT EXISTS); bloquea escrituras mientras
+se construye, sin bloquear lecturas en modo WAL.
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from database.migrations.m0001_reserva_tipos_indices import write_transaction
+
+VERSION = 6
+DESCRIPTION = "Índice de monto_reserva en reserva (filtro y orden del listado)"
+
+CREATE_INDEX = "CREATE INDEX IF NOT EXISTS ix_reserva_monto ON reserva (monto_reserva)"
+
+
+def upgrade(engine) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    with write_transaction(engine) as cursor:
+        if not cursor.execute("PRAGMA table_info(reserva)").fetchall():
+            return {"reserva": "sin cambios"}
+        cursor.execute(CREATE_INDEX)
+    return {"reserva": "índice creado", "indices": ["ix_reserva_monto"]}
@@ -0,0 +1,29 @@
+"""
+Migración 0007: registro de cambios change_log (varios workers) y sus triggers.
+
+Crea change_log, change_log_epoch y los triggers de users, reserva y plan si
+no existen. No copia historia: el registro empieza vacío y los workers lo
+siguen desde su último seq.
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from database.change_log import CHANGE_LOG_DDL, CHANGE_LOG_TRIGGERS
+from database.migrations.m0001_reserva_tipos_indices import write_transaction
+
+VERSION = 7
+DESCRIPTION = "Registro de cambios compartido entre workers (change_log)"
+
+
+def upgrade(engine) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    with write_transaction(engine) as cursor:
+        for statement in CHANGE_LOG_DDL:
+            cursor.execute(statement)
+        for statements in CHANGE_LOG_TRIGGERS.values():
+            for statement in statements:
+                cursor.execute(statement)
+    return {"change_log": "creado con triggers en users, reserva y plan"}
@@ -0,0 +1,49 @@
+"""
+Migración 0008: CHECK (fecha_fin >= fecha_inicio) en reserva.
+
+El histograma de ocupación (barrido) y la cota de duración del filtro de
+solapamiento suponen que una reserva no termina antes de empezar. SQLite no
+permite agregar un CHECK a una tabla existente, así que reserva se reconstruye
+(ver rebuild.py) conservando filas, índices y triggers. Bloquea escrituras
+mientras dura (lecturas libres en modo WAL).
+
+Si hay reservas con las fechas invertidas la migración se detiene con un
+reporte y no cambia nada: hay que corregirlas antes.
+
+Se aplica con el runner, que además actualiza PRAGMA user_version (desde Back-end/):
+    python -m database.migrations.runner upgrade
+"""
+
+from database.migrations.m0001_reserva_tipos_indices import MigrationError, write_transaction
+from database.migrations.rebuild import rebuild_table, table_columns, table_definitions
+
+VERSION = 8
+DESCRIPTION = "CHECK de fechas en reserva (fecha_fin >= fecha_inicio)"
+
+CHECK_NAME = "ck_reserva_fechas"
+CHECK_CONSTRAINT = f"CONSTRAINT {CHECK_NAME} CHECK (fecha_fin >= fecha_inicio)"
+
+
+def upgrade(engine) -> dict:
+    """
+    Aplica la migración sobre una base existente (idempotente).
+    """
+    with write_transaction(engine) as cursor:
+        row = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'reserva'").fetchone()
+        if row is None or CHECK_NAME in row[0]:
+            return {"reserva": "sin cambios"}
+
+        invertidas = cursor.execute(
+            "SELECT id_reserva, fecha_inicio, fecha_fin FROM reserva WHERE fecha_fin < fecha_inicio LIMIT 10"
+        ).fetchall()
+        if invertidas:
+            lista = ", ".join(f"reserva {id_reserva} ({inicio} > {fin})" for id_reserva, inicio, fin in invertidas)
+            raise MigrationError(f"Hay reservas con fecha_fin anterior a fecha_inicio, corríjalas antes de migrar: {lista}")
+
+        definitions, constraints = table_definitions(cursor, "reserva")
+        names = [column["name"] for column in table_columns(cursor, "reserva")]
+        rebuild_table(
+            cursor, "reserva", definitions, names, [f'"{name}"' for name in names],
+            constraints + [CHECK_CONSTRAINT],
+        )
+    return {"reserva": "reconstruida con CHECK", "restriccion": CHECK_NAME}
@@ -0,0 +1,106 @@
+"""
+Utilidades para reconstruir una tabla de SQLite dentro de una migración.
+
+SQLite no permite cambiar el tipo de una columna ni agregar un CHECK o una
+llave foránea a una tabla existente. El camino es el de la documentación
+(ALTER TABLE, "otros cambios"): crear la tabla nueva, copiar las filas, borrar
+la vieja, renombrar la nueva y volver a crear sus índices y triggers. Todo
+ocurre en la transacción de la migración (write_transaction), con las llaves
+foráneas diferidas hasta el COMMIT para que el DROP no choque con las tablas
+que apuntan a esta.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def _quoted(names: Sequence[str]) -> str:
+    return ", ".join(f'"{name}"' for name in names)
+
+
+def table_columns(cursor, table: str) -> List[dict]:
+    """
+    Columnas de `table` en orden: {"name", "type", "notnull", "default", "pk"}.
+    """
+    rows = cursor.execute(f'PRAGMA table_info("{table}")').fetchall()
+    return [
+        {"name": row[1], "type": row[2] or "", "notnull": bool(row[3]), "default": row[4], "pk": row[5]}
+        for row in rows
+    ]
+
+
+def foreign_keys(cursor, table: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Llaves foráneas de una sola columna: {columna: (tabla referida, columna referida)}.
+    """
+    rows = cursor.execute(f'PRAGMA foreign_key_list("{table}")').fetchall()
+    return {row[3]: (row[2], row[4] or "rowid") for row in rows}
+
+
+def column_sql(column: dict, reference: Optional[Tuple[str, str]] = None) -> str:
+    """
+    Definición de una columna tal como está (tipo, NOT NULL, DEFAULT y REFERENCES).
+    """
+    parts = [f'"{column["name"]}"']
+    if column["type"]:
+        parts.append(column["type"])
+    if column["notnull"]:
+        parts.append("NOT NULL")
+    if column["default"] is not None:
+        parts.append(f"DEFAULT {column['default']}")
+    if reference is not None:
+        parts.append(f'REFERENCES "{reference[0]}" ("{reference[1]}")')
+    return " ".join(parts)
+
+
+def table_definitions(cursor, table: str, overrides: Optional[Dict[str, str]] = None) -> Tuple[List[str], List[str]]:
+    """
+    Definiciones de columnas y restricciones que reproducen `table`, con la
+    definición de algunas columnas reemplazada por `overrides` ({columna: SQL}).
+    Retorna: (definiciones, restricciones) para rebuild_table
+    """
+    overrides = overrides or {}
+    columns = table_columns(cursor, table)
+    references = foreign_keys(cursor, table)
+    definitions = [
+        overrides.get(column["name"]) or column_sql(column, references.get(column["name"]))
+        for column in columns
+    ]
+    primary_key = [column["name"] for column in sorted(columns, key=lambda column: column["pk"]) if column["pk"]]
+    constraints = [f"PRIMARY KEY ({_quoted(primary_key)})"] if primary_key else []
+    return definitions, constraints
+
+
+def rebuild_table(
+    cursor,
+    table: str,
+    definitions: Sequence[str],
+    columns: Sequence[str],
+    expressions: Sequence[str],
+    constraints: Sequence[str] = (),
+):
+    """
+    Reemplaza `table` por una con las `definitions` de columnas y `constraints`.
+    Cada columna de `columns` se llena con la expresión de `expressions` (mismo
+    orden) evaluada sobre la tabla vieja. Se conservan índices y triggers.
+    """
+    saved = [
+        sql for (sql,) in cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') "
+            "AND sql IS NOT NULL ORDER BY type, name",
+            (table,),
+        ).fetchall()
+    ]
+    new_table = f"{table}_reconstruida"
+    body = ",\n    ".join(list(definitions) + list(constraints))
+
+    cursor.execute("PRAGMA defer_foreign_keys = ON")
+    cursor.execute(f'DROP TABLE IF EXISTS "{new_table}"')
+    cursor.execute(f'CREATE TABLE "{new_table}" (\n    {body}\n)')
+    cursor.execute(
+        f'INSERT INTO "{new_table}" ({_quoted(columns)}) '
+        f'SELECT {", ".join(expressions)} FROM "{table}"'
+    )
+    cursor.execute(f'DROP TABLE "{table}"')
+    cursor.execute(f'ALTER TABLE "{new_table}" RENAME TO "{table}"')
+    for sql in saved:
+        cursor.execute(sql)
@@ -0,0 +1,141 @@
+"""
+Runner de migraciones versionadas.
+
+La versión del esquema se guarda en `PRAGMA user_version` de SQLite, así el
+chequeo al arrancar un worker es una sola consulta y no toca las tablas.
+
+- Base nueva (sin tablas): se crea el esquema completo desde los modelos y se
+  marca con la última versión.
+- Base existente: se aplican en orden las migraciones pendientes
+  (`m<NNNN>_*.py` en este paquete, cada una con VERSION y upgrade(engine)) y la
+  versión se actualiza después de cada una.
+
+Uso (desde Back-end/), una vez por despliegue y no desde cada worker:
+    python -m database.migrations.runner upgrade
+    python -m database.migrations.runner status
+"""
+
+import importlib
+import os
+import pkgutil
+import re
+from typing import List, Tuple
+
+from database.migrations.m0001_reserva_tipos_indices import write_transaction
+
+_MODULE_RE = re.compile(r"^m(\d{4})_\w+$")
+APP_TABLES = ("users", "reserva", "plan")
+
+
+class SchemaOutdatedError(RuntimeError):
+    pass
+
+
+# ==================== VERSIONES ====================
+
+def available_migrations() -> List[Tuple[int, str]]:
+    """
+    Lista (versión, módulo) de las migraciones del paquete, ordenadas.
+    Solo lee los nombres de archivo: no importa ningún módulo.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    migrations = []
+    for module in pkgutil.iter_modules([package_dir]):
+        match = _MODULE_RE.match(module.name)
+        if match:
+            migrations.append((int(match.group(1)), f"database.migrations.{module.name}"))
+    return sorted(migrations)
+
+
+def latest_version() -> int:
+    migrations = available_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def current_version(engine) -> int:
+    raw = engine.raw_connection()
+    try:
+        return raw.driver_connection.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        raw.close()
+
+
+def _set_version(cursor, version: int):
+    cursor.execute(f"PRAGMA user_version = {int(version)}")
+
+
+# ==================== COMANDOS ====================
+
+def upgrade(engine) -> dict:
+    """
+    Lleva la base a la última versión. Retorna: {"desde", "hasta", "aplicadas": [...]}
+    """
+    # Import local: al importar el runner (CLI, serve.py) no se cargan los modelos. En la
+    # API ya están cargados (los routers importan models.models) y esto no cuesta nada.
+    from database.database import Base
+    from models import models  # noqa: F401  registra las tablas en Base.metadata
+
+    start_version = current_version(engine)
+    target = latest_version()
+
+    with write_transaction(engine) as cursor:
+        existing = {
+            row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+
+    applied = []
+    if not existing.intersection(APP_TABLES):
+        # Base nueva: el esquema de los modelos ya incluye todas las migraciones
+        Base.metadata.create_all(bind=engine)
+        with write_transaction(engine) as cursor:
+            _set_version(cursor, target)
+        return {"desde": start_version, "hasta": target, "aplicadas": ["esquema inicial"]}
+
+    for version, module_name in available_migrations():
+        if version <= start_version:
+            continue
+        module = importlib.import_module(module_name)
+        result = module.upgrade(engine)
+        with write_transaction(engine) as cursor:
+            _set_version(cursor, version)
+        applied.append({"version": version, "descripcion": module.DESCRIPTION, "resultado": result})
+
+    # Tablas nuevas que todavía no existan (create_all omite las existentes)
+    Base.metadata.create_all(bind=engine)
+    return {"desde": start_version, "hasta": current_version(engine), "aplicadas": applied}
+
+
+def status(engine) -> dict:
+    current = current_version(engine)
+    return {
+        "version_actual": current,
+        "ultima_version": latest_version(),
+        "pendientes": [version for version, _ in available_migrations() if version > current],
+    }
+
+
+def check_schema(engine):
+    """
+    Chequeo barato para el arranque: falla si la base no tiene la última versión.
+    """
+    current, latest = current_version(engine), latest_version()
+    if current < latest:
+        raise SchemaOutdatedError(
+            f"El esquema de la base está en la versión {current} y el código espera la {latest}. "
+            "Ejecute: python -m database.migrations.runner upgrade"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from database.database import engine
+
+    parser = argparse.ArgumentParser(description="Migraciones versionadas de la base de datos")
+    parser.add_argument("command", choices=["upgrade", "status"])
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        print(upgrade(engine))
+    else:
+        print(status(engine))
@@ -0,0 +1,165 @@
+"""
+Perfilador de SQL por petición.
+
+Los eventos `before_cursor_execute` / `after_cursor_execute` del engine miden
+cada sentencia y la suman al perfil de la petición en curso (un ContextVar que
+fija `SQLProfilerMiddleware`; el threadpool de FastAPI copia el contexto, así
+que los handlers síncronos también lo ven). Por petición se guarda:
+cantidad de consultas, tiempo total en la base y la sentencia más lenta.
+
+Configuración (variables de entorno):
+- SQL_SLOW_QUERY_MS: umbral del log de consultas lentas (logger "aventa.sql").
+  Los parámetros nunca se escriben, solo su cantidad.
+- SQL_PROFILE_HEADER=1: agrega el header X-SQL-Profile a cada respuesta.
+- SQL_PROFILE_HISTORY: cuántos perfiles recientes se guardan para /debug/sql.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 200))
+SQL_PROFILE_HEADER = os.getenv("SQL_PROFILE_HEADER", "0") == "1"
+SQL_PROFILE_HISTORY = int(os.getenv("SQL_PROFILE_HISTORY", 50))
+
+# Largo máximo de sentencia que se guarda en los perfiles / el log
+MAX_STATEMENT_LENGTH = 500
+
+logger = logging.getLogger("aventa.sql")
+
+
+# ==================== PERFIL POR PETICIÓN ====================
+
+class QueryProfile:
+    __slots__ = ("queries", "db_time", "slowest_time", "slowest_statement")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, duration: float):
+        self.queries += 1
+        self.db_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    def as_dict(self) -> dict:
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 3),
+            "slowest": {
+                "ms": round(self.slowest_time * 1000, 3),
+                "statement": _truncate(self.slowest_statement),
+            } if self.slowest_statement else None,
+        }
+
+
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("current_profile", default=None)
+
+# Perfiles de las últimas peticiones (los agrega el middleware desde el event loop)
+recent_profiles = deque(maxlen=SQL_PROFILE_HISTORY)
+
+
+def _truncate(statement: Optional[str]) -> Optional[str]:
+    if statement is None or len(statement) <= MAX_STATEMENT_LENGTH:
+        return statement
+    return statement[:MAX_STATEMENT_LENGTH] + "..."
+
+
+def _param_count(parameters, executemany: bool) -> str:
+    if executemany:
+        return f"{len(parameters)} filas"
+    try:
+        return f"{len(parameters)} parámetros"
+    except TypeError:
+        return "0 parámetros"
+
+
+# ==================== EVENTOS DEL ENGINE ====================
+
+def install_query_profiler(engine):
+    """
+    Registra los eventos de medición en un engine síncrono
+    (para un AsyncEngine, pasar `async_engine.sync_engine`).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+
+        profile = current_profile.get()
+        if profile is not None:
+            profile.record(statement, duration)
+
+        if duration * 1000 >= SQL_SLOW_QUERY_MS:
+            logger.warning(
+                "Consulta lenta (%.1f ms, %s): %s",
+                duration * 1000,
+                _param_count(parameters, executemany),
+                _truncate(statement),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # La sentencia falló: igual se cuenta y se saca su inicio de la pila
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            duration = time.perf_counter() - conn.info["query_start_time"].pop()
+            profile = current_profile.get()
+            if profile is not None and exception_context.statement:
+                profile.record(exception_context.statement, duration)
+
+
+# ==================== MIDDLEWARE ====================
+
+class SQLProfilerMiddleware:
+    """
+    Middleware ASGI que abre un perfil por petición HTTP y, al terminar, lo guarda
+    en `recent_profiles` (y en el header X-SQL-Profile si SQL_PROFILE_HEADER=1).
+    """
+
+    def __init__(self, app, header: bool = SQL_PROFILE_HEADER):
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = current_profile.set(profile)
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+                if self.header:
+                    value = f"queries={profile.queries}; db_ms={profile.db_time * 1000:.3f}"
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-sql-profile", value.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            recent_profiles.append({
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_holder[0],
+                **profile.as_dict(),
+            })
@@ -0,0 +1,151 @@
+"""
+Resumen de reservas por destino, mes (de fecha_inicio) y plan.
+
+La tabla reserva_resumen guarda, por (dimension, clave), la cantidad de
+reservas y las sumas de monto_reserva y cuotas_reserva. Los reportes leen
+una fila por grupo, es decir O(grupos) y no O(reservas).
+
+Se mantiene de forma incremental con triggers, igual que las tablas FTS. Cada
+INSERT, UPDATE o DELETE sobre reserva ajusta sus tres grupos en la misma
+transacción, así que los handlers, /bulk y el group commit quedan cubiertos
+sin cambios. Un grupo que queda sin reservas se borra.
+
+Reconstrucción completa y verificación (desde Back-end/):
+    python -m database.resumen rebuild
+    python -m database.resumen check
+"""
+
+RESUMEN_TABLE = "reserva_resumen"
+
+# Dimensión -> expresión de la clave del grupo ({row} es NEW u OLD, o la tabla reserva)
+DIMENSIONS = {
+    "destino": "{row}.nombre_destino",
+    "mes": "strftime('%Y-%m', {row}.fecha_inicio)",
+    "plan": "COALESCE(CAST({row}.id_plan AS TEXT), '')",
+}
+
+# Columnas de reserva que cambian algún grupo o alguna suma
+_TRACKED_COLUMNS = "nombre_destino, fecha_inicio, monto_reserva, cuotas_reserva, id_plan"
+
+
+def _add_statements(row: str) -> str:
+    values = ",\n            ".join(
+        f"('{dimension}', {key.format(row=row)}, 1, {row}.monto_reserva, {row}.cuotas_reserva)"
+        for dimension, key in DIMENSIONS.items()
+    )
+    return f"""INSERT INTO {RESUMEN_TABLE} (dimension, clave, reservas, monto_total, cuotas_total)
+        VALUES
+            {values}
+        ON CONFLICT (dimension, clave) DO UPDATE SET
+            reservas = reservas + excluded.reservas,
+            monto_total = monto_total + excluded.monto_total,
+            cuotas_total = cuotas_total + excluded.cuotas_total;"""
+
+
+def _remove_statements(row: str) -> str:
+    statements = []
+    for dimension, key in DIMENSIONS.items():
+        where = f"dimension = '{dimension}' AND clave = {key.format(row=row)}"
+        statements.append(
+            f"""UPDATE {RESUMEN_TABLE} SET
+            reservas = reservas - 1,
+            monto_total = monto_total - {row}.monto_reserva,
+            cuotas_total = cuotas_total - {row}.cuotas_reserva
+        WHERE {where};
+        DELETE FROM {RESUMEN_TABLE} WHERE {where} AND reservas <= 0;"""
+        )
+    return "\n        ".join(statements)
+
+
+RESUMEN_DDL = [
+    f"""CREATE TABLE IF NOT EXISTS {RESUMEN_TABLE} (
+        dimension TEXT NOT NULL,
+        clave TEXT NOT NULL,
+        reservas INTEGER NOT NULL,
+        monto_total INTEGER NOT NULL,
+        cuotas_total INTEGER NOT NULL,
+        PRIMARY KEY (dimension, clave)
+    ) WITHOUT ROWID""",
+    f"""CREATE TRIGGER IF NOT EXISTS reserva_resumen_ai AFTER INSERT ON reserva BEGIN
+        {_add_statements("NEW")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS reserva_resumen_ad AFTER DELETE ON reserva BEGIN
+        {_remove_statements("OLD")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS reserva_resumen_au AFTER UPDATE OF {_TRACKED_COLUMNS} ON reserva BEGIN
+        {_remove_statements("OLD")}
+        {_add_statements("NEW")}
+    END""",
+]
+
+# Recalcula el resumen completo desde reserva (un GROUP BY por dimensión)
+REBUILD_RESUMEN = [f"DELETE FROM {RESUMEN_TABLE}"] + [
+    f"""INSERT INTO {RESUMEN_TABLE} (dimension, clave, reservas, monto_total, cuotas_total)
+        SELECT '{dimension}', {key.format(row="reserva")}, COUNT(*), SUM(monto_reserva), SUM(cuotas_reserva)
+        FROM reserva
+        GROUP BY 2"""
+    for dimension, key in DIMENSIONS.items()
+]
+
+# Grupos en los que el resumen no coincide con un recálculo desde reserva
+CHECK_RESUMEN = " UNION ALL ".join(
+    f"""SELECT * FROM (
+        SELECT '{dimension}' AS dimension, {key.format(row="reserva")} AS clave,
+               COUNT(*) AS reservas, SUM(monto_reserva) AS monto_total, SUM(cuotas_reserva) AS cuotas_total
+        FROM reserva GROUP BY 2
+        EXCEPT
+        SELECT dimension, clave, reservas, monto_total, cuotas_total FROM {RESUMEN_TABLE} WHERE dimension = '{dimension}'
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT dimension, clave, reservas, monto_total, cuotas_total FROM {RESUMEN_TABLE} WHERE dimension = '{dimension}'
+        EXCEPT
+        SELECT '{dimension}', {key.format(row="reserva")}, COUNT(*), SUM(monto_reserva), SUM(cuotas_reserva)
+        FROM reserva GROUP BY 2
+    )"""
+    for dimension, key in DIMENSIONS.items()
+)
+
+
+def rebuild_resumen(engine) -> dict:
+    """
+    Recalcula reserva_resumen desde cero (bloquea escrituras mientras dura).
+    Retorna: {"grupos": cantidad de filas del resumen por dimensión}
+    """
+    from database.migrations.m0001_reserva_tipos_indices import write_transaction
+
+    with write_transaction(engine) as cursor:
+        for statement in REBUILD_RESUMEN:
+            cursor.execute(statement)
+        rows = cursor.execute(
+            f"SELECT dimension, COUNT(*) FROM {RESUMEN_TABLE} GROUP BY dimension"
+        ).fetchall()
+    return {"grupos": dict(rows)}
+
+
+def check_resumen(engine) -> dict:
+    """
+    Compara el resumen con un recálculo completo (solo lectura).
+    Retorna: {"consistente": bool, "diferencias": [filas que no coinciden, máx. 20]}
+    """
+    raw = engine.raw_connection()
+    try:
+        rows = raw.driver_connection.execute(CHECK_RESUMEN).fetchall()
+    finally:
+        raw.close()
+    return {"consistente": not rows, "diferencias": [list(row) for row in rows[:20]]}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from database.database import engine
+
+    parser = argparse.ArgumentParser(description="Resumen incremental de reservas")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        print(rebuild_resumen(engine))
+    else:
+        print(check_resumen(engine))
@@ -1,20 +1,140 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from database.database import engine, Base
-# Importar todos los modelos para que se registren en Base.metadata
-from models import models
+from fastapi.routing import APIRoute
+from database.database import engine
+from database.profiler import SQLProfilerMiddleware, recent_profiles
 from routers.users import router as users_router
 from routers.reserva import router as reservas_router
 from routers.plan import router as plan_router
+from routers.quotes import router as quotes_router
+from routers.changes import router as changes_router
+from routers.reportes import router as reportes_router
+from routers.reserva.group_commit import GROUP_COMMIT_MAX_BATCH, RESERVA_GROUP_COMMIT, reserva_committer
+from routers.changes.feed import (
+    change_follower,
+    start_change_follower,
+    stop_change_follower,
+    table_versions
+)
+from utils import (
+    MetricsRegistry,
+    MetricsMiddleware,
+    IdempotencyStore,
+    IdempotencyMiddleware,
+    ConditionalGetMiddleware,
+    CompressionMiddleware,
+    AdmissionLimiter,
+    AdmissionController,
+    AdmissionMiddleware
+)
+
+# El esquema se crea/actualiza con: python -m database.migrations.runner upgrade
+# Al arrancar solo se verifica la versión (PRAGMA user_version). Con DB_AUTO_MIGRATE=1
+# el worker aplica él mismo las migraciones pendientes (útil en desarrollo).
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from database.migrations.runner import check_schema, upgrade
+
+    if DB_AUTO_MIGRATE:
+        upgrade(engine)
+    check_schema(engine)
+    # Varios workers (CHANGES_SOURCE=db): seguir el registro de cambios de la base
+    start_change_follower()
+    yield
+
+    stop_change_follower()
+
+    # Confirmar las reservas que queden en la cola del group commit
+    reserva_committer.stop()
 
-# Crear las tablas en la base de datos
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="AventaTravel Group API",
     version="1.0.0",
+    lifespan=lifespan,
+)
+
+API_PREFIX = "/api"
+
+# Control de admisión: tope de peticiones concurrentes a la base por clase de ruta
+# (lecturas / escrituras), con cola acotada y plazo; el exceso recibe 503 + Retry-After.
+# Se agrega primero, así que es el más interno: los 304 por versión y las respuestas
+# idempotentes repetidas se responden antes y no ocupan lugar. El stream SSE queda
+# fuera (conexión larga, sin base).
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+admission_limiters = {
+    "read": AdmissionLimiter(
+        max_concurrent=int(os.getenv("ADMISSION_READ_CONCURRENCY", 32)),
+        max_queue=int(os.getenv("ADMISSION_READ_QUEUE", 256)),
+        queue_timeout=float(os.getenv("ADMISSION_READ_TIMEOUT", 2.0)),
+    ),
+    "write": AdmissionLimiter(
+        max_concurrent=int(os.getenv("ADMISSION_WRITE_CONCURRENCY", 8)),
+        max_queue=int(os.getenv("ADMISSION_WRITE_QUEUE", 128)),
+        queue_timeout=float(os.getenv("ADMISSION_WRITE_TIMEOUT", 2.0)),
+    ),
+}
+admission_routes = {}
+# Con group commit los POST /reservas/ esperan su lote sin tener el lock de la base: con el
+# cupo de "write" el lote nunca juntaría más de ADMISSION_WRITE_CONCURRENCY filas. Tienen su
+# propia clase, con cupo igual al tamaño máximo del lote (GROUP_COMMIT_MAX_BATCH). En modo
+# sync cada espera ocupa además un hilo del threadpool (40 por defecto); en modo async no.
+if RESERVA_GROUP_COMMIT:
+    admission_limiters["group_commit"] = AdmissionLimiter(
+        max_concurrent=int(os.getenv("ADMISSION_GROUP_COMMIT_CONCURRENCY", GROUP_COMMIT_MAX_BATCH)),
+        max_queue=int(os.getenv("ADMISSION_GROUP_COMMIT_QUEUE", 4 * GROUP_COMMIT_MAX_BATCH)),
+        queue_timeout=float(os.getenv("ADMISSION_WRITE_TIMEOUT", 2.0)),
+    )
+    admission_routes[("POST", f"{API_PREFIX}/reservas/")] = "group_commit"
+admission = AdmissionController(admission_limiters)
+if ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission,
+        prefix=API_PREFIX,
+        exempt=(f"{API_PREFIX}/changes/stream",),
+        routes=admission_routes,
+    )
+
+# Idempotency-Key en los POST de creación: un reintento devuelve la respuesta guardada
+# sin volver a insertar. Va por fuera de la admisión (un reintento repetido no ocupa
+# lugar) y por dentro de compresión y CORS, para no guardar sus headers.
+IDEMPOTENT_PATHS = (
+    f"{API_PREFIX}/users/",
+    f"{API_PREFIX}/users/bulk",
+    f"{API_PREFIX}/reservas/",
+    f"{API_PREFIX}/reservas/bulk",
+    f"{API_PREFIX}/plan/",
+    f"{API_PREFIX}/plan/bulk",
+)
+idempotency_store = IdempotencyStore(
+    maxsize=int(os.getenv("IDEMPOTENCY_MAXSIZE", 10000)),
+    ttl=float(os.getenv("IDEMPOTENCY_TTL", 86400)),
+    path=os.getenv("IDEMPOTENCY_DB", ""),
+)
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store, paths=IDEMPOTENT_PATHS)
+
+# GET condicional: ETag por versión de tabla / fila en los endpoints marcados con @versioned.
+# Un If-None-Match vigente se responde 304 aquí mismo, sin pasar por el router ni la base.
+# Con varios workers antes se aplica lo que otros escribieron (change_follower).
+app.add_middleware(
+    ConditionalGetMiddleware,
+    versions=table_versions,
+    routes=app.router.routes,
+    source=change_follower,
 )
 
+# Compresión gzip / br negociada con Accept-Encoding (umbral y niveles: COMPRESSION_MIN_SIZE,
+# GZIP_LEVEL, BROTLI_QUALITY). Va por fuera de la idempotencia: se guardan y repiten
+# respuestas sin comprimir, y cada cliente recibe la codificación que pidió.
+if os.getenv("COMPRESSION_ENABLED", "1") == "1":
+    app.add_middleware(CompressionMiddleware)
+
 # Configurar CORS para permitir conexiones desde React
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +144,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métricas por ruta (latencia, códigos de estado, peticiones en curso) en /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+metrics = MetricsRegistry()
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics, routes=app.router.routes)
+
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        body = metrics.render() + (admission.render() if ADMISSION_ENABLED else "")
+        return Response(content=body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# Perfil SQL por petición (consultas, tiempo en la base, sentencia más lenta)
+app.add_middleware(SQLProfilerMiddleware)
+
+# Últimos perfiles SQL; solo se expone con SQL_PROFILE_DEBUG=1 (muestra sentencias, sin parámetros)
+if os.getenv("SQL_PROFILE_DEBUG", "0") == "1":
+    @app.get("/debug/sql", include_in_schema=False)
+    def get_sql_profiles(limit: int = 20):
+        return {"perfiles": list(recent_profiles)[-limit:]}
+
+
 @app.get("/")
 def root():
     return {
@@ -38,11 +180,52 @@ def root():
         }
     }
 
-API_PREFIX = "/api"
-app.include_router(users_router, prefix=API_PREFIX)
-app.include_router(reservas_router, prefix=API_PREFIX)
-app.include_router(plan_router, prefix=API_PREFIX)
 
+# Modo de la capa de datos: "sync" (Session en el threadpool) o "async" (AsyncSession + aiosqlite)
+API_MODE = os.getenv("API_MODE", "sync")
+
+
+def include_api_router(router: APIRouter, async_router: APIRouter = None):
+    """
+    Incluye un router. Si se pasa `async_router`, cada ruta síncrona que tenga una
+    versión asíncrona (mismo path y métodos) se reemplaza por ella, conservando el
+    orden original de las rutas.
+    """
+    overrides = {}
+    if async_router is not None:
+        overrides = {
+            (route.path, frozenset(route.methods)): route
+            for route in async_router.routes if isinstance(route, APIRoute)
+        }
+
+    merged = APIRouter()
+    for route in router.routes:
+        key = (route.path, frozenset(getattr(route, "methods", None) or ()))
+        merged.routes.append(overrides.get(key, route))
+    app.include_router(merged, prefix=API_PREFIX)
+
+
+if API_MODE == "async":
+    from routers.users.users_async import router as users_async_router
+    from routers.reserva.reserva_async import router as reservas_async_router
+    from routers.plan.plan_async import router as plan_async_router
+
+    include_api_router(users_router, users_async_router)
+    include_api_router(reservas_router, reservas_async_router)
+    include_api_router(plan_router, plan_async_router)
+    include_api_router(quotes_router)
+    include_api_router(changes_router)
+    include_api_router(reportes_router)
+else:
+    include_api_router(users_router)
+    include_api_router(reservas_router)
+    include_api_router(plan_router)
+    include_api_router(quotes_router)
+    include_api_router(changes_router)
+    include_api_router(reportes_router)
+
+# Desarrollo: un proceso con recarga. Producción con varios workers: python serve.py --workers N
 if __name__ == "__main__":
     import uvicorn
+    os.environ.setdefault("DB_AUTO_MIGRATE", "1")
     uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
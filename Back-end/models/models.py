@@ -1,6 +1,9 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy import CheckConstraint, Column, String, Date, DateTime, Integer, ForeignKey, Index, DDL, event
+from sqlalchemy.sql import func, text
 from database.database import Base
+from database.fts import USERS_FTS_DDL, RESERVA_FTS_DDL
+from database.resumen import RESUMEN_DDL
+from database.change_log import CHANGE_LOG_DDL, CHANGE_LOG_TRIGGERS
 from sqlalchemy.orm import relationship
 
 
@@ -9,7 +12,7 @@ class User(Base):
     
     id_usuario = Column(Integer, primary_key=True, autoincrement=True)
     nombre_usuario = Column(String(150), nullable=False)
-    correo_usuario = Column(String(150), nullable=False)
+    correo_usuario = Column(String(150), nullable=False, unique=True, index=True)
     telefono_usuario = Column(String(30), nullable=False)
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
     fecha_actualizacion = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -17,24 +20,38 @@ class User(Base):
     
 
     # Relationship
-    
+    # passive_deletes="all": el borrado no carga ni modifica las reservas (los routers validan con EXISTS)
+    reservas = relationship("Reserva", back_populates="usuario", passive_deletes="all")
 
 
 
 class Reserva(Base):
     __tablename__ = "reserva"
+    __table_args__ = (
+        Index("ix_reserva_fechas", "fecha_inicio", "fecha_fin"),
+        Index("ix_reserva_destino_fechas", "nombre_destino", "fecha_inicio", "fecha_fin"),
+        # Duración en días: MAX() sobre este índice acota las consultas de solapamiento
+        Index("ix_reserva_duracion", text("julianday(fecha_fin) - julianday(fecha_inicio)")),
+        # Filtro ?monto_min= y ?sort=monto_reserva del listado
+        Index("ix_reserva_monto", "monto_reserva"),
+        # El barrido de ocupación y la cota de duración del solapamiento suponen inicio <= fin
+        CheckConstraint("fecha_fin >= fecha_inicio", name="ck_reserva_fechas"),
+    )
 
     id_reserva = Column(Integer, primary_key=True, autoincrement=True)
-    nombre_destino = Column(Integer, nullable=False) 
-    fecha_inicio = Column(String(100), nullable=False)
-    fecha_fin = Column(String(100), nullable=False)
+    nombre_destino = Column(String(150), nullable=False, index=True)
+    fecha_inicio = Column(Date, nullable=False)
+    fecha_fin = Column(Date, nullable=False)
     monto_reserva = Column(Integer, nullable=False)
     cuotas_reserva = Column(Integer, nullable=False)
+    id_usuario = Column(Integer, ForeignKey("users.id_usuario"), nullable=True, index=True)
+    id_plan = Column(Integer, ForeignKey("plan.id_plan"), nullable=True, index=True)
 
     
 
     # Relationship
-    
+    usuario = relationship("User", back_populates="reservas")
+    plan = relationship("Plan", back_populates="reservas")
 
 
 class Plan(Base):
@@ -48,4 +65,58 @@ class Plan(Base):
     
 
     # Relationship
-    
+    reservas = relationship("Reserva", back_populates="plan", passive_deletes="all")
+
+
+# ==================== COLUMNAS PÚBLICAS ====================
+# Columnas que exponen los endpoints; los listados las seleccionan como tuplas
+USER_COLUMNS = (
+    User.id_usuario,
+    User.nombre_usuario,
+    User.correo_usuario,
+    User.telefono_usuario,
+    User.fecha_creacion,
+    User.fecha_actualizacion,
+)
+
+RESERVA_COLUMNS = (
+    Reserva.id_reserva,
+    Reserva.nombre_destino,
+    Reserva.fecha_inicio,
+    Reserva.fecha_fin,
+    Reserva.monto_reserva,
+    Reserva.cuotas_reserva,
+    Reserva.id_usuario,
+    Reserva.id_plan,
+)
+
+PLAN_COLUMNS = (
+    Plan.id_plan,
+    Plan.nombre_plan,
+    Plan.categoria_plan,
+    Plan.descuento_plan,
+)
+
+
+# ==================== BÚSQUEDA DE TEXTO (FTS5) ====================
+# En una base nueva las tablas FTS y sus triggers se crean junto con la tabla
+for statement in USERS_FTS_DDL:
+    event.listen(User.__table__, "after_create", DDL(statement))
+for statement in RESERVA_FTS_DDL:
+    event.listen(Reserva.__table__, "after_create", DDL(statement))
+
+
+# ==================== RESUMEN PARA REPORTES ====================
+# reserva_resumen y sus triggers también se crean junto con la tabla
+# (DDL() aplica formato con %, por eso se escapa el '%Y-%m' de strftime)
+for statement in RESUMEN_DDL:
+    event.listen(Reserva.__table__, "after_create", DDL(statement.replace("%", "%%")))
+
+
+# ==================== REGISTRO DE CAMBIOS (VARIOS WORKERS) ====================
+# change_log y los triggers que lo llenan desde users, reserva y plan
+for statement in CHANGE_LOG_DDL:
+    event.listen(Plan.__table__, "after_create", DDL(statement.replace("%", "%%")))
+for table in (User.__table__, Reserva.__table__, Plan.__table__):
+    for statement in CHANGE_LOG_TRIGGERS[table.name]:
+        event.listen(table, "after_create", DDL(statement))
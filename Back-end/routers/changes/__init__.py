@@ -0,0 +1 @@
+from .changes import router
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Router del feed de cambios: los clientes aplican deltas (insert / update / delete)
+en vez de volver a descargar la tabla completa después de cada escritura.
+
+- GET /changes/stream: Server-Sent Events en vivo. Al reconectar, el navegador
+  manda Last-Event-ID y se reenvían los eventos perdidos desde el buffer.
+- GET /changes?since=<seq>: recuperación por consulta (mismo buffer).
+"""
+
+import asyncio
+import os
+from typing import Optional, Set
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from utils import FastJSONResponse, dumps
+from .feed import change_feed
+
+# Tablas que publican cambios (nombres de los eventos)
+CHANGE_TABLES = ("users", "reservas", "plan")
+
+# Máximo de eventos por respuesta de /changes
+MAX_CHANGES = 1000
+
+# Comentario SSE para mantener viva la conexión (proxies) y espera sugerida al reconectar
+SSE_KEEPALIVE = float(os.getenv("SSE_KEEPALIVE", 15))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", 3000))
+
+# ==================== CONFIGURACIÓN DEL ROUTER ====================
+router = APIRouter(prefix="/changes", tags=["Cambios"])
+
+
+def _parse_tables(tables: Optional[str]) -> Optional[Set[str]]:
+    """
+    Valida el filtro de tablas ("reservas,users"). Retorna: el conjunto o None (todas)
+    """
+    if not tables:
+        return None
+    names = {name.strip() for name in tables.split(",") if name.strip()}
+    unknown = names - set(CHANGE_TABLES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tablas no válidas: {', '.join(sorted(unknown))}. Opciones: {', '.join(CHANGE_TABLES)}"
+        )
+    return names
+
+
+async def _refresh_feed():
+    # Varios workers: el cliente pudo ver un seq de otro worker que este todavía no aplicó
+    if change_feed.source is not None:
+        await run_in_threadpool(change_feed.refresh)
+
+
+def _control_frame(event: str, seq: int) -> bytes:
+    # Lleva id: el navegador lo manda como Last-Event-ID al reconectar
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (seq, event.encode(), dumps({"last_seq": seq}))
+
+
+# ==================== ENDPOINTS ====================
+
+@router.get("")
+async def list_changes(
+    since: int = Query(..., ge=0),
+    limit: int = Query(MAX_CHANGES, ge=1, le=MAX_CHANGES),
+    tables: Optional[str] = None
+):
+    """
+    Obtiene los cambios posteriores a `since`, en orden de seq.
+    Si `since` ya no está en el buffer responde 410: el cliente debe recargar la tabla.
+    Retorna: {"cambios": [eventos], "last_seq": último seq publicado,
+              "next_since": seq para la siguiente consulta, "has_more": bool}
+    """
+    table_names = _parse_tables(tables)
+    await _refresh_feed()
+    changes, gap = change_feed.since(since, table_names, limit + 1)
+    if gap:
+        raise HTTPException(
+            status_code=410,
+            detail="since ya no está en el buffer de cambios; recargue la tabla completa"
+        )
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    last_seq = change_feed.last_seq
+    return FastJSONResponse({
+        "cambios": [change.event for change in changes],
+        "last_seq": last_seq,
+        "next_since": changes[-1].seq if has_more else max(last_seq, since),
+        "has_more": has_more,
+    })
+
+
+@router.get("/stream")
+async def stream_changes(
+    since: Optional[int] = Query(None, ge=0),
+    tables: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream SSE de cambios. Eventos:
+    - "change": {"seq", "table", "op", "id", "data"}
+    - "ready": {"last_seq"} cuando terminó la recuperación y empieza el envío en vivo
+    - "reset": {"last_seq"} si se perdieron eventos; el cliente debe recargar la tabla
+    Sin `since` (ni Last-Event-ID) solo se envían los cambios nuevos.
+    """
+    table_names = _parse_tables(tables)
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def event_stream():
+        subscription = change_feed.subscribe()
+        try:
+            yield b"retry: %d\n\n" % SSE_RETRY_MS
+
+            if since is not None:
+                await _refresh_feed()
+            last_sent = change_feed.last_seq
+            if since is not None:
+                backlog, gap = change_feed.since(since, table_names)
+                if gap:
+                    yield _control_frame("reset", last_sent)
+                else:
+                    for change in backlog:
+                        yield change.frame
+                    last_sent = max(since, backlog[-1].seq if backlog else since, last_sent)
+            yield _control_frame("ready", last_sent)
+
+            while True:
+                try:
+                    change = await asyncio.wait_for(subscription.queue.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if change is None:
+                    # Cliente lento: se perdieron eventos de su cola
+                    yield _control_frame("reset", change_feed.last_seq)
+                    return
+                if change.seq <= last_sent:
+                    continue
+                last_sent = change.seq
+                if table_names is None or change.table in table_names:
+                    yield change.frame
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
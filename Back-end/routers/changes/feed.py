@@ -0,0 +1,103 @@
+"""
+Feed de cambios compartido por los routers de users, reservas y plan
+(síncronos y asíncronos). Cada handler publica después de su commit, y eso
+también sube las versiones de tabla / fila que usan los ETag.
+
+Con CHANGES_SOURCE=db (varios workers, lo activa serve.py) los cambios salen
+del registro change_log de la base y no de la memoria del worker: ver
+database/change_log.py.
+"""
+
+import os
+import time
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from utils import ChangeFeed, TableVersions, rows_to_dicts
+
+CHANGES_BUFFER_SIZE = int(os.getenv("CHANGES_BUFFER_SIZE", 10000))
+CHANGES_SUBSCRIBER_QUEUE = int(os.getenv("CHANGES_SUBSCRIBER_QUEUE", 1000))
+
+# "memory": un solo proceso. "db": se sigue el registro change_log (compartido por los workers)
+CHANGES_SOURCE = os.getenv("CHANGES_SOURCE", "memory")
+# Segundos entre consultas al registro (demora máxima de los eventos SSE entre workers)
+CHANGES_POLL_INTERVAL = float(os.getenv("CHANGES_POLL_INTERVAL", 0.1))
+# Seq desde el que cuentan las versiones; serve.py fija el mismo para todos sus workers
+CHANGES_FLOOR = os.getenv("CHANGES_FLOOR", "")
+
+# Consultas de filas para los eventos de /bulk (IN de a este tamaño)
+PUBLISH_CHUNK_SIZE = 500
+
+change_feed = ChangeFeed(maxlen=CHANGES_BUFFER_SIZE, subscriber_queue=CHANGES_SUBSCRIBER_QUEUE)
+
+# Versión por tabla y por fila (ETag de los GET): la sube cada cambio publicado
+table_versions = TableVersions()
+change_feed.add_listener(table_versions.record)
+
+change_follower = None
+if CHANGES_SOURCE == "db":
+    from database.change_log import ChangeLogFollower
+    from database.database import engine
+    from models.models import (
+        Plan as PlanModel, PLAN_COLUMNS,
+        Reserva as ReservaModel, RESERVA_COLUMNS,
+        User as UserModel, USER_COLUMNS,
+    )
+
+    change_follower = ChangeLogFollower(
+        engine,
+        {
+            "users": (USER_COLUMNS, UserModel.id_usuario),
+            "reservas": (RESERVA_COLUMNS, ReservaModel.id_reserva),
+            "plan": (PLAN_COLUMNS, PlanModel.id_plan),
+        },
+        publish=change_feed.extend,
+        interval=CHANGES_POLL_INTERVAL,
+    )
+
+
+def start_change_follower():
+    """
+    Arranque del worker (con el esquema ya verificado): en modo "db" fija el
+    epoch y el piso de versiones y empieza a seguir el registro. Las entradas
+    posteriores al piso (ej. un worker que se reinició) se aplican enseguida.
+    """
+    if change_follower is None:
+        return
+
+    from database.change_log import log_position
+
+    epoch, oldest, last = log_position(change_follower.engine)
+    floor = int(CHANGES_FLOOR) if CHANGES_FLOOR else last
+    if floor > last or floor < oldest - 1:
+        # Otra base, o el registro ya no guarda lo posterior al piso: se empieza desde el final
+        floor = last
+    table_versions.rebase(epoch, floor, time.time())
+    change_feed.attach_source(change_follower, floor)
+    change_follower.start(floor)
+
+
+def stop_change_follower():
+    if change_follower is not None:
+        change_follower.stop()
+
+
+def publish_bulk(db: Session, table: str, columns, pk_column, results: List[dict], upsert: bool):
+    """
+    Publica los elementos exitosos de un /bulk, leyendo las filas completas
+    (con columnas calculadas por la base, ej. fecha_creacion) en bloques.
+    Con upsert no se sabe qué filas eran nuevas: todas salen como "update".
+    """
+    if change_feed.source is not None:
+        # Los triggers ya anotaron cada fila en el registro: el seguidor las publica
+        change_feed.source.notify()
+        return
+
+    ids = [result[pk_column.key] for result in results if result["estado"] == "ok"]
+    op = "update" if upsert else "insert"
+    for start in range(0, len(ids), PUBLISH_CHUNK_SIZE):
+        chunk = ids[start:start + PUBLISH_CHUNK_SIZE]
+        rows = rows_to_dicts(db.query(*columns).filter(pk_column.in_(chunk)).order_by(pk_column).all())
+        change_feed.publish_many(table, op, ((row[pk_column.key], row) for row in rows))
+
@@ -0,0 +1,30 @@
+"""
+Caché del catálogo de planes (compartida por el router síncrono y el asíncrono)
+"""
+
+import os
+
+from routers.changes.feed import change_feed
+from utils import TTLCache
+
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", 60))
+PLAN_CACHE_MAXSIZE = int(os.getenv("PLAN_CACHE_MAXSIZE", 256))
+PLAN_CACHE_CONTROL = os.getenv("PLAN_CACHE_CONTROL", "no-cache")
+
+plan_cache = TTLCache(maxsize=PLAN_CACHE_MAXSIZE, ttl=PLAN_CACHE_TTL)
+
+
+def invalidate_plan_cache():
+    """
+    Se llama después de cualquier escritura sobre la tabla plan.
+    """
+    plan_cache.clear()
+
+
+def _invalidate_on_change(change):
+    # Con varios workers también llegan aquí las escrituras de los demás (registro change_log)
+    if change.table == "plan":
+        plan_cache.clear()
+
+
+change_feed.add_listener(_invalidate_on_change)
\ No newline at end of file
@@ -1,12 +1,33 @@
 """
-Router para la entidad Reserva (Resevas)
+Router para la entidad Plan (Planes)
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 from database.database import get_db
-from models.models import Plan as PlanModel
-from schemas import Plan, PlanCreate
+from models.models import Plan as PlanModel, Reserva as ReservaModel, PLAN_COLUMNS
+from schemas import Plan, PlanCreate, PlanBulkItem
+from routers.changes.feed import change_feed, publish_bulk
+from utils import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    MAX_BULK_ITEMS,
+    paginate,
+    parse_fields,
+    parse_sort,
+    bulk_insert,
+    bulk_summary,
+    build_entry,
+    cached_json_response,
+    FastJSONResponse,
+    rows_to_dicts,
+    entity_dict,
+    versioned,
+    raise_if_busy
+)
+from .cache import PLAN_CACHE_CONTROL, plan_cache, invalidate_plan_cache
 
 # ==================== CONFIGURACIÓN DEL ROUTER ====================
 router = APIRouter(prefix="/plan", tags=["Planes"])
@@ -15,27 +36,48 @@ router = APIRouter(prefix="/plan", tags=["Planes"])
 # ==================== ENDPOINTS CRUD ====================
 
 @router.get("/")
-def list_planes(db: Session = Depends(get_db)):
+@versioned("plan")
+def list_planes(
+    request: Request,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    categoria_plan: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """
-    Obtiene todas las entidades.
-    Retorna: {"reservas": [lista de reservas]}
+    Obtiene una página de entidades (paginación por cursor sobre id_plan).
+    - fields: columnas a devolver; sort: columna de orden (con - para descendente)
+    - categoria_plan: filtro por igualdad
+    Se sirve desde la caché del catálogo. El ETag y el 304 (versión de la tabla
+    plan) los responde ConditionalGetMiddleware antes de llegar aquí.
+    Retorna: {"planes": [lista de planes], "next_cursor": cursor o null, "limit": limit}
     """
+    sort_column, descending = parse_sort(sort, PLAN_COLUMNS, PlanModel.id_plan)
+    columns = parse_fields(fields, PLAN_COLUMNS, PlanModel.id_plan, sort_column)
+
+    cache_key = (limit, cursor, tuple(column.key for column in columns), sort, categoria_plan)
+    entry = plan_cache.get(cache_key)
+    if entry is not None:
+        return cached_json_response(request, entry, PLAN_CACHE_CONTROL)
+
     try:
-        planes = db.query(ReservaModel).all()
-        
-        # Transformar cada entidad: convertir objetos SQLAlchemy a dict y transformar IDs
-        planes_dict = []
-        for plan in planes:
-            plan_dict = {
-                'id_plan': plan.id_plan,
-                'nombre_plan': plan.nombre_plan,
-                'categoria_plan': plan.categoria_plan,
-                'descuento_plan': plan.descuento_plan,
-            }
-            planes_dict.append(plan_dict)
-        
-        return {"planes": planes_dict}
+        generation = plan_cache.generation
+        # Se seleccionan solo las columnas pedidas (tuplas, sin construir entidades ORM)
+        query = db.query(*columns)
+        if categoria_plan is not None:
+            query = query.filter(PlanModel.categoria_plan == categoria_plan)
+        planes, next_cursor = paginate(query, PlanModel.id_plan, cursor, limit, sort_column, descending)
+        planes_dict = rows_to_dicts(planes)
+        
+        payload = {"planes": planes_dict, "next_cursor": next_cursor, "limit": limit}
+        entry = plan_cache.set(cache_key, build_entry(payload), generation)
+        return cached_json_response(request, entry, PLAN_CACHE_CONTROL)
+    except HTTPException:
+        raise
     except Exception as e:
+        raise_if_busy(e)
         raise HTTPException(status_code=500, detail=f"Error al obtener los planes: {str(e)}")
 
 
@@ -48,7 +90,6 @@ def create_plan(plan: PlanCreate, db: Session = Depends(get_db)):
     try:
         # Crear instancia del modelo con los datos del schema
         db_plan = PlanModel(
-            id_plan = plan.id_plan,
             nombre_plan = plan.nombre_plan,
             categoria_plan = plan.categoria_plan,
             descuento_plan = plan.descuento_plan,
@@ -56,25 +97,52 @@ def create_plan(plan: PlanCreate, db: Session = Depends(get_db)):
         
         db.add(db_plan)
         db.commit()
+        invalidate_plan_cache()
         db.refresh(db_plan)
         
         # Transformar la respuesta
-        plan_dict = {
-            'id_plan': db_plan.id_plan,
-            'nombre_plan': db_plan.nombre_plan,
-            'categoria_plan': db_plan.categoria_plan,
-            'descuento_plan': db_plan.descuento_plan,
-        }
+        plan_dict = entity_dict(db_plan, PLAN_COLUMNS)
+        change_feed.publish("plan", "insert", plan_dict["id_plan"], plan_dict)
         
-        return {
+        return FastJSONResponse({
             "mensaje": "Plan creado correctamente",
             "plan": plan_dict
-        }
+        })
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al crear el nuevo plan: {str(e)}")
 
 
+@router.post("/bulk")
+def bulk_create_planes(
+    plans: List[PlanBulkItem],
+    upsert: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Crea (o actualiza con upsert=true, por id_plan) varias entidades a la vez.
+    Inserta con executemany en transacciones por bloques.
+    Retorna: {"mensaje", "total", "exitosos", "fallidos", "resultados": [resultado por elemento]}
+    """
+    if len(plans) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Se permiten máximo {MAX_BULK_ITEMS} elementos por solicitud"
+        )
+
+    try:
+        items = [plan.model_dump() for plan in plans]
+        results = bulk_insert(db, PlanModel, PlanModel.id_plan, items, upsert=upsert)
+        invalidate_plan_cache()
+        publish_bulk(db, "plan", PLAN_COLUMNS, PlanModel.id_plan, results, upsert)
+        return bulk_summary("planes", results)
+    except Exception as e:
+        db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error en la carga masiva de planes: {str(e)}")
+
+
 @router.put("/{plan_id}")
 def update_plan(
     plan_id: int,
@@ -99,24 +167,22 @@ def update_plan(
 
         
         db.commit()
+        invalidate_plan_cache()
         db.refresh(plan)
         
         # Transformar la respuesta
-        plan_dict = {
-            'id_plan': db_plan.id_plan,
-            'nombre_plan': db_plan.nombre_plan,
-            'categoria_plan': db_plan.categoria_plan,
-            'descuento_plan': db_plan.descuento_plan,
-        }
+        plan_dict = entity_dict(plan, PLAN_COLUMNS)
+        change_feed.publish("plan", "update", plan_id, plan_dict)
         
-        return {
+        return FastJSONResponse({
             "mensaje": "Plan actualizado",
             "plan": plan_dict
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al actualizar el plan: {str(e)}")
 
 
@@ -134,24 +200,26 @@ def delete_plan(plan_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Plan no encontrado")
         
         # ==================== VALIDACIÓN DE FOREIGN KEYS ====================
-        # Verificar si hay usuarios relacionados con este producto
-        from models.models import User as UserModel
-        usuarios_relacionados = db.query(UserModel).filter(
-            UserModel.id_reserva == plan_id
-        ).first()
+        # EXISTS sobre el índice ix_reserva_id_plan: se detiene en la primera reserva
+        reservas_relacionadas = db.query(
+            exists().where(ReservaModel.id_plan == plan_id)
+        ).scalar()
         
-        if usuarios_relacionados:
+        if reservas_relacionadas:
             raise HTTPException(
                 status_code=400,
-                detail="No se puede eliminar este plan porque tiene usuarios relacionados."
+                detail="No se puede eliminar este plan porque tiene reservas relacionadas."
             )
         
         db.delete(plan)
         db.commit()
+        invalidate_plan_cache()
+        change_feed.publish("plan", "delete", plan_id)
         
         return {"mensaje": "Plan eliminado"}
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al eliminar el plan: {str(e)}")
@@ -0,0 +1,183 @@
+"""
+Router asíncrono para la entidad Plan (Planes)
+Mismos endpoints CRUD que plan.py pero con AsyncSession (API_MODE=async)
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_database import get_async_db
+from models.models import Plan as PlanModel, Reserva as ReservaModel, PLAN_COLUMNS
+from schemas import PlanCreate
+from routers.changes.feed import change_feed
+from utils import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    paginate_async,
+    parse_fields,
+    parse_sort,
+    build_entry,
+    cached_json_response,
+    FastJSONResponse,
+    rows_to_dicts,
+    entity_dict,
+    versioned,
+    raise_if_busy
+)
+from .cache import PLAN_CACHE_CONTROL, plan_cache, invalidate_plan_cache
+
+# ==================== CONFIGURACIÓN DEL ROUTER ====================
+router = APIRouter(prefix="/plan", tags=["Planes"])
+
+
+# ==================== ENDPOINTS CRUD ====================
+
+@router.get("/")
+@versioned("plan")
+async def list_planes_async(
+    request: Request,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    categoria_plan: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtiene una página de entidades (paginación por cursor sobre id_plan).
+    - fields: columnas a devolver; sort: columna de orden (con - para descendente)
+    - categoria_plan: filtro por igualdad
+    Se sirve desde la caché del catálogo. El ETag y el 304 (versión de la tabla
+    plan) los responde ConditionalGetMiddleware antes de llegar aquí.
+    Retorna: {"planes": [lista de planes], "next_cursor": cursor o null, "limit": limit}
+    """
+    sort_column, descending = parse_sort(sort, PLAN_COLUMNS, PlanModel.id_plan)
+    columns = parse_fields(fields, PLAN_COLUMNS, PlanModel.id_plan, sort_column)
+
+    cache_key = (limit, cursor, tuple(column.key for column in columns), sort, categoria_plan)
+    entry = plan_cache.get(cache_key)
+    if entry is not None:
+        return cached_json_response(request, entry, PLAN_CACHE_CONTROL)
+
+    try:
+        generation = plan_cache.generation
+        stmt = select(*columns)
+        if categoria_plan is not None:
+            stmt = stmt.where(PlanModel.categoria_plan == categoria_plan)
+        planes, next_cursor = await paginate_async(db, stmt, PlanModel.id_plan, cursor, limit, sort_column, descending)
+        planes_dict = rows_to_dicts(planes)
+        payload = {"planes": planes_dict, "next_cursor": next_cursor, "limit": limit}
+        entry = plan_cache.set(cache_key, build_entry(payload), generation)
+        return cached_json_response(request, entry, PLAN_CACHE_CONTROL)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener los planes: {str(e)}")
+
+
+@router.post("/")
+async def create_plan_async(plan: PlanCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Crea una nueva entidad.
+    Retorna: {"mensaje": "mensaje de éxito", "plan": plan creado}
+    """
+    try:
+        db_plan = PlanModel(
+            nombre_plan=plan.nombre_plan,
+            categoria_plan=plan.categoria_plan,
+            descuento_plan=plan.descuento_plan,
+        )
+
+        db.add(db_plan)
+        await db.commit()
+        invalidate_plan_cache()
+        await db.refresh(db_plan)
+
+        plan_dict = entity_dict(db_plan, PLAN_COLUMNS)
+        change_feed.publish("plan", "insert", plan_dict["id_plan"], plan_dict)
+
+        return FastJSONResponse({
+            "mensaje": "Plan creado correctamente",
+            "plan": plan_dict
+        })
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al crear el nuevo plan: {str(e)}")
+
+
+@router.put("/{plan_id}")
+async def update_plan_async(
+    plan_id: int,
+    plan_update: PlanCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualiza una entidad existente.
+    Retorna: {"mensaje": "mensaje de éxito", "plan": plan actualizado}
+    """
+    try:
+        plan = await db.get(PlanModel, plan_id)
+
+        if not plan:
+            raise HTTPException(status_code=404, detail="Plan no encontrado")
+
+        plan.nombre_plan = plan_update.nombre_plan
+        plan.categoria_plan = plan_update.categoria_plan
+        plan.descuento_plan = plan_update.descuento_plan
+
+        await db.commit()
+        invalidate_plan_cache()
+        await db.refresh(plan)
+
+        plan_dict = entity_dict(plan, PLAN_COLUMNS)
+        change_feed.publish("plan", "update", plan_id, plan_dict)
+
+        return FastJSONResponse({
+            "mensaje": "Plan actualizado",
+            "plan": plan_dict
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al actualizar el plan: {str(e)}")
+
+
+@router.delete("/{plan_id}")
+async def delete_plan_async(plan_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Elimina una entidad.
+    Retorna: {"mensaje": "mensaje de éxito"}
+    """
+    try:
+        plan = await db.get(PlanModel, plan_id)
+
+        if not plan:
+            raise HTTPException(status_code=404, detail="Plan no encontrado")
+
+        # Validación de Foreign Keys: EXISTS sobre el índice ix_reserva_id_plan
+        reservas_relacionadas = await db.scalar(
+            select(exists().where(ReservaModel.id_plan == plan_id))
+        )
+        if reservas_relacionadas:
+            raise HTTPException(
+                status_code=400,
+                detail="No se puede eliminar este plan porque tiene reservas relacionadas."
+            )
+
+        await db.delete(plan)
+        await db.commit()
+        invalidate_plan_cache()
+        change_feed.publish("plan", "delete", plan_id)
+
+        return {"mensaje": "Plan eliminado"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al eliminar el plan: {str(e)}")
@@ -0,0 +1 @@
+from .quotes import router
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Motor de cotizaciones vectorizado (NumPy).
+
+Para cada combinación monto × plan × cuotas calcula:
+- descuento del plan (porcentaje entero descuento_plan)
+- total con descuento, redondeado a la unidad (mitad hacia arriba)
+- valor de cada cuota, redondeado hacia abajo al múltiplo de `redondeo`
+- última cuota, que absorbe la diferencia: la suma de las cuotas es exactamente el total
+
+Todo se hace con aritmética entera en arreglos int64 (sin errores de punto
+flotante) y por lote completo, sin ciclos de Python por cotización.
+
+Los descuentos de los planes se leen una vez y se guardan como arreglos
+ordenados por id_plan; se recargan cuando la caché del catálogo de planes
+cambia de generación (cualquier escritura sobre plan la invalida).
+
+NumPy se importa en la primera cotización y no al cargar el módulo: son unos
+100 ms del arranque de cada worker, que no todos usan.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from models.models import Plan as PlanModel
+from routers.plan.cache import plan_cache
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Máximo de cotizaciones por solicitud
+MAX_QUOTES = 100000
+
+# id_plan usado en los arreglos para "sin plan" (descuento 0)
+SIN_PLAN = -1
+
+
+# ==================== DESCUENTOS PRECALCULADOS ====================
+
+class DiscountTable:
+    """
+    Descuentos de todos los planes como arreglos NumPy (ids ordenados + descuentos).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        # Se llenan en el primer load()
+        self.ids: Optional[np.ndarray] = None
+        self.descuentos: Optional[np.ndarray] = None
+
+    def load(self, db: Session):
+        import numpy as np
+
+        with self._lock:
+            generation = plan_cache.generation
+            if generation == self._generation:
+                return self
+            rows = db.query(PlanModel.id_plan, PlanModel.descuento_plan).order_by(PlanModel.id_plan).all()
+            ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            descuentos = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+            self.ids, self.descuentos = ids, np.clip(descuentos, 0, 100)
+            self._generation = generation
+            return self
+
+    def lookup(self, id_planes: np.ndarray) -> np.ndarray:
+        """
+        Descuento de cada id_plan del arreglo (0 para SIN_PLAN).
+        Lanza 404 si algún plan no existe.
+        """
+        import numpy as np
+
+        ids, descuentos = self.ids, self.descuentos
+        con_plan = id_planes != SIN_PLAN
+        positions = np.searchsorted(ids, id_planes)
+        positions = np.minimum(positions, max(len(ids) - 1, 0))
+        found = (ids[positions] == id_planes) if len(ids) else np.zeros(len(id_planes), dtype=bool)
+        missing = con_plan & ~found
+        if missing.any():
+            faltantes = sorted(set(id_planes[missing].tolist()))[:20]
+            raise HTTPException(status_code=404, detail=f"Planes no encontrados: {faltantes}")
+        if not len(ids):
+            return np.zeros(len(id_planes), dtype=np.int64)
+        return np.where(con_plan, descuentos[positions], 0)
+
+
+discount_table = DiscountTable()
+
+
+# ==================== CÁLCULO ====================
+
+def build_combinations(
+    montos: List[int],
+    id_planes: List[Optional[int]],
+    cuotas: List[int],
+    modo: str,
+):
+    """
+    Arma los arreglos de entrada: producto cartesiano ("producto") o filas alineadas ("filas").
+    Retorna: (montos, id_planes, cuotas) como arreglos int64 del mismo largo
+    """
+    import numpy as np
+
+    montos_arr = np.asarray(montos, dtype=np.int64)
+    planes_arr = np.asarray([SIN_PLAN if p is None else p for p in id_planes], dtype=np.int64)
+    cuotas_arr = np.asarray(cuotas, dtype=np.int64)
+    if (montos_arr < 0).any():
+        raise HTTPException(status_code=400, detail="Los montos no pueden ser negativos")
+    if (cuotas_arr < 1).any():
+        raise HTTPException(status_code=400, detail="Las cuotas deben ser mayores o iguales a 1")
+
+    if modo == "producto":
+        total = len(montos_arr) * len(planes_arr) * len(cuotas_arr)
+        if total > MAX_QUOTES:
+            raise HTTPException(status_code=400, detail=f"Se permiten máximo {MAX_QUOTES} cotizaciones por solicitud")
+        grid = np.meshgrid(montos_arr, planes_arr, cuotas_arr, indexing="ij")
+        return grid[0].ravel(), grid[1].ravel(), grid[2].ravel()
+
+    largo = max(len(montos_arr), len(planes_arr), len(cuotas_arr))
+    if largo > MAX_QUOTES:
+        raise HTTPException(status_code=400, detail=f"Se permiten máximo {MAX_QUOTES} cotizaciones por solicitud")
+    try:
+        return tuple(np.broadcast_to(arr, (largo,)) for arr in (montos_arr, planes_arr, cuotas_arr))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="En modo 'filas' montos, id_planes y cuotas deben tener el mismo largo (o largo 1)"
+        )
+
+
+def quote_batch(montos: np.ndarray, descuentos: np.ndarray, cuotas: np.ndarray, redondeo: int) -> dict:
+    """
+    Calcula las cotizaciones de un lote completo.
+    Retorna: dict de columnas (arreglos NumPy) con el resultado de cada cotización
+    """
+    # Total con descuento, redondeado a la unidad (mitad hacia arriba, montos >= 0)
+    totales = (montos * (100 - descuentos) + 50) // 100
+    valor_descuento = montos - totales
+
+    # Cuotas redondeadas hacia abajo al múltiplo de `redondeo`; la última cubre el resto
+    valor_cuota = (totales // cuotas) // redondeo * redondeo
+    ultima_cuota = totales - valor_cuota * (cuotas - 1)
+
+    return {
+        "descuento_plan": descuentos,
+        "valor_descuento": valor_descuento,
+        "total": totales,
+        "valor_cuota": valor_cuota,
+        "ultima_cuota": ultima_cuota,
+    }
@@ -0,0 +1,47 @@
+"""
+Router de cotizaciones: total con descuento del plan y valor de las cuotas,
+calculados por lotes con NumPy (ver cotizador.py).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from database.database import get_db
+from schemas import QuoteBatchRequest
+from utils import FastJSONResponse, raise_if_busy
+from .cotizador import SIN_PLAN, build_combinations, discount_table, quote_batch
+
+# ==================== CONFIGURACIÓN DEL ROUTER ====================
+router = APIRouter(prefix="/quotes", tags=["Cotizaciones"])
+
+
+# ==================== ENDPOINTS ====================
+
+@router.post("/batch")
+def quote_batch_endpoint(request: QuoteBatchRequest, db: Session = Depends(get_db)):
+    """
+    Cotiza un lote completo. Con modo="producto" se cotizan todas las combinaciones
+    montos × id_planes × cuotas; con modo="filas" cada posición de las listas es una cotización.
+    La respuesta es por columnas (una lista por campo, todas del mismo largo).
+    Retorna: {"total_cotizaciones", "monto", "id_plan", "cuotas", "descuento_plan",
+              "valor_descuento", "total", "valor_cuota", "ultima_cuota"}
+    """
+    try:
+        montos, id_planes, cuotas = build_combinations(
+            request.montos, request.id_planes, request.cuotas, request.modo
+        )
+        descuentos = discount_table.load(db).lookup(id_planes)
+        resultado = quote_batch(montos, descuentos, cuotas, request.redondeo)
+
+        planes = id_planes.tolist()
+        return FastJSONResponse({
+            "total_cotizaciones": len(montos),
+            "monto": montos.tolist(),
+            "id_plan": [None if plan == SIN_PLAN else plan for plan in planes],
+            "cuotas": cuotas.tolist(),
+            **{campo: valores.tolist() for campo, valores in resultado.items()},
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al calcular las cotizaciones: {str(e)}")
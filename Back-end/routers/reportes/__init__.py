@@ -0,0 +1 @@
+from .reportes import router
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Router de reportes de reservas (cantidad, monto total y promedio de cuotas por grupo).
+
+Se sirve desde la tabla reserva_resumen, que los triggers de reserva mantienen
+al día en cada alta, modificación y baja (ver database/resumen.py): cada
+consulta lee una fila por grupo, sin recorrer las reservas.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from database.database import get_db
+from database.resumen import RESUMEN_TABLE
+from utils import FastJSONResponse, versioned, raise_if_busy
+
+# group_by -> nombre de la clave en cada grupo de la respuesta
+GROUP_KEYS = {
+    "destino": "destino",
+    "mes": "mes",
+    "plan": "id_plan",
+}
+
+# ==================== CONFIGURACIÓN DEL ROUTER ====================
+router = APIRouter(prefix="/reportes", tags=["Reportes"])
+
+
+def _grupo(clave, reservas: int, monto_total: int, cuotas_total: int, key: str) -> dict:
+    return {
+        key: clave,
+        "reservas": reservas,
+        "monto_total": monto_total,
+        "promedio_cuotas": round(cuotas_total / reservas, 2) if reservas else 0,
+    }
+
+
+# ==================== ENDPOINTS ====================
+
+@router.get("/reservas")
+@versioned("reservas", "plan")
+def reporte_reservas(
+    group_by: str = Query("destino", pattern="^(destino|mes|plan)$"),
+    db: Session = Depends(get_db)
+):
+    """
+    Totales de reservas agrupados por destino, mes de inicio ("YYYY-MM") o plan.
+    En group_by=plan, las reservas sin plan van en el grupo con id_plan null.
+    Retorna: {"group_by", "grupos": [{<clave>, "reservas", "monto_total", "promedio_cuotas"}],
+              "totales": {"reservas", "monto_total", "promedio_cuotas"}}
+    """
+    try:
+        key = GROUP_KEYS[group_by]
+        if group_by == "plan":
+            rows = db.execute(text(
+                f"""SELECT CAST(NULLIF(r.clave, '') AS INTEGER), p.nombre_plan,
+                           r.reservas, r.monto_total, r.cuotas_total
+                    FROM {RESUMEN_TABLE} r
+                    LEFT JOIN plan p ON p.id_plan = CAST(NULLIF(r.clave, '') AS INTEGER)
+                    WHERE r.dimension = 'plan'
+                    ORDER BY r.monto_total DESC"""
+            )).all()
+            grupos = [
+                {**_grupo(id_plan, reservas, monto, cuotas, key), "nombre_plan": nombre_plan}
+                for id_plan, nombre_plan, reservas, monto, cuotas in rows
+            ]
+        else:
+            rows = db.execute(
+                text(
+                    f"""SELECT clave, reservas, monto_total, cuotas_total
+                        FROM {RESUMEN_TABLE}
+                        WHERE dimension = :dimension
+                        ORDER BY {'clave' if group_by == 'mes' else 'monto_total DESC'}"""
+                ),
+                {"dimension": group_by}
+            ).all()
+            grupos = [_grupo(clave, reservas, monto, cuotas, key) for clave, reservas, monto, cuotas in rows]
+
+        # Los totales salen de los mismos grupos (cada reserva está en un solo grupo por dimensión)
+        reservas = sum(grupo["reservas"] for grupo in grupos)
+        cuotas = sum(row[-1] for row in rows)
+        totales = _grupo(None, reservas, sum(grupo["monto_total"] for grupo in grupos), cuotas, key)
+        del totales[key]
+
+        return FastJSONResponse({"group_by": group_by, "grupos": grupos, "totales": totales})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener el reporte: {str(e)}")
@@ -0,0 +1,20 @@
+"""
+Filtros del listado de reservas (compartidos por el router síncrono y el asíncrono).
+Se aplican como WHERE: nombre_destino usa el índice ix_reserva_destino_fechas.
+"""
+
+from typing import List, Optional
+
+from models.models import Reserva as ReservaModel
+
+
+def reserva_filters(nombre_destino: Optional[str] = None, monto_min: Optional[int] = None) -> List:
+    """
+    Retorna: las condiciones WHERE para los filtros recibidos
+    """
+    conditions = []
+    if nombre_destino is not None:
+        conditions.append(ReservaModel.nombre_destino == nombre_destino)
+    if monto_min is not None:
+        conditions.append(ReservaModel.monto_reserva >= monto_min)
+    return conditions
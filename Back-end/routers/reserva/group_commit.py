@@ -0,0 +1,50 @@
+"""
+Group commit de create_reserva (compartido por el router síncrono y el asíncrono).
+
+Con RESERVA_GROUP_COMMIT=1, los POST /reservas/ concurrentes se insertan juntos
+en una transacción. El lote se confirma al juntar GROUP_COMMIT_MAX_BATCH filas
+o a los GROUP_COMMIT_WAIT_MS ms de la primera fila. Cada petición espera el
+commit de su lote y responde con su id_reserva.
+"""
+
+import os
+
+from database.database import engine
+from database.group_commit import GroupCommitter
+from models.models import Reserva as ReservaModel, RESERVA_COLUMNS
+from schemas import ReservaCreate
+
+RESERVA_GROUP_COMMIT = os.getenv("RESERVA_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", 256))
+GROUP_COMMIT_WAIT_MS = float(os.getenv("GROUP_COMMIT_WAIT_MS", 2))
+GROUP_COMMIT_TIMEOUT = float(os.getenv("GROUP_COMMIT_TIMEOUT", 30))
+
+reserva_committer = GroupCommitter(
+    engine,
+    ReservaModel.__table__,
+    max_batch=GROUP_COMMIT_MAX_BATCH,
+    max_wait_ms=GROUP_COMMIT_WAIT_MS,
+)
+
+
+def reserva_values(reserva: ReservaCreate) -> dict:
+    """
+    Valores de la fila a insertar (sin id_reserva).
+    """
+    return {
+        "nombre_destino": reserva.nombre_destino,
+        "fecha_inicio": reserva.fecha_inicio,
+        "fecha_fin": reserva.fecha_fin,
+        "monto_reserva": reserva.monto_reserva,
+        "cuotas_reserva": reserva.cuotas_reserva,
+        "id_usuario": reserva.id_usuario,
+        "id_plan": reserva.id_plan,
+    }
+
+
+def reserva_created_dict(id_reserva: int, values: dict) -> dict:
+    """
+    La reserva creada, con las mismas columnas que entity_dict(reserva, RESERVA_COLUMNS).
+    """
+    row = dict(values, id_reserva=id_reserva)
+    return {column.key: row[column.key] for column in RESERVA_COLUMNS}
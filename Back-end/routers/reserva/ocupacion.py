@@ -0,0 +1,89 @@
+"""
+Consultas de intervalos sobre reservas: solapamiento con una ventana de fechas
+e histograma de ocupación por día.
+
+Una reserva [fecha_inicio, fecha_fin] (ambos días incluidos) se solapa con la
+ventana [desde, hasta] si fecha_inicio <= hasta y fecha_fin >= desde. Como la
+duración máxima D se obtiene del índice ix_reserva_duracion en O(log n), el
+filtro se acota también por abajo (fecha_inicio >= desde - D) y la búsqueda es
+un rango del índice ix_reserva_fechas en vez de un recorrido de la tabla.
+
+Ambos cálculos suponen fecha_inicio <= fecha_fin: lo garantizan el schema
+(ReservaBase) y el CHECK ck_reserva_fechas de la tabla.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from models.models import Reserva as ReservaModel
+
+# Ventana máxima para el histograma (en días)
+MAX_DIAS_HISTOGRAMA = 366
+
+
+def _to_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def max_duracion(db: Session) -> int:
+    """
+    Duración máxima (en días) de una reserva, leída del índice de duración.
+    """
+    duracion = db.query(
+        func.max(func.julianday(ReservaModel.fecha_fin) - func.julianday(ReservaModel.fecha_inicio))
+    ).scalar()
+    return int(duracion or 0)
+
+
+def overlap_filter(db: Session, desde: date, hasta: date, destino: Optional[str] = None):
+    """
+    Condición WHERE para reservas que se solapan con [desde, hasta].
+    """
+    inicio_minimo = desde - timedelta(days=max_duracion(db))
+    conditions = [
+        ReservaModel.fecha_inicio >= inicio_minimo,
+        ReservaModel.fecha_inicio <= hasta,
+        ReservaModel.fecha_fin >= desde,
+    ]
+    if destino is not None:
+        conditions.insert(0, ReservaModel.nombre_destino == destino)
+    return and_(*conditions)
+
+
+def histograma_ocupacion(
+    db: Session, desde: date, hasta: date, destino: Optional[str] = None
+) -> List[Dict]:
+    """
+    Reservas activas por cada día de [desde, hasta] con un barrido (sweep line).
+
+    La base agrupa los eventos: cuántas reservas empiezan (recortadas a `desde`)
+    y cuántas terminan en cada día; aquí solo se acumulan O(días) diferencias,
+    sin traer las reservas individuales.
+    """
+    where = overlap_filter(db, desde, hasta, destino)
+    dias = (hasta - desde).days + 1
+    diferencias = [0] * (dias + 1)
+
+    inicio_efectivo = func.max(ReservaModel.fecha_inicio, desde)
+    for dia, cantidad in db.query(inicio_efectivo, func.count()).filter(where).group_by(inicio_efectivo):
+        diferencias[(_to_date(dia) - desde).days] += cantidad
+
+    fines = db.query(ReservaModel.fecha_fin, func.count()).filter(
+        where, ReservaModel.fecha_fin < hasta
+    ).group_by(ReservaModel.fecha_fin)
+    for dia, cantidad in fines:
+        # La reserva sigue activa el día de fecha_fin y deja de estarlo al siguiente
+        diferencias[(_to_date(dia) - desde).days + 1] -= cantidad
+
+    resultado = []
+    activas = 0
+    for offset in range(dias):
+        activas += diferencias[offset]
+        resultado.append({
+            "fecha": (desde + timedelta(days=offset)).isoformat(),
+            "reservas_activas": activas,
+        })
+    return resultado
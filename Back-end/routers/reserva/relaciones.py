@@ -0,0 +1,56 @@
+"""
+Expansión de las relaciones de una reserva (usuario y plan).
+
+`?expand=user,plan` agrega las entidades relacionadas a la respuesta. Se cargan
+con joinedload (LEFT OUTER JOIN en la misma consulta), nunca con una consulta
+adicional por reserva.
+"""
+
+from typing import List, Optional, Set
+
+from fastapi import HTTPException
+from sqlalchemy.orm import joinedload
+
+from models.models import Reserva as ReservaModel, PLAN_COLUMNS, RESERVA_COLUMNS, USER_COLUMNS
+from utils import entity_dict
+
+# Valor de ?expand -> (relación del modelo, columnas públicas de la entidad relacionada)
+EXPAND_RELATIONS = {
+    "user": (ReservaModel.usuario, USER_COLUMNS),
+    "plan": (ReservaModel.plan, PLAN_COLUMNS),
+}
+
+
+def parse_expand(expand: Optional[str]) -> Set[str]:
+    """
+    Valida el parámetro expand ("user,plan"). Retorna: el conjunto de relaciones pedidas
+    """
+    if not expand:
+        return set()
+    names = {name.strip() for name in expand.split(",") if name.strip()}
+    unknown = names - set(EXPAND_RELATIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"expand no válido: {', '.join(sorted(unknown))}. Opciones: {', '.join(EXPAND_RELATIONS)}"
+        )
+    return names
+
+
+def expand_options(names: Set[str]) -> List:
+    """
+    Opciones de carga (joinedload) para las relaciones pedidas.
+    """
+    return [joinedload(EXPAND_RELATIONS[name][0]) for name in sorted(names)]
+
+
+def reserva_dict(reserva: ReservaModel, names: Set[str]) -> dict:
+    """
+    Convierte una reserva en dict y agrega las relaciones pedidas (null si no tiene).
+    """
+    result = entity_dict(reserva, RESERVA_COLUMNS)
+    for name in sorted(names):
+        relationship, columns = EXPAND_RELATIONS[name]
+        related = getattr(reserva, relationship.key)
+        result[name] = entity_dict(related, columns) if related is not None else None
+    return result
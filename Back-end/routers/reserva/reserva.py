@@ -2,11 +2,44 @@
 Router para la entidad Reserva (Resevas)
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from database.database import get_db
-from models.models import Reserva as ReservaModel
-from schemas import Reserva, ReservaCreate
+from models.models import Reserva as ReservaModel, RESERVA_COLUMNS
+from schemas import Reserva, ReservaCreate, ReservaBulkItem
+from routers.changes.feed import change_feed, publish_bulk
+from utils import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    MAX_BULK_ITEMS,
+    paginate,
+    parse_fields,
+    parse_sort,
+    bulk_insert,
+    bulk_summary,
+    export_response,
+    MIN_QUERY_LENGTH,
+    DEFAULT_SEARCH_LIMIT,
+    fts_search,
+    FastJSONResponse,
+    rows_to_dicts,
+    entity_dict,
+    versioned,
+    raise_if_busy
+)
+from .relaciones import parse_expand, expand_options, reserva_dict
+from .filtros import reserva_filters
+from .ocupacion import MAX_DIAS_HISTOGRAMA, overlap_filter, histograma_ocupacion
+from .group_commit import (
+    RESERVA_GROUP_COMMIT,
+    GROUP_COMMIT_TIMEOUT,
+    reserva_committer,
+    reserva_values,
+    reserva_created_dict
+)
 
 # ==================== CONFIGURACIÓN DEL ROUTER ====================
 router = APIRouter(prefix="/reservas", tags=["Reservas"])
@@ -15,47 +48,103 @@ router = APIRouter(prefix="/reservas", tags=["Reservas"])
 # ==================== ENDPOINTS CRUD ====================
 
 @router.get("/")
-def list_reservas(db: Session = Depends(get_db)):
+@versioned("reservas")
+def list_reservas(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    nombre_destino: Optional[str] = None,
+    monto_min: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db)
+):
     """
-    Obtiene todas las entidades.
-    Retorna: {"reservas": [lista de reservas]}
+    Obtiene una página de entidades (paginación por cursor sobre id_reserva).
+    - fields: columnas a devolver ("nombre_destino,monto_reserva"); el id siempre va
+    - sort: columna de orden, con - para descendente ("-monto_reserva")
+    - nombre_destino (igualdad) y monto_min (monto_reserva >= monto_min): filtros
+    Retorna: {"reservas": [lista de reservas], "next_cursor": cursor o null, "limit": limit}
     """
+    sort_column, descending = parse_sort(sort, RESERVA_COLUMNS, ReservaModel.id_reserva)
+    columns = parse_fields(fields, RESERVA_COLUMNS, ReservaModel.id_reserva, sort_column)
+
     try:
-        reservas = db.query(ReservaModel).all()
+        # Se seleccionan solo las columnas pedidas (tuplas, sin construir entidades ORM)
+        query = db.query(*columns).filter(*reserva_filters(nombre_destino, monto_min))
+        reservas, next_cursor = paginate(query, ReservaModel.id_reserva, cursor, limit, sort_column, descending)
+        reservas_dict = rows_to_dicts(reservas)
         
-        # Transformar cada entidad: convertir objetos SQLAlchemy a dict y transformar IDs
-        reservas_dict = []
-        for reserva in reservas:
-            reserva_dict = {
-                'id_reserva': reserva.id_reserva,
-                'nombre_destino': reserva.nombre_reserva,
-                'fecha_inicio': reserva.fecha_inicio,
-                'fecha_fin': reserva.fecha_fin,
-                'monto_reserva': reserva.monto_reserva,
-                'cuotas_reserva': reserva.cuotas_reserva,
-            }
-            reservas_dict.append(reserva_dict)
-        
-        return {"reservas": reservas_dict}
+        return FastJSONResponse({"reservas": reservas_dict, "next_cursor": next_cursor, "limit": limit})
+    except HTTPException:
+        raise
     except Exception as e:
+        raise_if_busy(e)
         raise HTTPException(status_code=500, detail=f"Error al obtener las reservas: {str(e)}")
 
 
+@router.get("/export")
+@versioned("reservas")
+def export_reservas(format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """
+    Exporta todas las entidades en streaming (NDJSON o CSV).
+    Las filas se leen en lotes, la memoria no crece con el tamaño de la tabla.
+    """
+    return export_response(RESERVA_COLUMNS, format, "reservas")
+
+
+@router.get("/search")
+@versioned("reservas")
+def search_reservas(
+    q: str = Query(..., min_length=MIN_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Busca por nombre de destino (texto completo y prefijos, FTS5).
+    Retorna: {"reservas": [resultados por relevancia], "next_cursor": cursor o null, "limit": limit}
+    """
+    try:
+        reservas, next_cursor = fts_search(db, RESERVA_COLUMNS, ReservaModel.id_reserva, "reserva_fts", q, cursor, limit)
+
+        reservas_dict = rows_to_dicts(reservas)
+
+        return FastJSONResponse({"reservas": reservas_dict, "next_cursor": next_cursor, "limit": limit})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al buscar las reservas: {str(e)}")
+
+
 @router.post("/")
 def create_reserva(reserva: ReservaCreate, db: Session = Depends(get_db)):
     """
     Crea una nueva entidad.
+    Con RESERVA_GROUP_COMMIT=1 la inserción se confirma junto con las demás
+    peticiones concurrentes (un solo commit por lote).
     Retorna: {"mensaje": "mensaje de éxito", "reserva": reserva creada}
     """
     try:
+        if RESERVA_GROUP_COMMIT:
+            values = reserva_values(reserva)
+            id_reserva = reserva_committer.wait(reserva_committer.submit(values), GROUP_COMMIT_TIMEOUT)
+            reserva_dict = reserva_created_dict(id_reserva, values)
+            change_feed.publish("reservas", "insert", id_reserva, reserva_dict)
+            return FastJSONResponse({
+                "mensaje": "Reserva creada correctamente",
+                "reserva": reserva_dict
+            })
+
         # Crear instancia del modelo con los datos del schema
         db_reserva = ReservaModel(
-            id_reserva= reserva.id_reserva,
-            nombre_destino = reserva.nombre_reserva,
+            nombre_destino = reserva.nombre_destino,
             fecha_inicio = reserva.fecha_inicio,
             fecha_fin = reserva.fecha_fin,
             monto_reserva = reserva.monto_reserva,
             cuotas_reserva = reserva.cuotas_reserva,
+            id_usuario = reserva.id_usuario,
+            id_plan = reserva.id_plan,
         )
         
         db.add(db_reserva)
@@ -63,24 +152,50 @@ def create_reserva(reserva: ReservaCreate, db: Session = Depends(get_db)):
         db.refresh(db_reserva)
         
         # Transformar la respuesta
-        reserva_dict = {
-            'id_reserva': db_reserva.id_reserva,
-            'nombre_destino': db_reserva.nombre_destino,
-            'fecha_inicio': db_reserva.fecha_inicio,
-            'fecha_fin': db_reserva.fecha_fin,
-            'monto_reserva': db_reserva.monto_reserva,
-            'cuotas_reserva': db_reserva.cuotas_reserva,
-        }
+        reserva_dict = entity_dict(db_reserva, RESERVA_COLUMNS)
+        change_feed.publish("reservas", "insert", reserva_dict["id_reserva"], reserva_dict)
         
-        return {
+        return FastJSONResponse({
             "mensaje": "Reserva creada correctamente",
             "reserva": reserva_dict
-        }
+        })
+    except FutureTimeoutError:
+        # La fila se canceló antes de entrar a un lote: no se insertó
+        raise HTTPException(status_code=503, detail="Tiempo de espera agotado al confirmar la reserva")
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al crear la reserva: {str(e)}")
 
 
+@router.post("/bulk")
+def bulk_create_reservas(
+    reservas: List[ReservaBulkItem],
+    upsert: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Crea (o actualiza con upsert=true, por id_reserva) varias entidades a la vez.
+    Inserta con executemany en transacciones por bloques.
+    Retorna: {"mensaje", "total", "exitosos", "fallidos", "resultados": [resultado por elemento]}
+    """
+    if len(reservas) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Se permiten máximo {MAX_BULK_ITEMS} elementos por solicitud"
+        )
+
+    try:
+        items = [reserva.model_dump() for reserva in reservas]
+        results = bulk_insert(db, ReservaModel, ReservaModel.id_reserva, items, upsert=upsert)
+        publish_bulk(db, "reservas", RESERVA_COLUMNS, ReservaModel.id_reserva, results, upsert)
+        return bulk_summary("reservas", results)
+    except Exception as e:
+        db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error en la carga masiva de reservas: {str(e)}")
+
+
 @router.put("/{reserva_id}")
 def update_reserva(
     reserva_id: int,
@@ -103,29 +218,26 @@ def update_reserva(
         reserva.fecha_fin = reserva_update.fecha_fin
         reserva.monto_reserva = reserva_update.monto_reserva
         reserva.cuotas_reserva = reserva_update.cuotas_reserva
+        reserva.id_usuario = reserva_update.id_usuario
+        reserva.id_plan = reserva_update.id_plan
 
         
         db.commit()
         db.refresh(reserva)
         
         # Transformar la respuesta
-        reserva_dict = {
-            'id_reserva': db_reserva.id_reserva,
-            'nombre_destino': db_reserva.nombre_destino,
-            'fecha_inicio': db_reserva.fecha_inicio,
-            'fecha_fin': db_reserva.fecha_fin,
-            'monto_reserva': db_reserva.monto_reserva,
-            'cuotas_reserva': db_reserva.cuotas_reserva,
-        }
+        reserva_dict = entity_dict(reserva, RESERVA_COLUMNS)
+        change_feed.publish("reservas", "update", reserva_id, reserva_dict)
         
-        return {
+        return FastJSONResponse({
             "mensaje": "Reserva actualizado",
-            "product": reserva_dict
-        }
+            "reserva": reserva_dict
+        })
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al actualizar la reserva: {str(e)}")
 
 
@@ -133,7 +245,7 @@ def update_reserva(
 def delete_reserva(reserva_id: int, db: Session = Depends(get_db)):
     """
     Elimina una entidad.
-    Valida Foreign Keys antes de eliminar.
+    Ninguna tabla referencia a reserva, así que no hay Foreign Keys que validar.
     Retorna: {"mensaje": "mensaje de éxito"}
     """
     try:
@@ -142,25 +254,118 @@ def delete_reserva(reserva_id: int, db: Session = Depends(get_db)):
         if not reserva:
             raise HTTPException(status_code=404, detail="Reserva no encontrada")
         
-        # ==================== VALIDACIÓN DE FOREIGN KEYS ====================
-        # Verificar si hay usuarios relacionados con este producto
-        from models.models import User as UserModel
-        usuarios_relacionados = db.query(UserModel).filter(
-            UserModel.id_reserva == reserva_id
-        ).first()
-        
-        if usuarios_relacionados:
-            raise HTTPException(
-                status_code=400,
-                detail="No se puede eliminar esta reserva porque tiene usuarios relacionados."
-            )
-        
         db.delete(reserva)
         db.commit()
+        change_feed.publish("reservas", "delete", reserva_id)
         
         return {"mensaje": "Reserva eliminada"}
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al eliminar la reserva: {str(e)}")
+
+
+# ==================== CONSULTAS DE DISPONIBILIDAD ====================
+
+def _validar_ventana(desde: date, hasta: date):
+    if desde > hasta:
+        raise HTTPException(status_code=400, detail="'desde' debe ser anterior o igual a 'hasta'")
+
+
+@router.get("/solapadas")
+@versioned("reservas")
+def list_reservas_solapadas(
+    desde: date,
+    hasta: date,
+    destino: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene las reservas (opcionalmente de un destino) que se solapan con [desde, hasta].
+    Retorna: {"reservas": [lista de reservas], "next_cursor": cursor o null, "limit": limit}
+    """
+    _validar_ventana(desde, hasta)
+    try:
+        query = db.query(*RESERVA_COLUMNS).filter(overlap_filter(db, desde, hasta, destino))
+        reservas, next_cursor = paginate(query, ReservaModel.id_reserva, cursor, limit)
+
+        reservas_dict = rows_to_dicts(reservas)
+
+        return FastJSONResponse({"reservas": reservas_dict, "next_cursor": next_cursor, "limit": limit})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener las reservas: {str(e)}")
+
+
+@router.get("/ocupacion")
+@versioned("reservas")
+def get_ocupacion(
+    desde: date,
+    hasta: date,
+    destino: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Histograma de ocupación: cantidad de reservas activas en cada día de [desde, hasta].
+    Retorna: {"desde", "hasta", "destino", "dias": [{"fecha", "reservas_activas"}], "maximo"}
+    """
+    _validar_ventana(desde, hasta)
+    if (hasta - desde).days + 1 > MAX_DIAS_HISTOGRAMA:
+        raise HTTPException(
+            status_code=400,
+            detail=f"La ventana no puede superar {MAX_DIAS_HISTOGRAMA} días"
+        )
+
+    try:
+        dias = histograma_ocupacion(db, desde, hasta, destino)
+        return {
+            "desde": desde,
+            "hasta": hasta,
+            "destino": destino,
+            "dias": dias,
+            "maximo": max(dia["reservas_activas"] for dia in dias),
+        }
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al calcular la ocupación: {str(e)}")
+
+
+# ==================== DETALLE CON RELACIONES ====================
+# Va al final: /{reserva_id} no debe capturar /solapadas ni /ocupacion
+
+@router.get("/{reserva_id}")
+@versioned(row=("reservas", "reserva_id"), expand={"user": "users", "plan": "plan"})
+def get_reserva(
+    reserva_id: int,
+    expand: Optional[str] = Query(None, description="Relaciones a incluir: user, plan"),
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene una entidad por su ID; con expand=user,plan incluye el usuario y el plan
+    cargados en la misma consulta.
+    Retorna: la entidad encontrada (con "user" / "plan" si se pidieron) o 404 si no existe
+    """
+    names = parse_expand(expand)
+    try:
+        reserva = (
+            db.query(ReservaModel)
+            .options(*expand_options(names))
+            .filter(ReservaModel.id_reserva == reserva_id)
+            .first()
+        )
+
+        if not reserva:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+
+        return FastJSONResponse(reserva_dict(reserva, names))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener la reserva: {str(e)}")
@@ -0,0 +1,178 @@
+"""
+Router asíncrono para la entidad Reserva (Reservas)
+Mismos endpoints CRUD que reserva.py pero con AsyncSession (API_MODE=async)
+"""
+
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_database import get_async_db
+from models.models import Reserva as ReservaModel, RESERVA_COLUMNS
+from schemas import ReservaCreate
+from routers.changes.feed import change_feed
+from utils import DEFAULT_LIMIT, MAX_LIMIT, paginate_async, parse_fields, parse_sort, FastJSONResponse, rows_to_dicts, entity_dict, versioned, raise_if_busy
+from .filtros import reserva_filters
+from .group_commit import (
+    RESERVA_GROUP_COMMIT,
+    GROUP_COMMIT_TIMEOUT,
+    reserva_committer,
+    reserva_values,
+    reserva_created_dict
+)
+
+# ==================== CONFIGURACIÓN DEL ROUTER ====================
+router = APIRouter(prefix="/reservas", tags=["Reservas"])
+
+
+# ==================== ENDPOINTS CRUD ====================
+
+@router.get("/")
+@versioned("reservas")
+async def list_reservas_async(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    nombre_destino: Optional[str] = None,
+    monto_min: Optional[int] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtiene una página de entidades (paginación por cursor sobre id_reserva).
+    - fields: columnas a devolver; sort: columna de orden (con - para descendente)
+    - nombre_destino (igualdad) y monto_min (monto_reserva >= monto_min): filtros
+    Retorna: {"reservas": [lista de reservas], "next_cursor": cursor o null, "limit": limit}
+    """
+    sort_column, descending = parse_sort(sort, RESERVA_COLUMNS, ReservaModel.id_reserva)
+    columns = parse_fields(fields, RESERVA_COLUMNS, ReservaModel.id_reserva, sort_column)
+
+    try:
+        stmt = select(*columns).where(*reserva_filters(nombre_destino, monto_min))
+        reservas, next_cursor = await paginate_async(
+            db, stmt, ReservaModel.id_reserva, cursor, limit, sort_column, descending
+        )
+        reservas_dict = rows_to_dicts(reservas)
+        return FastJSONResponse({"reservas": reservas_dict, "next_cursor": next_cursor, "limit": limit})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener las reservas: {str(e)}")
+
+
+@router.post("/")
+async def create_reserva_async(reserva: ReservaCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Crea una nueva entidad.
+    Con RESERVA_GROUP_COMMIT=1 la inserción se confirma junto con las demás
+    peticiones concurrentes (un solo commit por lote).
+    Retorna: {"mensaje": "mensaje de éxito", "reserva": reserva creada}
+    """
+    try:
+        if RESERVA_GROUP_COMMIT:
+            values = reserva_values(reserva)
+            id_reserva = await reserva_committer.wait_async(reserva_committer.submit(values), GROUP_COMMIT_TIMEOUT)
+            reserva_dict = reserva_created_dict(id_reserva, values)
+            change_feed.publish("reservas", "insert", id_reserva, reserva_dict)
+            return FastJSONResponse({
+                "mensaje": "Reserva creada correctamente",
+                "reserva": reserva_dict
+            })
+
+        db_reserva = ReservaModel(
+            nombre_destino=reserva.nombre_destino,
+            fecha_inicio=reserva.fecha_inicio,
+            fecha_fin=reserva.fecha_fin,
+            monto_reserva=reserva.monto_reserva,
+            cuotas_reserva=reserva.cuotas_reserva,
+            id_usuario=reserva.id_usuario,
+            id_plan=reserva.id_plan,
+        )
+
+        db.add(db_reserva)
+        await db.commit()
+        await db.refresh(db_reserva)
+
+        reserva_dict = entity_dict(db_reserva, RESERVA_COLUMNS)
+        change_feed.publish("reservas", "insert", reserva_dict["id_reserva"], reserva_dict)
+
+        return FastJSONResponse({
+            "mensaje": "Reserva creada correctamente",
+            "reserva": reserva_dict
+        })
+    except asyncio.TimeoutError:
+        # La fila se canceló antes de entrar a un lote: no se insertó
+        raise HTTPException(status_code=503, detail="Tiempo de espera agotado al confirmar la reserva")
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al crear la reserva: {str(e)}")
+
+
+@router.put("/{reserva_id}")
+async def update_reserva_async(
+    reserva_id: int,
+    reserva_update: ReservaCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualiza una entidad existente.
+    Retorna: {"mensaje": "mensaje de éxito", "reserva": reserva actualizada}
+    """
+    try:
+        reserva = await db.get(ReservaModel, reserva_id)
+
+        if not reserva:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+
+        reserva.nombre_destino = reserva_update.nombre_destino
+        reserva.fecha_inicio = reserva_update.fecha_inicio
+        reserva.fecha_fin = reserva_update.fecha_fin
+        reserva.monto_reserva = reserva_update.monto_reserva
+        reserva.cuotas_reserva = reserva_update.cuotas_reserva
+        reserva.id_usuario = reserva_update.id_usuario
+        reserva.id_plan = reserva_update.id_plan
+
+        await db.commit()
+        await db.refresh(reserva)
+
+        reserva_dict = entity_dict(reserva, RESERVA_COLUMNS)
+        change_feed.publish("reservas", "update", reserva_id, reserva_dict)
+
+        return FastJSONResponse({
+            "mensaje": "Reserva actualizado",
+            "reserva": reserva_dict
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al actualizar la reserva: {str(e)}")
+
+
+@router.delete("/{reserva_id}")
+async def delete_reserva_async(reserva_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Elimina una entidad.
+    Retorna: {"mensaje": "mensaje de éxito"}
+    """
+    try:
+        reserva = await db.get(ReservaModel, reserva_id)
+
+        if not reserva:
+            raise HTTPException(status_code=404, detail="Reserva no encontrada")
+
+        await db.delete(reserva)
+        await db.commit()
+        change_feed.publish("reservas", "delete", reserva_id)
+
+        return {"mensaje": "Reserva eliminada"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al eliminar la reserva: {str(e)}")
@@ -3,11 +3,34 @@ Router para la entidad Users (Usuarios)
 Ejemplo de implementación usando la plantilla TEMPLATE_ROUTER.py
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 from database.database import get_db
-from models.models import User as UserModel
-from schemas import User, UserCreate
+from models.models import User as UserModel, Reserva as ReservaModel, USER_COLUMNS
+from routers.reserva.relaciones import parse_expand, expand_options, reserva_dict
+from routers.changes.feed import change_feed, publish_bulk
+from schemas import User, UserCreate, UserBulkItem
+from utils import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    MAX_BULK_ITEMS,
+    paginate,
+    parse_fields,
+    parse_sort,
+    bulk_insert,
+    bulk_summary,
+    export_response,
+    MIN_QUERY_LENGTH,
+    DEFAULT_SEARCH_LIMIT,
+    fts_search,
+    FastJSONResponse,
+    rows_to_dicts,
+    entity_dict,
+    versioned,
+    raise_if_busy
+)
 
 # ==================== CONFIGURACIÓN DEL ROUTER ====================
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -16,32 +39,72 @@ router = APIRouter(prefix="/users", tags=["Users"])
 # ==================== ENDPOINTS CRUD ====================
 
 @router.get("/")
-def list_users(db: Session = Depends(get_db)):
+@versioned("users")
+def list_users(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
     """
-    Obtiene todas las entidades.
-    Retorna: {"usuarios": [lista de usuarios]}
+    Obtiene una página de entidades (paginación por cursor sobre id_usuario).
+    - fields: columnas a devolver ("nombre_usuario,correo_usuario"); el id siempre va
+    - sort: columna de orden, con - para descendente ("-nombre_usuario")
+    Retorna: {"usuarios": [lista de usuarios], "next_cursor": cursor o null, "limit": limit}
     """
+    sort_column, descending = parse_sort(sort, USER_COLUMNS, UserModel.id_usuario)
+    columns = parse_fields(fields, USER_COLUMNS, UserModel.id_usuario, sort_column)
+
     try:
-        users = db.query(UserModel).all()
-        
-        # Transformar cada entidad: convertir objetos SQLAlchemy a dict y transformar IDs
-        users_dict = []
-        for user in users:
-            user_dict = {
-                'id_usuario': user.id_usuario,
-                'nombre_usuario': user.nombre_usuario,
-                'correo_usuario': user.correo_usuario,
-                'telefono_usuario': user.telefono_usuario,
-                'fecha_creacion': user.fecha_creacion,
-                'fecha_actualizacion': user.fecha_actualizacion,
-            }
-            users_dict.append(user_dict)
-        
-        return {"usuarios": users_dict}
+        # Se seleccionan solo las columnas pedidas (tuplas, sin construir entidades ORM)
+        users, next_cursor = paginate(
+            db.query(*columns), UserModel.id_usuario, cursor, limit, sort_column, descending
+        )
+        users_dict = rows_to_dicts(users)
+        
+        return FastJSONResponse({"usuarios": users_dict, "next_cursor": next_cursor, "limit": limit})
+    except HTTPException:
+        raise
     except Exception as e:
+        raise_if_busy(e)
         raise HTTPException(status_code=500, detail=f"Error al obtener los usuarios: {str(e)}")
 
 
+@router.get("/export")
+@versioned("users")
+def export_users(format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """
+    Exporta todas las entidades en streaming (NDJSON o CSV).
+    Las filas se leen en lotes, la memoria no crece con el tamaño de la tabla.
+    """
+    return export_response(USER_COLUMNS, format, "usuarios")
+
+
+@router.get("/search")
+@versioned("users")
+def search_users(
+    q: str = Query(..., min_length=MIN_QUERY_LENGTH),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Busca por nombre, correo o teléfono (texto completo y prefijos, FTS5).
+    Retorna: {"usuarios": [resultados por relevancia], "next_cursor": cursor o null, "limit": limit}
+    """
+    try:
+        users, next_cursor = fts_search(db, USER_COLUMNS, UserModel.id_usuario, "users_fts", q, cursor, limit)
+        users_dict = rows_to_dicts(users)
+
+        return FastJSONResponse({"usuarios": users_dict, "next_cursor": next_cursor, "limit": limit})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al buscar los usuarios: {str(e)}")
+
+
 @router.post("/")
 def create_user(user: UserCreate, db: Session = Depends(get_db)):
     """
@@ -62,53 +125,110 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         db.refresh(db_user)
         
         # Transformar la respuesta
-        user_dict = {
-            'id_usuario': db_user.id_usuario,
-            'nombre_usuario': db_user.nombre_usuario,
-            'correo_usuario': db_user.correo_usuario,
-            'telefono_usuario': db_user.telefono_usuario,
-            'fecha_creacion': db_user.fecha_creacion,
-            'fecha_actualizacion': db_user.fecha_actualizacion,
-        }
-        
-        return {
+        user_dict = entity_dict(db_user, USER_COLUMNS)
+        change_feed.publish("users", "insert", user_dict["id_usuario"], user_dict)
+        
+        return FastJSONResponse({
             "mensaje": "Usuario creado correctamente",
             "user": user_dict
-        }
+        })
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al crear el usuario: {str(e)}")
 
 
+@router.post("/bulk")
+def bulk_create_users(
+    users: List[UserBulkItem],
+    upsert: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Crea (o actualiza con upsert=true, por id_usuario) varias entidades a la vez.
+    Inserta con executemany en transacciones por bloques.
+    Retorna: {"mensaje", "total", "exitosos", "fallidos", "resultados": [resultado por elemento]}
+    """
+    if len(users) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Se permiten máximo {MAX_BULK_ITEMS} elementos por solicitud"
+        )
+
+    try:
+        items = [user.model_dump() for user in users]
+        results = bulk_insert(db, UserModel, UserModel.id_usuario, items, upsert=upsert)
+        publish_bulk(db, "users", USER_COLUMNS, UserModel.id_usuario, results, upsert)
+        return bulk_summary("usuarios", results)
+    except Exception as e:
+        db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error en la carga masiva de usuarios: {str(e)}")
+
+
 @router.get("/{user_id}")
+@versioned(row=("users", "user_id"))
 def get_user(user_id: int, db: Session = Depends(get_db)):
     """
     Obtiene una entidad por su ID.
     Retorna: la entidad encontrada o 404 si no existe
     """
     try:
-        user = db.query(UserModel).filter(UserModel.id_usuario == user_id).first()
+        user = db.query(*USER_COLUMNS).filter(UserModel.id_usuario == user_id).first()
         
         if not user:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
-        # Transformar la respuesta
-        user_dict = {
-            'id_usuario': user.id_usuario,
-            'nombre_usuario': user.nombre_usuario,
-            'correo_usuario': user.correo_usuario,
-            'telefono_usuario': user.telefono_usuario,
-            'fecha_creacion': user.fecha_creacion,
-            'fecha_actualizacion': user.fecha_actualizacion,
-        }
-        
-        return user_dict
+        return FastJSONResponse(user._asdict())
     except HTTPException:
         raise
     except Exception as e:
+        raise_if_busy(e)
         raise HTTPException(status_code=500, detail=f"Error al obtener el usuario: {str(e)}")
 
 
+@router.get("/{user_id}/reservas")
+@versioned("users", "reservas", "plan")
+def list_user_reservas(
+    user_id: int,
+    expand: Optional[str] = Query("plan", description="Relaciones a incluir en cada reserva: user, plan"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene las reservas de un usuario (paginación por cursor sobre id_reserva).
+    Las relaciones pedidas (por defecto el plan) se cargan en la misma consulta, sin N+1.
+    Retorna: {"usuario": usuario, "reservas": [lista de reservas], "next_cursor": cursor o null, "limit": limit}
+    """
+    names = parse_expand(expand)
+    try:
+        user = db.query(*USER_COLUMNS).filter(UserModel.id_usuario == user_id).first()
+        
+        if not user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+        
+        query = (
+            db.query(ReservaModel)
+            .options(*expand_options(names))
+            .filter(ReservaModel.id_usuario == user_id)
+        )
+        reservas, next_cursor = paginate(query, ReservaModel.id_reserva, cursor, limit)
+        reservas_dict = [reserva_dict(reserva, names) for reserva in reservas]
+        
+        return FastJSONResponse({
+            "usuario": user._asdict(),
+            "reservas": reservas_dict,
+            "next_cursor": next_cursor,
+            "limit": limit
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener las reservas del usuario: {str(e)}")
+
+
 @router.put("/{user_id}")
 def update_user(
     user_id: int,
@@ -134,23 +254,18 @@ def update_user(
         db.refresh(user)
         
         # Transformar la respuesta
-        user_dict = {
-            'id_usuario': user.id_usuario,
-            'nombre_usuario': user.nombre_usuario,
-            'correo_usuario': user.correo_usuario,
-            'telefono_usuario': user.telefono_usuario,
-            'fecha_creacion': user.fecha_creacion,
-            'fecha_actualizacion': user.fecha_actualizacion,
-        }
-        
-        return {
+        user_dict = entity_dict(user, USER_COLUMNS)
+        change_feed.publish("users", "update", user_id, user_dict)
+        
+        return FastJSONResponse({
             "mensaje": "Usuario actualizado",
             "user": user_dict
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al actualizar el usuario: {str(e)}")
 
 
@@ -168,25 +283,26 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
         # ==================== VALIDACIÓN DE FOREIGN KEYS ====================
-        # En este ejemplo, User no tiene relaciones, pero si las tuviera:
-        # 
-        # registros_relacionados = db.query(EntidadRelacionadaModel).filter(
-        #     EntidadRelacionadaModel.id_usuario == user_id
-        # ).first()
-        # 
-        # if registros_relacionados:
-        #     raise HTTPException(
-        #         status_code=400,
-        #         detail="No se puede eliminar este usuario porque tiene registros relacionados."
-        #     )
+        # EXISTS sobre el índice ix_reserva_id_usuario: se detiene en la primera reserva
+        reservas_relacionadas = db.query(
+            exists().where(ReservaModel.id_usuario == user_id)
+        ).scalar()
+        
+        if reservas_relacionadas:
+            raise HTTPException(
+                status_code=400,
+                detail="No se puede eliminar este usuario porque tiene reservas relacionadas."
+            )
         
         db.delete(user)
         db.commit()
+        change_feed.publish("users", "delete", user_id)
         
         return {"mensaje": "Usuario eliminado"}
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
+        raise_if_busy(e)
         raise HTTPException(status_code=400, detail=f"Error al eliminar el usuario: {str(e)}")
 
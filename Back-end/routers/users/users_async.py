@@ -0,0 +1,173 @@
+"""
+Router asíncrono para la entidad Users (Usuarios)
+Mismos endpoints CRUD que users.py pero con AsyncSession (API_MODE=async)
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.async_database import get_async_db
+from models.models import User as UserModel, Reserva as ReservaModel, USER_COLUMNS
+from schemas import UserCreate
+from routers.changes.feed import change_feed
+from utils import DEFAULT_LIMIT, MAX_LIMIT, paginate_async, parse_fields, parse_sort, FastJSONResponse, rows_to_dicts, entity_dict, versioned, raise_if_busy
+
+# ==================== CONFIGURACIÓN DEL ROUTER ====================
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+# ==================== ENDPOINTS CRUD ====================
+
+@router.get("/")
+@versioned("users")
+async def list_users_async(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtiene una página de entidades (paginación por cursor sobre id_usuario).
+    - fields: columnas a devolver; sort: columna de orden (con - para descendente)
+    Retorna: {"usuarios": [lista de usuarios], "next_cursor": cursor o null, "limit": limit}
+    """
+    sort_column, descending = parse_sort(sort, USER_COLUMNS, UserModel.id_usuario)
+    columns = parse_fields(fields, USER_COLUMNS, UserModel.id_usuario, sort_column)
+
+    try:
+        users, next_cursor = await paginate_async(
+            db, select(*columns), UserModel.id_usuario, cursor, limit, sort_column, descending
+        )
+        users_dict = rows_to_dicts(users)
+        return FastJSONResponse({"usuarios": users_dict, "next_cursor": next_cursor, "limit": limit})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener los usuarios: {str(e)}")
+
+
+@router.post("/")
+async def create_user_async(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Crea una nueva entidad.
+    Retorna: {"mensaje": "mensaje de éxito", "user": usuario creado}
+    """
+    try:
+        db_user = UserModel(
+            nombre_usuario=user.nombre_usuario,
+            correo_usuario=user.correo_usuario,
+            telefono_usuario=user.telefono_usuario,
+        )
+
+        db.add(db_user)
+        await db.commit()
+        await db.refresh(db_user)
+
+        user_dict = entity_dict(db_user, USER_COLUMNS)
+        change_feed.publish("users", "insert", user_dict["id_usuario"], user_dict)
+
+        return FastJSONResponse({
+            "mensaje": "Usuario creado correctamente",
+            "user": user_dict
+        })
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al crear el usuario: {str(e)}")
+
+
+@router.get("/{user_id}")
+@versioned(row=("users", "user_id"))
+async def get_user_async(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Obtiene una entidad por su ID.
+    Retorna: la entidad encontrada o 404 si no existe
+    """
+    try:
+        user = await db.get(UserModel, user_id)
+
+        if not user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+
+        return FastJSONResponse(entity_dict(user, USER_COLUMNS))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise_if_busy(e)
+        raise HTTPException(status_code=500, detail=f"Error al obtener el usuario: {str(e)}")
+
+
+@router.put("/{user_id}")
+async def update_user_async(
+    user_id: int,
+    user_update: UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Actualiza una entidad existente.
+    Retorna: {"mensaje": "mensaje de éxito", "user": usuario actualizado}
+    """
+    try:
+        user = await db.get(UserModel, user_id)
+
+        if not user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+
+        user.nombre_usuario = user_update.nombre_usuario
+        user.correo_usuario = user_update.correo_usuario
+        user.telefono_usuario = user_update.telefono_usuario
+
+        await db.commit()
+        await db.refresh(user)
+
+        user_dict = entity_dict(user, USER_COLUMNS)
+        change_feed.publish("users", "update", user_id, user_dict)
+
+        return FastJSONResponse({
+            "mensaje": "Usuario actualizado",
+            "user": user_dict
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al actualizar el usuario: {str(e)}")
+
+
+@router.delete("/{user_id}")
+async def delete_user_async(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Elimina una entidad.
+    Retorna: {"mensaje": "mensaje de éxito"}
+    """
+    try:
+        user = await db.get(UserModel, user_id)
+
+        if not user:
+            raise HTTPException(status_code=404, detail="Usuario no encontrado")
+
+        # Validación de Foreign Keys: EXISTS sobre el índice ix_reserva_id_usuario
+        reservas_relacionadas = await db.scalar(
+            select(exists().where(ReservaModel.id_usuario == user_id))
+        )
+        if reservas_relacionadas:
+            raise HTTPException(
+                status_code=400,
+                detail="No se puede eliminar este usuario porque tiene reservas relacionadas."
+            )
+
+        await db.delete(user)
+        await db.commit()
+        change_feed.publish("users", "delete", user_id)
+
+        return {"mensaje": "Usuario eliminado"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise_if_busy(e)
+        raise HTTPException(status_code=400, detail=f"Error al eliminar el usuario: {str(e)}")
@@ -3,16 +3,22 @@ from schemas.schemas import (
     User,
     UserCreate,
     UserBase,
+    UserBulkItem,
 
     # Reservas
     Reserva,
     ReservaBase,
     ReservaCreate,
+    ReservaBulkItem,
 
     # Viajes
     Plan,
     PlanBase,
-    PlanCreate
+    PlanCreate,
+    PlanBulkItem,
+
+    # Cotizaciones
+    QuoteBatchRequest
 )
 
 __all__ = [
@@ -20,14 +26,20 @@ __all__ = [
     "User",
     "UserCreate",
     "UserBase",
+    "UserBulkItem",
 
     # Reservas
     "Reserva",
     "ReservaBase",
     "ReservaCreate",
+    "ReservaBulkItem",
 
     # Viajes
     "Plan",
     "PlanBase",
-    "PlanCreate"
+    "PlanCreate",
+    "PlanBulkItem",
+
+    # Cotizaciones
+    "QuoteBatchRequest"
 ]
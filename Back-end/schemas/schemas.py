@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from datetime import date, datetime
+from typing import Annotated, List, Literal, Optional
 
 
 # ==================== USERS SCHEMAS ====================
@@ -13,6 +14,10 @@ class UserCreate(UserBase):
     pass
 
 
+class UserBulkItem(UserCreate):
+    id_usuario: Optional[int] = None
+
+
 class User(UserBase):
     id_usuario: int
     fecha_creacion: datetime
@@ -24,18 +29,31 @@ class User(UserBase):
 # ==================== RESERVA SCHEMAS ====================
 class ReservaBase(BaseModel):
     nombre_destino: str
+    fecha_inicio: date
+    fecha_fin: date
     monto_reserva: int
     cuotas_reserva: int
+    id_usuario: Optional[int] = None
+    id_plan: Optional[int] = None
+
+    @model_validator(mode="after")
+    def validar_fechas(self):
+        # Las consultas de ocupación y solapamiento suponen inicio <= fin (CHECK ck_reserva_fechas)
+        if self.fecha_fin < self.fecha_inicio:
+            raise ValueError("fecha_fin debe ser igual o posterior a fecha_inicio")
+        return self
 
 
 class ReservaCreate(ReservaBase):
     pass
 
 
+class ReservaBulkItem(ReservaCreate):
+    id_reserva: Optional[int] = None
+
+
 class Reserva(ReservaBase):
     id_reserva: int
-    fecha_inicio: datetime
-    fecha_fin: datetime
 
     class Config:
         from_attributes: True
@@ -51,9 +69,30 @@ class PlanCreate(PlanBase):
     pass
 
 
+class PlanBulkItem(PlanCreate):
+    id_plan: Optional[int] = None
+
+
 class Plan(PlanBase):
     id_plan: int
 
     class Config:
         from_attributes: True
 
+# ==================== COTIZACIONES SCHEMAS ====================
+# Topes del cotizador: calcula en int64 (monto * (100 - descuento) no debe desbordar)
+MAX_MONTO_COTIZACION = 10 ** 15
+MAX_CUOTAS_COTIZACION = 600
+MAX_ID_PLAN = 2 ** 63 - 1
+
+MontoCotizacion = Annotated[int, Field(ge=0, le=MAX_MONTO_COTIZACION)]
+CuotasCotizacion = Annotated[int, Field(ge=1, le=MAX_CUOTAS_COTIZACION)]
+PlanCotizacion = Optional[Annotated[int, Field(ge=1, le=MAX_ID_PLAN)]]
+
+
+class QuoteBatchRequest(BaseModel):
+    montos: List[MontoCotizacion] = Field(..., min_length=1)
+    cuotas: List[CuotasCotizacion] = Field(..., min_length=1)
+    id_planes: List[PlanCotizacion] = Field(default_factory=lambda: [None], min_length=1)
+    modo: Literal["producto", "filas"] = "producto"
+    redondeo: int = Field(1, ge=1, le=MAX_MONTO_COTIZACION)
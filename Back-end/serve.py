@@ -0,0 +1,113 @@
+"""
+Lanzador de producción: N procesos worker de uvicorn sobre la misma base SQLite.
+
+`python main.py` es para desarrollo: un proceso con recarga. Un proceso de
+Python atiende las peticiones en un solo núcleo (GIL). Este lanzador levanta
+un worker por núcleo y configura el acceso compartido a la base:
+
+- WAL (perfil "production"): los lectores de todos los workers leen en
+  paralelo y no bloquean al escritor ni entre sí. Con eso las lecturas
+  deberían escalar con los núcleos libres. Todavía no está medido en una
+  máquina de varios núcleos (ver benchmarks/bench_workers.py).
+- Escrituras: SQLite admite un solo escritor a la vez y aquí no hay un
+  proceso escritor único. Solo las altas de reservas (POST /reservas/) pasan
+  por una cola, el group commit de cada worker (un hilo escritor, muchas filas
+  por transacción). Las demás escrituras (users, plan, PUT / DELETE y todos
+  los /bulk) compiten por el lock de la base entre workers: cada una espera
+  hasta busy_timeout y, si la base sigue ocupada, responde 503 + Retry-After.
+  El control de admisión reparte el cupo de escrituras entre los workers para
+  acotar esa espera (las altas del group commit tienen un cupo aparte del
+  tamaño del lote); no la elimina. Con mucha escritura, más workers no dan
+  más throughput de escritura.
+- Migraciones una sola vez, en este proceso y antes de levantar los workers
+  (DB_AUTO_MIGRATE queda apagado en ellos).
+- Estado compartido: el feed de cambios, las versiones de los ETag y la caché
+  de planes salen del registro change_log de la base (CHANGES_SOURCE=db, ver
+  database/change_log.py). Un GET con versión se pone al día antes de
+  responder 304, y los eventos SSE de otro worker llegan en a lo sumo
+  CHANGES_POLL_INTERVAL segundos. Las claves de idempotencia se guardan en un
+  archivo SQLite común (IDEMPOTENCY_DB), así un reintento que cae en otro
+  worker no vuelve a insertar.
+
+Las variables de entorno ya definidas tienen prioridad sobre estos valores.
+
+Uso (desde Back-end/):
+    python serve.py --workers 4 --host 0.0.0.0 --port 8000
+"""
+
+import argparse
+import logging
+import os
+
+logger = logging.getLogger("aventa.serve")
+
+
+def configure_environment(workers: int):
+    """
+    Variables de entorno de los workers (heredadas por cada proceso).
+    """
+    os.environ.setdefault("DB_PROFILE", "production")
+    os.environ["DB_AUTO_MIGRATE"] = "0"
+    os.environ.setdefault("RESERVA_GROUP_COMMIT", "1")
+    if workers > 1:
+        os.environ["CHANGES_SOURCE"] = "db"
+        # El cupo de escrituras es por worker: se reparten las 8 de un solo proceso (al menos
+        # una por worker, así que con más de 8 workers el total es la cantidad de workers).
+        # Las altas con group commit tienen su propio cupo (ADMISSION_GROUP_COMMIT_CONCURRENCY).
+        os.environ.setdefault("ADMISSION_WRITE_CONCURRENCY", str(max(1, 8 // workers)))
+
+
+def prepare_database(workers: int) -> dict:
+    """
+    Aplica las migraciones pendientes y fija el piso del registro de cambios
+    (el mismo para todos los workers de este arranque, así comparten ETag).
+    """
+    from database.change_log import log_position, sqlite_path
+    from database.database import DB_PROFILE, engine, get_engine_settings
+    from database.migrations.runner import upgrade
+
+    path = sqlite_path(engine)
+    if workers > 1:
+        if path is None:
+            raise SystemExit("Varios workers necesitan una base SQLite en archivo (DATABASE_URL)")
+        if get_engine_settings(DB_PROFILE)["pragmas"].get("journal_mode", "").upper() != "WAL":
+            raise SystemExit(f"Varios workers necesitan journal_mode=WAL (perfil actual: {DB_PROFILE})")
+        os.environ.setdefault("IDEMPOTENCY_DB", os.path.splitext(path)[0] + "_idempotency.sqlite")
+
+    result = upgrade(engine)
+    epoch, _, last = log_position(engine)
+    os.environ["CHANGES_FLOOR"] = str(last)
+    # Los workers abren sus propias conexiones
+    engine.dispose()
+    return {"migraciones": result, "epoch": epoch, "piso": last, "base": path}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    # Los streams SSE no terminan solos: sin tope el apagado esperaría a que cierre cada cliente
+    parser.add_argument("--graceful-timeout", type=float, default=float(os.getenv("GRACEFUL_TIMEOUT", 10)))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper())
+    configure_environment(args.workers)
+    logger.info("Base preparada: %s", prepare_database(args.workers))
+
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+
+if __name__ == "__main__":
+    main()
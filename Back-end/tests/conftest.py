@@ -0,0 +1,45 @@
+"""
+Configuración común de las pruebas (desde Back-end/: python -m pytest -q).
+
+Las pruebas nunca tocan AventaTravel_Group.sqlite: antes de importar la app se
+apunta DATABASE_URL a una base temporal, que el lifespan migra al arrancar.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+TEST_DIR = tempfile.mkdtemp(prefix="aventa_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DIR, 'test.sqlite')}"
+os.environ["DB_AUTO_MIGRATE"] = "1"
+
+USUARIO = {"nombre_usuario": "Prueba", "correo_usuario": "prueba@aventa.com", "telefono_usuario": "3000000000"}
+RESERVA = {
+    "nombre_destino": "Cartagena",
+    "fecha_inicio": "2025-06-01",
+    "fecha_fin": "2025-06-08",
+    "monto_reserva": 1500000,
+    "cuotas_reserva": 3,
+}
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def usuario(client):
+    response = client.post("/api/users/", json=USUARIO)
+    assert response.status_code == 200, response.text
+    return response.json()["user"]["id_usuario"]
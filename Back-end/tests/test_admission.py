@@ -0,0 +1,174 @@
+"""
+Control de admisión: 503 + Retry-After cuando una clase de ruta está saturada.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from utils import AdmissionController, AdmissionLimiter, AdmissionMiddleware
+
+
+def _app(limiters, routes=None):
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get("/api/lento")
+    async def lento():
+        await release.wait()
+        return {"ok": True}
+
+    @app.post("/api/lento")
+    async def escribir_lento():
+        await release.wait()
+        return {"ok": True}
+
+    @app.post("/api/lote")
+    async def lote():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/fuera")
+    async def fuera():
+        return {"ok": True}
+
+    controller = AdmissionController(limiters)
+    app.add_middleware(AdmissionMiddleware, controller=controller, prefix="/api", routes=routes)
+    return app, controller, release
+
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_cola_llena_da_503_con_retry_after():
+    async def scenario():
+        limiter = AdmissionLimiter(max_concurrent=1, max_queue=0, queue_timeout=1.0)
+        app, controller, release = _app({"read": limiter, "write": AdmissionLimiter(1, 0, 1.0)})
+        async with _client(app) as client:
+            first = asyncio.create_task(client.get("/api/lento"))
+            while limiter.active == 0:
+                await asyncio.sleep(0.01)
+
+            rejected = await client.get("/api/lento")
+            assert rejected.status_code == 503
+            assert int(rejected.headers["retry-after"]) >= 1
+            assert "cola llena" in rejected.json()["detail"]
+
+            # Fuera del prefijo no se limita
+            assert (await client.get("/fuera")).status_code == 200
+
+            release.set()
+            assert (await first).status_code == 200
+        assert limiter.active == 0
+        assert controller.stats()["read"]["rechazadas"]["queue_full"] == 1
+
+    _run(scenario)
+
+
+def test_plazo_vencido_en_la_cola_da_503():
+    async def scenario():
+        limiter = AdmissionLimiter(max_concurrent=1, max_queue=10, queue_timeout=0.05)
+        limiter.service_time = 0.0
+        app, _, release = _app({"read": limiter, "write": AdmissionLimiter(1, 0, 1.0)})
+        async with _client(app) as client:
+            first = asyncio.create_task(client.get("/api/lento"))
+            while limiter.active == 0:
+                await asyncio.sleep(0.01)
+            waited = await client.get("/api/lento")
+            assert waited.status_code == 503
+            assert "retry-after" in waited.headers
+            release.set()
+            await first
+        assert limiter.rejected["timeout"] == 1
+        assert limiter.queued == 0
+
+    _run(scenario)
+
+
+def test_en_cola_entra_cuando_se_libera_un_lugar():
+    async def scenario():
+        limiter = AdmissionLimiter(max_concurrent=1, max_queue=10, queue_timeout=5.0)
+        app, _, release = _app({"read": limiter, "write": AdmissionLimiter(1, 0, 1.0)})
+        async with _client(app) as client:
+            tasks = [asyncio.create_task(client.get("/api/lento")) for _ in range(3)]
+            while limiter.queued < 2:
+                await asyncio.sleep(0.01)
+            assert limiter.active == 1
+            release.set()
+            assert [response.status_code for response in await asyncio.gather(*tasks)] == [200, 200, 200]
+        assert limiter.admitted == 3
+        assert limiter.active == 0
+
+    _run(scenario)
+
+
+def test_ruta_con_clase_propia_no_usa_el_cupo_de_escritura():
+    async def scenario():
+        write = AdmissionLimiter(max_concurrent=1, max_queue=0, queue_timeout=1.0)
+        batch = AdmissionLimiter(max_concurrent=5, max_queue=0, queue_timeout=1.0)
+        app, _, release = _app(
+            {"read": AdmissionLimiter(1, 0, 1.0), "write": write, "group_commit": batch},
+            routes={("POST", "/api/lote"): "group_commit"},
+        )
+        async with _client(app) as client:
+            tasks = [asyncio.create_task(client.post("/api/lote")) for _ in range(5)]
+            while batch.active < 5:
+                await asyncio.sleep(0.01)
+            assert write.active == 0
+
+            assert (await client.post("/api/lote")).status_code == 503
+            writer = asyncio.create_task(client.post("/api/lento"))
+            while write.active == 0:
+                await asyncio.sleep(0.01)
+
+            release.set()
+            assert all(response.status_code == 200 for response in await asyncio.gather(*tasks, writer))
+
+    _run(scenario)
+
+
+# ==================== BASE OCUPADA EN LOS HANDLERS ====================
+
+class LockedSession:
+    """
+    Sesión cuya base siempre está bloqueada por otro escritor.
+    """
+
+    def _locked(self, *args, **kwargs):
+        import sqlite3
+
+        from sqlalchemy.exc import OperationalError
+
+        raise OperationalError("SELECT 1", {}, sqlite3.OperationalError("database is locked"))
+
+    execute = query = _locked
+
+    def rollback(self):
+        pass
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("GET", "/api/reportes/reservas", None),
+    ("POST", "/api/quotes/batch", {"montos": [1000], "cuotas": [1], "id_planes": [1]}),
+])
+def test_base_bloqueada_da_503_con_retry_after(client, method, path, body):
+    from database.database import get_db
+    from main import app
+    from routers.quotes.cotizador import discount_table
+
+    app.dependency_overrides[get_db] = lambda: LockedSession()
+    # Fuerza la recarga de los descuentos (consulta a la base)
+    discount_table._generation = object()
+    try:
+        response = client.request(method, path, json=body)
+    finally:
+        app.dependency_overrides.pop(get_db)
+    assert response.status_code == 503, response.text
+    assert "retry-after" in response.headers
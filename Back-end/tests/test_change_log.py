@@ -0,0 +1,187 @@
+"""
+Registro de cambios compartido (change_log) y su seguidor, como lo usan los
+workers de serve.py: cada "worker" tiene su propio ChangeFeed y engine sobre
+el mismo archivo.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from database.change_log import ChangeLogFollower, log_position
+from database.migrations.runner import upgrade
+from models.models import (
+    Plan as PlanModel, PLAN_COLUMNS,
+    Reserva as ReservaModel, RESERVA_COLUMNS,
+    User as UserModel, USER_COLUMNS,
+)
+from utils import ChangeFeed, TableVersions
+
+TABLES = {
+    "users": (USER_COLUMNS, UserModel.id_usuario),
+    "reservas": (RESERVA_COLUMNS, ReservaModel.id_reserva),
+    "plan": (PLAN_COLUMNS, PlanModel.id_plan),
+}
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "compartida.sqlite"
+    writer = create_engine(f"sqlite:///{path}")
+    upgrade(writer)
+    yield path, writer
+    writer.dispose()
+
+
+class Worker:
+    """
+    Feed, versiones y seguidor de un worker (como routers/changes/feed.py con CHANGES_SOURCE=db).
+    """
+
+    def __init__(self, path, interval: float = 60.0):
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.feed = ChangeFeed()
+        self.versions = TableVersions()
+        self.feed.add_listener(self.versions.record)
+        self.follower = ChangeLogFollower(self.engine, TABLES, publish=self.feed.extend, interval=interval)
+
+    def start(self, floor: int):
+        epoch, _, _ = log_position(self.engine)
+        self.versions.rebase(epoch, floor, time.time())
+        self.feed.attach_source(self.follower, floor)
+        self.follower.start(floor)
+
+    def events(self, since: int = 0):
+        changes, _ = self.feed.since(since)
+        return [(change.seq, change.table, change.event["op"], change.event["id"]) for change in changes]
+
+    def close(self):
+        self.follower.stop()
+        self.engine.dispose()
+
+
+@pytest.fixture
+def worker(database):
+    path, writer = database
+    instance = Worker(path)
+    instance.start(log_position(writer)[2])
+    yield instance
+    instance.close()
+
+
+def _insert_user(writer, nombre="Ana") -> int:
+    with writer.begin() as connection:
+        return connection.exec_driver_sql(
+            "INSERT INTO users (nombre_usuario, correo_usuario, telefono_usuario) VALUES (?, ?, '300')",
+            (nombre, f"{nombre.lower()}@aventa.com"),
+        ).lastrowid
+
+
+def test_triggers_anotan_cada_cambio_en_orden(database):
+    _, writer = database
+    _, _, before = log_position(writer)
+    user_id = _insert_user(writer)
+    with writer.begin() as connection:
+        connection.exec_driver_sql("UPDATE users SET nombre_usuario = 'Ana María' WHERE id_usuario = ?", (user_id,))
+        connection.exec_driver_sql("DELETE FROM users WHERE id_usuario = ?", (user_id,))
+        rows = connection.exec_driver_sql(
+            "SELECT seq, tabla, op, entity_id FROM change_log WHERE seq > ? ORDER BY seq", (before,)
+        ).all()
+    assert [tuple(row) for row in rows] == [
+        (before + 1, "users", "insert", user_id),
+        (before + 2, "users", "update", user_id),
+        (before + 3, "users", "delete", user_id),
+    ]
+
+
+def test_seguidor_publica_lo_escrito_por_otro_worker(database, worker):
+    _, writer = database
+    floor = worker.feed.last_seq
+    assert not worker.follower.is_behind()
+
+    user_id = _insert_user(writer)
+    assert worker.follower.is_behind()
+    worker.follower.refresh()
+
+    assert worker.events(floor) == [(floor + 1, "users", "insert", user_id)]
+    change = worker.feed.since(floor)[0][0]
+    assert change.event["data"]["nombre_usuario"] == "Ana"
+    assert worker.versions.table("users")[0] == floor + 1
+    assert worker.versions.row("users", str(user_id))[0] == floor + 1
+    assert not worker.follower.is_behind()
+
+
+def test_fila_borrada_antes_de_leer_sale_como_delete(database, worker):
+    _, writer = database
+    floor = worker.feed.last_seq
+    user_id = _insert_user(writer)
+    with writer.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM users WHERE id_usuario = ?", (user_id,))
+    worker.follower.refresh()
+
+    changes, _ = worker.feed.since(floor)
+    assert [change.event["op"] for change in changes] == ["delete", "delete"]
+    assert all(change.event["data"] is None for change in changes)
+
+
+def test_dos_workers_ven_la_misma_secuencia(database):
+    path, writer = database
+    floor = log_position(writer)[2]
+    first, second = Worker(path), Worker(path)
+    try:
+        first.start(floor)
+        second.start(floor)
+        for nombre in ("Ana", "Luis", "Eva"):
+            _insert_user(writer, nombre)
+        first.follower.refresh()
+        second.follower.refresh()
+        assert first.events(floor) == second.events(floor)
+        assert [seq for seq, *_ in first.events(floor)] == [floor + 1, floor + 2, floor + 3]
+        # Mismo epoch y piso: los ETag de uno valen en el otro
+        assert first.versions.epoch == second.versions.epoch
+        assert first.versions.table("users") == second.versions.table("users")
+    finally:
+        first.close()
+        second.close()
+
+
+def test_arranque_aplica_lo_posterior_al_piso(database):
+    path, writer = database
+    floor = log_position(writer)[2]
+    user_id = _insert_user(writer)
+    # Worker que se reinicia: el piso es el del arranque de serve.py, anterior a la escritura
+    restarted = Worker(path)
+    try:
+        restarted.start(floor)
+        assert restarted.events(floor) == [(floor + 1, "users", "insert", user_id)]
+    finally:
+        restarted.close()
+
+
+def test_hilo_de_fondo_publica_sin_refresh_explicito(database):
+    path, writer = database
+    polling = Worker(path, interval=0.02)
+    try:
+        polling.start(log_position(writer)[2])
+        floor = polling.feed.last_seq
+        _insert_user(writer)
+        deadline = time.monotonic() + 5
+        while polling.feed.last_seq == floor and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert polling.feed.last_seq == floor + 1
+    finally:
+        polling.close()
+
+
+def test_hueco_en_el_registro_vacia_el_buffer():
+    feed = ChangeFeed()
+    feed.attach_source(object(), 10)
+    feed.extend([(11, "users", "insert", 1, None, time.time())])
+    # Llega el 15: se perdieron del 12 al 14 (registro recortado)
+    feed.extend([(15, "users", "insert", 2, None, time.time())])
+    changes, gap = feed.since(11)
+    assert gap
+    assert [change.seq for change in changes] == [15]
+    # Los repetidos se ignoran
+    assert feed.extend([(15, "users", "insert", 2, None, time.time())]) == 15
@@ -0,0 +1,60 @@
+"""
+Compresión negociada: respuestas al vuelo y entradas de caché precomprimidas.
+"""
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from utils import CompressionMiddleware, build_entry, cached_json_response
+
+PAYLOAD = {"items": [{"id": index, "nombre": f"Destino {index}"} for index in range(200)]}
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def _app(minimum_size: int):
+    app = FastAPI()
+    entry = build_entry(PAYLOAD)
+
+    @app.get("/vivo")
+    def vivo(response: Response):
+        response.headers["ETag"] = '"v1"'
+        return PAYLOAD
+
+    @app.get("/cacheado")
+    def cacheado(request: Request):
+        return cached_json_response(request, entry)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+    return app
+
+
+def test_comprime_con_gzip_si_se_acepta():
+    with TestClient(_app(minimum_size=100)) as client:
+        for path in ("/vivo", "/cacheado"):
+            response = client.get(path, headers=GZIP)
+            assert response.headers["content-encoding"] == "gzip"
+            assert "accept-encoding" in response.headers["vary"].lower()
+            assert response.json() == PAYLOAD
+
+
+def test_sin_accept_encoding_no_comprime():
+    with TestClient(_app(minimum_size=100)) as client:
+        response = client.get("/cacheado", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == PAYLOAD
+
+
+def test_entradas_de_cache_usan_el_umbral_del_middleware():
+    # El cuerpo (unos 6 KB) queda por debajo del umbral configurado: ninguna ruta comprime
+    with TestClient(_app(minimum_size=1024 * 1024)) as client:
+        for path in ("/vivo", "/cacheado"):
+            response = client.get(path, headers=GZIP)
+            assert "content-encoding" not in response.headers, path
+            assert response.json() == PAYLOAD
+
+
+def test_etag_debil_al_comprimir():
+    with TestClient(_app(minimum_size=100)) as client:
+        plain = client.get("/vivo", headers={"Accept-Encoding": "identity"}).headers["etag"]
+        compressed = client.get("/vivo", headers=GZIP).headers["etag"]
+        assert compressed == "W/" + plain
@@ -0,0 +1,135 @@
+"""
+GET condicional por versión (ETag / 304) y su puesta al día con el registro compartido.
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils import ChangeFeed, ConditionalGetMiddleware, versioned
+from utils.versions import TableVersions
+
+
+class FakeSource:
+    """
+    Seguidor de change_log falso: anota si refresh() corrió dentro del event loop.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.on_event_loop = False
+
+    def refresh(self):
+        self.calls += 1
+        try:
+            asyncio.get_running_loop()
+            self.on_event_loop = True
+        except RuntimeError:
+            pass
+
+
+def _app(source=None):
+    versions = TableVersions()
+    feed = ChangeFeed()
+    feed.add_listener(versions.record)
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    @versioned(row=("items", "item_id"))
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/items")
+    @versioned("items")
+    def list_items():
+        return {"items": []}
+
+    app.add_middleware(ConditionalGetMiddleware, versions=versions, routes=app.router.routes, source=source)
+    return app, feed
+
+
+def test_304_si_no_hubo_cambios():
+    app, _ = _app()
+    with TestClient(app) as client:
+        first = client.get("/items")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        again = client.get("/items", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+
+def test_cambio_invalida_la_fila_y_el_listado():
+    app, feed = _app()
+    with TestClient(app) as client:
+        item = client.get("/items/1").headers["etag"]
+        other = client.get("/items/2").headers["etag"]
+        listing = client.get("/items").headers["etag"]
+
+        feed.publish("items", "update", 1, {"id": 1})
+
+        assert client.get("/items/1", headers={"If-None-Match": item}).status_code == 200
+        assert client.get("/items/2", headers={"If-None-Match": other}).status_code == 304
+        assert client.get("/items", headers={"If-None-Match": listing}).status_code == 200
+
+
+def test_query_string_distinto_no_comparte_etag():
+    app, _ = _app()
+    with TestClient(app) as client:
+        etag = client.get("/items", params={"limit": 10}).headers["etag"]
+        response = client.get("/items", params={"limit": 20}, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+
+def test_refresh_del_registro_fuera_del_event_loop():
+    source = FakeSource()
+    app, _ = _app(source)
+    with TestClient(app) as client:
+        assert client.get("/items/1").status_code == 200
+    assert source.calls == 1
+    assert not source.on_event_loop
+
+
+# ==================== API ====================
+
+def test_api_304_hasta_que_cambia_la_fila(client):
+    created = client.post(
+        "/api/users/", json={"nombre_usuario": "Etag", "correo_usuario": "etag@aventa.com", "telefono_usuario": "301"}
+    ).json()["user"]
+    path = f"/api/users/{created['id_usuario']}"
+
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith("W/")
+    listing = client.get("/api/users/").headers["etag"]
+
+    not_modified = client.get(path, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    body = {key: created[key] for key in ("correo_usuario", "telefono_usuario")}
+    updated = client.put(path, json={**body, "nombre_usuario": "Etag 2"})
+    assert updated.status_code == 200, updated.text
+
+    changed = client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["nombre_usuario"] == "Etag 2"
+    assert changed.headers["etag"] != etag
+    assert client.get("/api/users/", headers={"If-None-Match": listing}).status_code == 200
+
+
+def test_api_catalogo_de_planes_cacheado_usa_el_etag_de_version(client):
+    first = client.get("/api/plan/")
+    etag = first.headers["etag"]
+    assert client.get("/api/plan/", headers={"If-None-Match": etag}).status_code == 304
+
+    created = client.post("/api/plan/", json={"nombre_plan": "Etag", "categoria_plan": "Playa", "descuento_plan": 5})
+    assert created.status_code == 200, created.text
+
+    changed = client.get("/api/plan/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()["planes"]) == len(first.json()["planes"]) + 1
+    assert client.get("/api/plan/", headers={"If-None-Match": changed.headers["etag"]}).status_code == 304
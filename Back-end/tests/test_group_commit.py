@@ -0,0 +1,149 @@
+"""
+GroupCommitter: lotes, aislamiento de errores por fila y vaciado al detenerse.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, create_engine, event, select
+from sqlalchemy.exc import IntegrityError
+
+from database.group_commit import GroupCommitter
+
+metadata = MetaData()
+destinos = Table("destinos", metadata, Column("id", Integer, primary_key=True))
+viajes = Table(
+    "viajes", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("nombre", String, nullable=False),
+    Column("id_destino", Integer, ForeignKey("destinos.id")),
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'group_commit.sqlite'}")
+
+    @event.listens_for(engine, "connect")
+    def foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(destinos.insert(), [{"id": 1}])
+    yield engine
+    engine.dispose()
+
+
+def _count(engine) -> int:
+    with engine.connect() as connection:
+        return len(connection.execute(select(viajes.c.id)).all())
+
+
+def test_filas_concurrentes_comparten_lotes(engine):
+    committer = GroupCommitter(engine, viajes, max_batch=64, max_wait_ms=20)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = list(pool.map(lambda index: committer.submit({"nombre": f"v{index}", "id_destino": 1}), range(100)))
+    ids = [future.result(timeout=10) for future in futures]
+    committer.stop(timeout=10)
+
+    assert len(set(ids)) == 100
+    assert _count(engine) == 100
+    assert committer.rows == 100
+    # Con 100 filas casi simultáneas se necesitan pocos commits
+    assert committer.batches < 20
+
+
+def test_id_resuelto_ya_esta_confirmado(engine):
+    committer = GroupCommitter(engine, viajes, max_batch=8, max_wait_ms=1)
+    pk = committer.submit({"nombre": "confirmada", "id_destino": 1}).result(timeout=10)
+    with engine.connect() as connection:
+        assert connection.execute(select(viajes.c.nombre).where(viajes.c.id == pk)).scalar() == "confirmada"
+    committer.stop(timeout=10)
+
+
+def test_fila_invalida_no_tumba_el_lote(engine):
+    committer = GroupCommitter(engine, viajes, max_batch=64, max_wait_ms=50)
+    good = [committer.submit({"nombre": f"ok{index}", "id_destino": 1}) for index in range(5)]
+    bad_fk = committer.submit({"nombre": "sin destino", "id_destino": 99})
+    bad_null = committer.submit({"nombre": None, "id_destino": 1})
+    more = [committer.submit({"nombre": f"ok{index}", "id_destino": 1}) for index in range(5, 10)]
+
+    assert all(future.result(timeout=10) for future in good + more)
+    with pytest.raises(IntegrityError):
+        bad_fk.result(timeout=10)
+    with pytest.raises(IntegrityError):
+        bad_null.result(timeout=10)
+    committer.stop(timeout=10)
+
+    assert _count(engine) == 10
+    assert committer.batches == 1
+
+
+def test_error_del_lote_reintenta_fila_por_fila(engine):
+    committer = GroupCommitter(engine, viajes, max_batch=64, max_wait_ms=50)
+    good = [committer.submit({"nombre": f"ok{index}", "id_destino": 1}) for index in range(3)]
+    # Valor que el driver no puede enviar: no es una violación de restricción, se deshace el lote completo
+    broken = committer.submit({"nombre": object(), "id_destino": 1})
+
+    assert all(future.result(timeout=10) for future in good)
+    with pytest.raises(Exception):
+        broken.result(timeout=10)
+    committer.stop(timeout=10)
+    assert _count(engine) == 3
+
+
+def test_stop_confirma_lo_encolado(engine):
+    committer = GroupCommitter(engine, viajes, max_batch=4, max_wait_ms=1000)
+    futures = [committer.submit({"nombre": f"v{index}", "id_destino": 1}) for index in range(10)]
+    committer.stop(timeout=10)
+    assert all(future.done() and not future.exception() for future in futures)
+    assert _count(engine) == 10
+
+
+def test_plazo_vencido_en_la_cola_cancela_la_fila(engine):
+    # El lote espera hasta 5 s su primera fila: el plazo de la petición vence antes
+    committer = GroupCommitter(engine, viajes, max_batch=64, max_wait_ms=5000)
+    future = committer.submit({"nombre": "tarde", "id_destino": 1})
+    with pytest.raises(TimeoutError):
+        committer.wait(future, timeout=0.05)
+    assert future.cancelled()
+    committer.stop(timeout=10)
+    assert _count(engine) == 0
+
+
+def test_plazo_vencido_en_la_cola_cancela_la_fila_async(engine):
+    committer = GroupCommitter(engine, viajes, max_batch=64, max_wait_ms=5000)
+
+    async def scenario():
+        future = committer.submit({"nombre": "tarde", "id_destino": 1})
+        with pytest.raises(asyncio.TimeoutError):
+            await committer.wait_async(future, timeout=0.05)
+        return future
+
+    assert asyncio.run(scenario()).cancelled()
+    committer.stop(timeout=10)
+    assert _count(engine) == 0
+
+
+def _running_future(result, delay: float) -> Future:
+    """
+    Future que un lote ya tomó (running) y que se confirma a los `delay` segundos.
+    """
+    future = Future()
+    assert future.set_running_or_notify_cancel()
+    threading.Timer(delay, future.set_result, (result,)).start()
+    return future
+
+
+def test_fila_tomada_por_el_lote_espera_su_commit():
+    assert GroupCommitter.wait(_running_future(7, 0.2), timeout=0.01) == 7
+
+
+def test_fila_tomada_por_el_lote_espera_su_commit_async():
+    async def scenario():
+        return await GroupCommitter.wait_async(_running_future(8, 0.2), timeout=0.01)
+
+    assert asyncio.run(scenario()) == 8
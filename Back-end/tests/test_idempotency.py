@@ -0,0 +1,100 @@
+"""
+Idempotency-Key: repetición de la respuesta guardada y claves reutilizadas con otra petición.
+"""
+
+import asyncio
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils import IdempotencyMiddleware, IdempotencyStore
+
+
+def _app(store):
+    app = FastAPI()
+    calls = []
+
+    @app.post("/items/bulk")
+    async def bulk(items: List[int], upsert: bool = False):
+        calls.append((len(items), upsert))
+        await asyncio.sleep(0.05)
+        return {"creados": len(items), "upsert": upsert, "llamada": len(calls)}
+
+    app.add_middleware(IdempotencyMiddleware, store=store, paths=["/items/bulk"])
+    return app, calls
+
+
+def test_reintento_repite_la_respuesta():
+    app, calls = _app(IdempotencyStore())
+    with TestClient(app) as client:
+        headers = {"Idempotency-Key": "k1"}
+        first = client.post("/items/bulk", json=[1, 2], headers=headers)
+        again = client.post("/items/bulk", json=[1, 2], headers=headers)
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert again.headers["idempotent-replayed"] == "true"
+    assert len(calls) == 1
+
+
+def test_misma_clave_con_otro_cuerpo_da_422():
+    app, calls = _app(IdempotencyStore())
+    with TestClient(app) as client:
+        client.post("/items/bulk", json=[1, 2], headers={"Idempotency-Key": "k2"})
+        response = client.post("/items/bulk", json=[1, 2, 3], headers={"Idempotency-Key": "k2"})
+    assert response.status_code == 422
+    assert len(calls) == 1
+
+
+def test_misma_clave_con_otro_query_string_da_422():
+    app, calls = _app(IdempotencyStore())
+    with TestClient(app) as client:
+        headers = {"Idempotency-Key": "k3"}
+        first = client.post("/items/bulk", params={"upsert": "true"}, json=[1], headers=headers)
+        response = client.post("/items/bulk", params={"upsert": "false"}, json=[1], headers=headers)
+        again = client.post("/items/bulk", params={"upsert": "true"}, json=[1], headers=headers)
+    assert first.json()["upsert"] is True
+    assert response.status_code == 422
+    assert again.status_code == 200 and again.headers["idempotent-replayed"] == "true"
+    assert calls == [(1, True)]
+
+
+def test_sin_clave_no_se_guarda():
+    app, calls = _app(IdempotencyStore())
+    with TestClient(app) as client:
+        client.post("/items/bulk", json=[1])
+        client.post("/items/bulk", json=[1])
+    assert len(calls) == 2
+
+
+def test_duplicados_concurrentes_ejecutan_una_vez():
+    async def scenario():
+        app, calls = _app(IdempotencyStore())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(
+                client.post("/items/bulk", json=[1], headers={"Idempotency-Key": "k4"}) for _ in range(5)
+            ))
+        return calls, responses
+
+    calls, responses = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert {response.json()["llamada"] for response in responses} == {1}
+
+
+def test_persistencia_compartida_entre_almacenes(tmp_path):
+    path = str(tmp_path / "idempotency.sqlite")
+    first_app, first_calls = _app(IdempotencyStore(path=path))
+    # Otro worker: su propio almacén sobre el mismo archivo
+    second_app, second_calls = _app(IdempotencyStore(path=path))
+    headers = {"Idempotency-Key": "k5"}
+    with TestClient(first_app) as client:
+        created = client.post("/items/bulk", params={"upsert": "true"}, json=[1], headers=headers)
+    with TestClient(second_app) as client:
+        replayed = client.post("/items/bulk", params={"upsert": "true"}, json=[1], headers=headers)
+        mismatch = client.post("/items/bulk", json=[1], headers=headers)
+    assert replayed.json() == created.json()
+    assert replayed.headers["idempotent-replayed"] == "true"
+    assert mismatch.status_code == 422
+    assert len(first_calls) == 1 and not second_calls
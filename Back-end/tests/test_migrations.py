@@ -0,0 +1,106 @@
+"""
+Runner de migraciones: base nueva, base heredada (AventaTravel_Group.sqlite) y fallas.
+"""
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from database.migrations.m0001_reserva_tipos_indices import MigrationError
+from database.migrations.runner import (
+    SchemaOutdatedError,
+    available_migrations,
+    check_schema,
+    current_version,
+    latest_version,
+    status,
+    upgrade,
+)
+
+LEGACY_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "database", "AventaTravel_Group.sqlite")
+
+
+@pytest.fixture
+def legacy_copy(tmp_path):
+    """
+    Copia de la base versionada en el repo (esquema anterior a las migraciones).
+    """
+    path = str(tmp_path / "legacy.sqlite")
+    shutil.copyfile(LEGACY_DB, path)
+    engine = create_engine(f"sqlite:///{path}")
+    yield path, engine
+    engine.dispose()
+
+
+def _insert_legacy_reserva(path, id_usuario):
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "INSERT INTO reserva (id_reserva, nombre_destino, fecha_inicio, fecha_fin, monto_reserva, "
+        "cuotas_reserva, id_usuario) VALUES (1, 'Cali', '2025-01-01', '2025-01-05', 1000, 2, ?)",
+        (id_usuario,),
+    )
+    connection.commit()
+    connection.close()
+
+
+def test_migraciones_numeradas_sin_huecos():
+    versions = [version for version, _ in available_migrations()]
+    assert versions == list(range(1, latest_version() + 1))
+
+
+def test_base_nueva_queda_en_la_ultima_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'nueva.sqlite'}")
+    result = upgrade(engine)
+    assert result["aplicadas"] == ["esquema inicial"]
+    assert current_version(engine) == latest_version()
+    assert status(engine)["pendientes"] == []
+    check_schema(engine)
+    assert upgrade(engine)["aplicadas"] == []
+    engine.dispose()
+
+
+def test_base_heredada_sin_migrar_no_arranca(legacy_copy):
+    _, engine = legacy_copy
+    assert status(engine)["pendientes"] == list(range(1, latest_version() + 1))
+    with pytest.raises(SchemaOutdatedError):
+        check_schema(engine)
+
+
+def test_base_heredada_conserva_filas_y_relaciones(legacy_copy):
+    path, engine = legacy_copy
+    _insert_legacy_reserva(path, "1")
+
+    result = upgrade(engine)
+    assert [item["version"] for item in result["aplicadas"]] == list(range(1, latest_version() + 1))
+    assert result["hasta"] == latest_version()
+    check_schema(engine)
+
+    connection = sqlite3.connect(path)
+    row = connection.execute(
+        "SELECT id_usuario, typeof(id_usuario), fecha_inicio, fecha_fin FROM reserva WHERE id_reserva = 1"
+    ).fetchone()
+    assert row == (1, "integer", "2025-01-01", "2025-01-05")
+    assert connection.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert connection.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 1
+    connection.close()
+
+    # Idempotente: una segunda corrida no aplica nada
+    assert upgrade(engine)["aplicadas"] == []
+
+
+def test_migracion_fallida_no_avanza_la_version(legacy_copy):
+    path, engine = legacy_copy
+    # Usuario inexistente: la migración se detiene con un reporte
+    _insert_legacy_reserva(path, "7")
+
+    with pytest.raises(MigrationError, match="7"):
+        upgrade(engine)
+    assert current_version(engine) == 0
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT id_usuario FROM reserva").fetchall() == [("7",)]
+    connection.close()
@@ -0,0 +1,83 @@
+"""
+Paginación por cursor (keyset) de GET /api/reservas/, con y sin ?sort=.
+"""
+
+import pytest
+
+from conftest import RESERVA
+
+DESTINO = "Keyset"
+# Tres montos repetidos: muchas filas empatan en la columna de orden
+MONTOS = [3000, 1000, 2000]
+TOTAL = 23
+
+
+@pytest.fixture(scope="module")
+def reservas(client, usuario):
+    batch = [
+        {**RESERVA, "nombre_destino": DESTINO, "monto_reserva": MONTOS[index % len(MONTOS)], "id_usuario": usuario}
+        for index in range(TOTAL)
+    ]
+    response = client.post("/api/reservas/bulk", json=batch)
+    assert response.status_code == 200, response.text
+    return _walk(client, limit=1000)
+
+
+def _walk(client, limit, sort=None):
+    """
+    Recorre todas las páginas siguiendo next_cursor. Retorna: (filas, cantidad de páginas)
+    """
+    rows, pages, cursor = [], 0, None
+    while True:
+        params = {"nombre_destino": DESTINO, "limit": limit, "fields": "monto_reserva"}
+        if sort:
+            params["sort"] = sort
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/reservas/", params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        rows += body["reservas"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return rows, pages
+
+
+def test_orden_por_id_sin_huecos_ni_repetidos(client, reservas):
+    all_rows, _ = reservas
+    assert len(all_rows) == TOTAL
+    rows, pages = _walk(client, limit=5)
+    assert rows == all_rows
+    assert [row["id_reserva"] for row in rows] == sorted(row["id_reserva"] for row in all_rows)
+    assert pages == 5
+
+
+@pytest.mark.parametrize("sort, key, reverse", [
+    ("monto_reserva", lambda row: (row["monto_reserva"], row["id_reserva"]), False),
+    ("-monto_reserva", lambda row: (row["monto_reserva"], row["id_reserva"]), True),
+    ("-id_reserva", lambda row: row["id_reserva"], True),
+])
+@pytest.mark.parametrize("limit", [1, 4, 7])
+def test_orden_con_empates_y_descendente(client, reservas, sort, key, reverse, limit):
+    all_rows, _ = reservas
+    rows, _ = _walk(client, limit=limit, sort=sort)
+    assert rows == sorted(all_rows, key=key, reverse=reverse)
+
+
+def test_pagina_exacta_no_deja_cursor_vacio(client, reservas):
+    rows, pages = _walk(client, limit=TOTAL)
+    assert len(rows) == TOTAL
+    assert pages == 1
+
+
+def test_cursor_de_otro_orden_da_400(client, reservas):
+    params = {"nombre_destino": DESTINO, "limit": 2, "sort": "monto_reserva"}
+    cursor = client.get("/api/reservas/", params=params).json()["next_cursor"]
+    assert client.get("/api/reservas/", params={**params, "sort": "-monto_reserva", "cursor": cursor}).status_code == 400
+    assert client.get("/api/reservas/", params={"limit": 2, "cursor": cursor}).status_code == 400
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", "e30", "eyJpZCI6ICJ4In0"])
+def test_cursor_invalido_da_400(client, cursor):
+    assert client.get("/api/reservas/", params={"cursor": cursor}).status_code == 400
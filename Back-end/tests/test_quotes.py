@@ -0,0 +1,38 @@
+"""
+Validación de entrada del cotizador por lotes (POST /api/quotes/batch).
+"""
+
+import pytest
+
+from schemas.schemas import MAX_CUOTAS_COTIZACION, MAX_MONTO_COTIZACION
+
+
+def test_cotiza_el_producto(client):
+    response = client.post("/api/quotes/batch", json={"montos": [1000, 2000], "cuotas": [1, 3]})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total_cotizaciones"] == 4
+    assert body["ultima_cuota"][1] + body["valor_cuota"][1] * 2 == body["total"][1]
+
+
+def test_monto_maximo_no_desborda(client):
+    response = client.post(
+        "/api/quotes/batch", json={"montos": [MAX_MONTO_COTIZACION], "cuotas": [MAX_CUOTAS_COTIZACION]}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["total"] == [MAX_MONTO_COTIZACION]
+
+
+@pytest.mark.parametrize("payload", [
+    {"montos": [10 ** 19], "cuotas": [1]},
+    {"montos": [MAX_MONTO_COTIZACION + 1], "cuotas": [1]},
+    {"montos": [-1], "cuotas": [1]},
+    {"montos": [1000], "cuotas": [0]},
+    {"montos": [1000], "cuotas": [-3]},
+    {"montos": [1000], "cuotas": [MAX_CUOTAS_COTIZACION + 1]},
+    {"montos": [1000], "cuotas": [1], "redondeo": 10 ** 19},
+    {"montos": [1000], "cuotas": [1], "redondeo": 0},
+    {"montos": [1000], "cuotas": [1], "id_planes": [10 ** 19]},
+])
+def test_valores_fuera_de_rango_dan_422(client, payload):
+    assert client.post("/api/quotes/batch", json=payload).status_code == 422
@@ -0,0 +1,100 @@
+"""
+Fechas invertidas (fecha_fin < fecha_inicio) en reservas: schema, CHECK y migración 0008.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from conftest import RESERVA
+from database.migrations import m0008_reserva_check_fechas
+from database.migrations.m0001_reserva_tipos_indices import MigrationError
+
+INVERTIDA = {**RESERVA, "fecha_inicio": "2025-06-08", "fecha_fin": "2025-06-01"}
+
+
+def test_crear_con_fechas_invertidas_da_422(client, usuario):
+    response = client.post("/api/reservas/", json={**INVERTIDA, "id_usuario": usuario})
+    assert response.status_code == 422
+    assert "fecha_fin" in response.text
+
+
+def test_bulk_con_fechas_invertidas_da_422(client, usuario):
+    batch = [{**RESERVA, "id_usuario": usuario}, {**INVERTIDA, "id_usuario": usuario}]
+    response = client.post("/api/reservas/bulk", json=batch)
+    assert response.status_code == 422
+
+
+def test_actualizar_con_fechas_invertidas_da_422(client, usuario):
+    created = client.post("/api/reservas/", json={**RESERVA, "id_usuario": usuario})
+    assert created.status_code == 200, created.text
+    reserva_id = created.json()["reserva"]["id_reserva"]
+    response = client.put(f"/api/reservas/{reserva_id}", json={**INVERTIDA, "id_usuario": usuario})
+    assert response.status_code == 422
+
+
+def test_mismo_dia_es_valido(client, usuario):
+    response = client.post(
+        "/api/reservas/", json={**RESERVA, "fecha_fin": RESERVA["fecha_inicio"], "id_usuario": usuario}
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_check_de_la_tabla_rechaza_insert_directo(client):
+    from database.database import engine
+
+    with pytest.raises(Exception, match="ck_reserva_fechas"):
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO reserva (nombre_destino, fecha_inicio, fecha_fin, monto_reserva, cuotas_reserva) "
+                "VALUES ('X', '2025-06-08', '2025-06-01', 1, 1)"
+            )
+
+
+def test_ocupacion_no_cuenta_negativos(client, usuario):
+    response = client.get("/api/reservas/ocupacion", params={"desde": "2025-05-25", "hasta": "2025-06-15"})
+    assert response.status_code == 200, response.text
+    dias = {dia["fecha"]: dia["reservas_activas"] for dia in response.json()["dias"]}
+    assert all(activas >= 0 for activas in dias.values())
+    assert dias["2025-05-31"] == 0
+    assert dias["2025-06-01"] >= 1
+    assert dias["2025-06-09"] == 0
+
+
+def test_migracion_se_detiene_con_filas_invertidas(tmp_path):
+    path = tmp_path / "vieja.sqlite"
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE reserva (
+            id_reserva INTEGER NOT NULL PRIMARY KEY,
+            nombre_destino VARCHAR(150) NOT NULL,
+            fecha_inicio DATE NOT NULL,
+            fecha_fin DATE NOT NULL,
+            monto_reserva INTEGER NOT NULL,
+            cuotas_reserva INTEGER NOT NULL
+        );
+        CREATE INDEX ix_reserva_fechas ON reserva (fecha_inicio, fecha_fin);
+        INSERT INTO reserva VALUES (1, 'Cali', '2025-01-01', '2025-01-05', 10, 1);
+        INSERT INTO reserva VALUES (2, 'Cali', '2025-02-10', '2025-02-01', 10, 1);
+        """
+    )
+    connection.close()
+    engine = create_engine(f"sqlite:///{path}")
+
+    with pytest.raises(MigrationError, match="reserva 2"):
+        m0008_reserva_check_fechas.upgrade(engine)
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("UPDATE reserva SET fecha_fin = '2025-02-12' WHERE id_reserva = 2")
+    assert m0008_reserva_check_fechas.upgrade(engine)["restriccion"] == "ck_reserva_fechas"
+    assert m0008_reserva_check_fechas.upgrade(engine) == {"reserva": "sin cambios"}
+
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT COUNT(*) FROM reserva").scalar() == 2
+        indexes = connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'reserva'"
+        ).scalars().all()
+    assert "ix_reserva_fechas" in indexes
+    engine.dispose()
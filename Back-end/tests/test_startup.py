@@ -0,0 +1,20 @@
+"""
+Arranque de un worker: `import main` no debe cargar dependencias que solo usan
+algunas rutas (ver benchmarks/bench_startup.py).
+"""
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos pesados que se importan en la primera petición que los usa
+LAZY_MODULES = ("numpy",)
+
+
+def test_import_main_no_carga_modulos_pesados(tmp_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'arranque.sqlite'}")
+    snippet = f"import sys, main; print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    output = subprocess.check_output([sys.executable, "-c", snippet], cwd=BACKEND_DIR, env=env, text=True)
+    assert output.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,135 @@
+from utils.pagination import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    encode_cursor,
+    decode_cursor,
+    encode_sort_cursor,
+    decode_sort_cursor,
+    paginate,
+    paginate_async
+)
+from utils.listing import (
+    parse_fields,
+    parse_sort
+)
+from utils.export import (
+    EXPORT_FORMATS,
+    export_response
+)
+from utils.bulk import (
+    BULK_CHUNK_SIZE,
+    MAX_BULK_ITEMS,
+    bulk_insert,
+    bulk_summary
+)
+from utils.cache import (
+    CacheEntry,
+    TTLCache,
+    build_entry,
+    cached_json_response
+)
+
+from utils.search import (
+    MIN_QUERY_LENGTH,
+    DEFAULT_SEARCH_LIMIT,
+    build_fts_query,
+    fts_search
+)
+
+from utils.compression import (
+    COMPRESSION_MIN_SIZE,
+    GZIP_LEVEL,
+    BROTLI_QUALITY,
+    negotiate_encoding,
+    compress,
+    compressed_body,
+    CompressionMiddleware
+)
+
+from utils.serialization import (
+    FastJSONResponse,
+    dumps,
+    rows_to_dicts,
+    entity_dict
+)
+
+from utils.metrics import (
+    MetricsRegistry,
+    MetricsMiddleware
+)
+
+from utils.idempotency import (
+    IdempotencyStore,
+    IdempotencyMiddleware
+)
+
+from utils.admission import (
+    AdmissionLimiter,
+    AdmissionController,
+    AdmissionMiddleware,
+    is_database_busy,
+    raise_if_busy
+)
+
+from utils.changes import (
+    CHANGE_OPS,
+    ChangeFeed
+)
+
+from utils.versions import (
+    TableVersions,
+    versioned,
+    ConditionalGetMiddleware
+)
+
+__all__ = [
+    "DEFAULT_LIMIT",
+    "MAX_LIMIT",
+    "encode_cursor",
+    "decode_cursor",
+    "encode_sort_cursor",
+    "decode_sort_cursor",
+    "paginate",
+    "paginate_async",
+    "parse_fields",
+    "parse_sort",
+    "EXPORT_FORMATS",
+    "export_response",
+    "BULK_CHUNK_SIZE",
+    "MAX_BULK_ITEMS",
+    "bulk_insert",
+    "bulk_summary",
+    "CacheEntry",
+    "TTLCache",
+    "build_entry",
+    "cached_json_response",
+    "MIN_QUERY_LENGTH",
+    "DEFAULT_SEARCH_LIMIT",
+    "build_fts_query",
+    "fts_search",
+    "COMPRESSION_MIN_SIZE",
+    "GZIP_LEVEL",
+    "BROTLI_QUALITY",
+    "negotiate_encoding",
+    "compress",
+    "compressed_body",
+    "CompressionMiddleware",
+    "FastJSONResponse",
+    "dumps",
+    "rows_to_dicts",
+    "entity_dict",
+    "MetricsRegistry",
+    "MetricsMiddleware",
+    "IdempotencyStore",
+    "IdempotencyMiddleware",
+    "AdmissionLimiter",
+    "AdmissionController",
+    "AdmissionMiddleware",
+    "is_database_busy",
+    "raise_if_busy",
+    "CHANGE_OPS",
+    "ChangeFeed",
+    "TableVersions",
+    "versioned",
+    "ConditionalGetMiddleware"
+]
@@ -0,0 +1,298 @@
+"""
+Control de admisión para las peticiones que usan la base de datos.
+
+Cuando SQLite está saturado (escrituras esperando el lock), dejar pasar más
+peticiones solo alarga la cola del threadpool: todas esperan busy_timeout y
+fallan juntas. En cambio, por clase de ruta ("read": GET/HEAD, "write": el
+resto) se limita cuántas peticiones están adentro a la vez:
+
+- hasta `max_concurrent` se atienden de inmediato;
+- las siguientes esperan en una cola FIFO de a lo sumo `max_queue`, cada una
+  con un plazo de `queue_timeout` segundos;
+- si la cola está llena, si la espera estimada (posición en la cola × tiempo
+  de servicio promedio / `max_concurrent`) ya supera el plazo, o si el plazo
+  vence, se responde 503 con Retry-After sin tocar la base. La estimación
+  rechaza al instante lo que de todos modos iba a vencer en la cola.
+
+Así la latencia de las peticiones admitidas queda acotada (a lo sumo
+`max_concurrent` compiten por la base) y el exceso falla rápido.
+
+Una ruta puede tener su propia clase (`routes` del middleware). Por ejemplo,
+los POST /reservas/ con group commit esperan su lote sin tener el lock de la
+base: contarlos como "write" limitaría el tamaño del lote al cupo de escrituras.
+
+Todo corre en el event loop (un solo hilo): los contadores no necesitan lock.
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from .serialization import dumps
+
+# Clases de ruta
+READ = "read"
+WRITE = "write"
+READ_METHODS = ("GET", "HEAD")
+
+# Cota del Retry-After sugerido (segundos)
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 30
+
+# Peso de cada muestra nueva en el promedio móvil del tiempo de servicio
+SERVICE_TIME_ALPHA = 0.1
+
+# Mensajes de SQLite cuando otra conexión tiene el lock
+_BUSY_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+
+# ==================== LIMITADOR ====================
+
+class AdmissionLimiter:
+    """
+    Semáforo con cola acotada y plazo de espera para una clase de ruta.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        # Promedio móvil del tiempo que una petición admitida ocupa su lugar
+        self.service_time = 0.05
+
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "deadline": 0, "timeout": 0}
+        self.wait_sum = 0.0
+        self.wait_count = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> Optional[str]:
+        """
+        Espera un lugar. Retorna: None si fue admitida, o el motivo del rechazo
+        ("queue_full" / "deadline" / "timeout")
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return None
+        if len(self._waiters) >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            return "queue_full"
+        if self.expected_wait() > self.queue_timeout:
+            self.rejected["deadline"] += 1
+            return "deadline"
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiters.append(future)
+        started = loop.time()
+        try:
+            # asyncio.wait no cancela el future al vencer el plazo
+            await asyncio.wait((future,), timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # El cliente se desconectó mientras esperaba
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._discard(future)
+            raise
+
+        self.wait_sum += loop.time() - started
+        self.wait_count += 1
+        if future.done() and not future.cancelled():
+            # `release` le pasó su lugar (active ya lo cuenta)
+            self.admitted += 1
+            return None
+        self._discard(future)
+        self.rejected["timeout"] += 1
+        return "timeout"
+
+    def _discard(self, future: asyncio.Future):
+        future.cancel()
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+    def release(self, service_time: Optional[float] = None):
+        """
+        Libera un lugar: pasa directo al primero de la cola o lo devuelve.
+        """
+        if service_time is not None:
+            self.service_time += SERVICE_TIME_ALPHA * (service_time - self.service_time)
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(True)
+                return
+        self.active -= 1
+
+    def expected_wait(self) -> float:
+        """
+        Espera estimada de una petición que entra ahora al final de la cola.
+        """
+        return (self.queued + 1) * self.service_time / max(self.max_concurrent, 1)
+
+    def retry_after(self) -> int:
+        """
+        Segundos sugeridos para reintentar: lo que tardaría en vaciarse la cola actual.
+        """
+        return min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, math.ceil(self.expected_wait())))
+
+
+# ==================== CONTROLADOR ====================
+
+class AdmissionController:
+    """
+    Limitadores por clase de ruta y exportación de sus contadores (Prometheus).
+    """
+
+    def __init__(self, limiters: Dict[str, AdmissionLimiter]):
+        self.limiters = limiters
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "activas": limiter.active,
+                "en_cola": limiter.queued,
+                "max_concurrentes": limiter.max_concurrent,
+                "max_cola": limiter.max_queue,
+                "admitidas": limiter.admitted,
+                "rechazadas": dict(limiter.rejected),
+            }
+            for name, limiter in self.limiters.items()
+        }
+
+    def render(self) -> str:
+        """
+        Retorna los contadores en el formato de exposición de texto 0.0.4.
+        """
+        items = sorted(self.limiters.items())
+        lines: List[str] = [
+            "# HELP admission_in_flight Peticiones admitidas en curso por clase de ruta.",
+            "# TYPE admission_in_flight gauge",
+        ]
+        lines += [f'admission_in_flight{{class="{name}"}} {limiter.active}' for name, limiter in items]
+        lines += [
+            "# HELP admission_queue_depth Peticiones esperando lugar por clase de ruta.",
+            "# TYPE admission_queue_depth gauge",
+        ]
+        lines += [f'admission_queue_depth{{class="{name}"}} {limiter.queued}' for name, limiter in items]
+        lines += [
+            "# HELP admission_admitted_total Peticiones admitidas por clase de ruta.",
+            "# TYPE admission_admitted_total counter",
+        ]
+        lines += [f'admission_admitted_total{{class="{name}"}} {limiter.admitted}' for name, limiter in items]
+        lines += [
+            "# HELP admission_rejected_total Peticiones rechazadas con 503 por clase de ruta y motivo.",
+            "# TYPE admission_rejected_total counter",
+        ]
+        for name, limiter in items:
+            for reason, count in sorted(limiter.rejected.items()):
+                lines.append(f'admission_rejected_total{{class="{name}",reason="{reason}"}} {count}')
+        lines += [
+            "# HELP admission_queue_wait_seconds Tiempo de espera en la cola por clase de ruta.",
+            "# TYPE admission_queue_wait_seconds summary",
+        ]
+        for name, limiter in items:
+            lines.append(f'admission_queue_wait_seconds_sum{{class="{name}"}} {limiter.wait_sum}')
+            lines.append(f'admission_queue_wait_seconds_count{{class="{name}"}} {limiter.wait_count}')
+        return "\n".join(lines) + "\n"
+
+
+# ==================== MIDDLEWARE ====================
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI: toma un lugar del limitador de la clase de la petición
+    (solo paths bajo `prefix`, salvo los de `exempt`) y lo libera cuando la
+    respuesta terminó de enviarse (incluye las exportaciones en streaming).
+    `routes` asigna otra clase a rutas puntuales: {(método, path): clase}.
+    """
+
+    def __init__(self, app, controller: AdmissionController, prefix: str = "/api", exempt: Iterable[str] = (),
+                 routes: Optional[Dict[Tuple[str, str], str]] = None):
+        self.app = app
+        self.controller = controller
+        self.prefix = prefix
+        self.exempt = tuple(exempt)
+        self.routes = dict(routes or {})
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" \
+                or not path.startswith(self.prefix) or path.startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+
+        route_class = self.routes.get((scope["method"], path))
+        if route_class is None:
+            route_class = READ if scope["method"] in READ_METHODS else WRITE
+        limiter = self.controller.limiters[route_class]
+        reason = await limiter.acquire()
+        if reason is not None:
+            await _send_overloaded(send, limiter.retry_after(), route_class, reason)
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(loop.time() - started)
+
+
+async def _send_overloaded(send, retry_after: int, route_class: str, reason: str):
+    motivo = {
+        "queue_full": "cola llena",
+        "deadline": "la espera estimada supera el plazo",
+        "timeout": "tiempo de espera agotado",
+    }[reason]
+    body = dumps({"detail": f"Servidor saturado ({route_class}: {motivo}); reintente en {retry_after} s"})
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"retry-after", str(retry_after).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# ==================== ERRORES DE LA BASE ====================
+
+def is_database_busy(error: BaseException) -> bool:
+    """
+    Indica si el error es por saturación (lock de SQLite o pool sin conexiones libres)
+    y no por los datos de la petición.
+    """
+    if isinstance(error, PoolTimeoutError):
+        return True
+    if isinstance(error, OperationalError):
+        message = str(error.orig).lower()
+        return any(busy in message for busy in _BUSY_MESSAGES)
+    return False
+
+
+def raise_if_busy(error: BaseException, retry_after: int = MIN_RETRY_AFTER):
+    """
+    En los `except Exception` de los handlers: convierte la saturación de la
+    base en 503 + Retry-After en vez de un 400/500 genérico.
+    """
+    if is_database_busy(error):
+        raise HTTPException(
+            status_code=503,
+            detail="La base de datos está ocupada; reintente en unos segundos",
+            headers={"Retry-After": str(retry_after)},
+        ) from error
@@ -0,0 +1,105 @@
+"""
+Inserción masiva (bulk) con upsert opcional.
+
+Los elementos se insertan con executemany en transacciones por bloques, en
+vez de un `add -> commit -> refresh` por fila. Si un bloque falla se reintenta
+fila por fila para aislar el error y reportarlo en el resultado de cada
+elemento sin perder el resto del bloque.
+"""
+
+from typing import Any, Dict, List
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+# ==================== CONFIGURACIÓN ====================
+BULK_CHUNK_SIZE = 500
+MAX_BULK_ITEMS = 50000
+
+
+# ==================== CONSTRUCCIÓN DEL INSERT ====================
+
+def _build_insert(model, pk_column, keys: List[str], upsert: bool):
+    """
+    Construye el INSERT ... RETURNING pk (y ON CONFLICT DO UPDATE si es upsert).
+    """
+    table = model.__table__
+    stmt = insert(table)
+
+    if upsert:
+        update_set = {key: stmt.excluded[key] for key in keys if key != pk_column.key}
+        # Columnas con onupdate (ej. fecha_actualizacion) que no vienen en los datos
+        for column in table.columns:
+            if column.onupdate is not None and column.key not in update_set:
+                update_set[column.key] = column.onupdate.arg
+        stmt = stmt.on_conflict_do_update(index_elements=[pk_column.key], set_=update_set)
+
+    return stmt.returning(pk_column, sort_by_parameter_order=True)
+
+
+# ==================== INSERCIÓN ====================
+
+def bulk_insert(
+    db: Session,
+    model,
+    pk_column,
+    items: List[Dict[str, Any]],
+    upsert: bool = False,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Inserta (o actualiza, si upsert=True) los elementos en bloques de `chunk_size`.
+    Los elementos sin llave primaria (None) reciben una nueva.
+    Retorna: un resultado por elemento, en el mismo orden de entrada:
+        {"indice": i, "estado": "ok", <pk>: id} o {"indice": i, "estado": "error", "error": "..."}
+    """
+    pk_key = pk_column.key
+    results: List[Dict[str, Any]] = []
+    if not items:
+        return results
+
+    # Todas las filas llevan las mismas columnas para poder usar executemany
+    keys = list(items[0].keys())
+    if pk_key not in keys:
+        keys.append(pk_key)
+    rows = [{key: item.get(key) for key in keys} for item in items]
+    stmt = _build_insert(model, pk_column, keys, upsert)
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            ids = db.execute(stmt, chunk).scalars().all()
+            db.commit()
+            results.extend(
+                {"indice": start + offset, "estado": "ok", pk_key: new_id}
+                for offset, new_id in enumerate(ids)
+            )
+            continue
+        except Exception:
+            db.rollback()
+
+        # El bloque falló: se reintenta fila por fila para aislar los errores
+        for offset, row in enumerate(chunk):
+            try:
+                new_id = db.execute(stmt, [row]).scalar_one()
+                db.commit()
+                results.append({"indice": start + offset, "estado": "ok", pk_key: new_id})
+            except Exception as e:
+                db.rollback()
+                results.append({"indice": start + offset, "estado": "error", "error": str(e)})
+
+    return results
+
+
+def bulk_summary(entity: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Arma la respuesta estándar de los endpoints /bulk.
+    """
+    fallidos = sum(1 for result in results if result["estado"] == "error")
+    return {
+        "mensaje": f"Carga masiva de {entity} procesada",
+        "total": len(results),
+        "exitosos": len(results) - fallidos,
+        "fallidos": fallidos,
+        "resultados": results,
+    }
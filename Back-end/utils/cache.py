@@ -0,0 +1,120 @@
+"""
+Caché en memoria con TTL, tamaño máximo y desalojo LRU, más la respuesta
+desde una entrada cacheada.
+
+Las entradas guardan el cuerpo JSON ya serializado, así un acierto de caché no
+toca la base de datos ni vuelve a serializar. También guardan el cuerpo
+comprimido (gzip / br) la primera vez que se pide: un acierto tampoco vuelve a
+comprimir.
+
+El ETag y el 304 no salen de aquí: los endpoints cacheados están marcados con
+@versioned y ConditionalGetMiddleware responde con la versión de la tabla
+(utils/versions.py), antes de llegar al handler.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+from .compression import COMPRESSION_MIN_SIZE, MINIMUM_SIZE_SCOPE_KEY, compressed_body, negotiate_encoding
+from .serialization import dumps
+
+
+# ==================== ENTRADAS ====================
+
+@dataclass(frozen=True)
+class CacheEntry:
+    body: bytes
+    # Codificación ("gzip" / "br") -> cuerpo comprimido (se llena bajo demanda)
+    encoded: Dict[str, bytes] = field(default_factory=dict, compare=False, repr=False)
+
+
+def build_entry(payload: Any) -> CacheEntry:
+    """
+    Serializa el payload (JSON compacto con orjson).
+    """
+    return CacheEntry(body=dumps(payload))
+
+
+# ==================== CACHÉ TTL + LRU ====================
+
+class TTLCache:
+    """
+    Caché thread-safe: cada entrada expira a los `ttl` segundos y, al superar
+    `maxsize`, se desaloja la menos usada recientemente.
+
+    `generation` aumenta en cada `clear()`: un lector que consultó la base antes
+    de una invalidación pasa la generación que leyó a `set()` y su resultado
+    (ya obsoleto) se descarta en vez de quedar cacheado.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return value
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ==================== RESPUESTAS ====================
+
+def cached_json_response(
+    request: Request,
+    entry: CacheEntry,
+    cache_control: str = "no-cache",
+    extra_headers: Optional[dict] = None,
+) -> Response:
+    """
+    Retorna el cuerpo cacheado (precomprimido si el cliente lo acepta).
+    """
+    headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if extra_headers:
+        headers.update(extra_headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    # Mismo umbral que el CompressionMiddleware de la app (el global si no hay middleware)
+    minimum_size = request.scope.get(MINIMUM_SIZE_SCOPE_KEY, COMPRESSION_MIN_SIZE)
+    body = compressed_body(entry, encoding, minimum_size)
+    if body is None:
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
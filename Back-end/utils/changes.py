@@ -0,0 +1,217 @@
+"""
+Feed de cambios (insert / update / delete) con números de secuencia.
+
+Los handlers CRUD publican cada cambio después del commit. Cada evento recibe
+un `seq` creciente y queda en un buffer circular acotado (los más viejos se
+descartan). Desde ahí se sirven:
+
+- la consulta de recuperación `since(seq)`: los eventos posteriores a `seq`,
+  o un aviso de hueco si `seq` ya salió del buffer (el cliente debe recargar);
+- los suscriptores en vivo (SSE). Cada uno tiene una cola asyncio acotada. Si
+  un cliente lento la llena, se marca desbordado y su stream termina con un
+  evento "reset".
+
+Formato del evento: {"seq", "table", "op", "id", "data"}. "data" es la fila
+completa en insert/update y null en delete. Los clientes aplican insert/update
+como upsert por id.
+
+Con varios workers (ver database/change_log.py) el feed tiene una fuente
+externa: los seq son los del registro de la base, compartidos por todos los
+workers. En ese modo `publish` no numera nada y solo avisa a la fuente, que
+publica con `extend` lo que lee del registro.
+"""
+
+import asyncio
+import bisect
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
+
+from .serialization import dumps
+
+# Operaciones de cambio
+CHANGE_OPS = ("insert", "update", "delete")
+
+
+class Change:
+    __slots__ = ("seq", "table", "ts", "event", "frame")
+
+    def __init__(self, seq: int, table: str, op: str, entity_id: Any, data: Optional[dict],
+                 ts: Optional[float] = None):
+        self.seq = seq
+        self.table = table
+        self.ts = ts if ts is not None else time.time()
+        self.event = {"seq": seq, "table": table, "op": op, "id": entity_id, "data": data}
+        # Frame SSE serializado una sola vez, sin importar cuántos suscriptores haya
+        self.frame = b"id: %d\nevent: change\ndata: %s\n\n" % (seq, dumps(self.event))
+
+
+def _change_seq(change: Change) -> int:
+    return change.seq
+
+
+class Subscription:
+    """
+    Cola de un suscriptor en vivo, atada a su event loop.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[Change]]" = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def push(self, change: Change):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Despierta al lector aunque la cola esté llena: el stream termina con "reset"
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class ChangeFeed:
+    """
+    Buffer circular de cambios + suscriptores en vivo, thread-safe
+    (los handlers síncronos publican desde el threadpool).
+    """
+
+    def __init__(self, maxlen: int = 10000, subscriber_queue: int = 1000):
+        self.maxlen = maxlen
+        self.subscriber_queue = subscriber_queue
+        self._buffer: "deque[Change]" = deque(maxlen=maxlen)
+        self._subscribers: Set[Subscription] = set()
+        self._listeners: List[Callable[[Change], None]] = []
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.started_at = time.time()
+        # Fuente externa de cambios (ChangeLogFollower) o None si se publica en memoria
+        self.source = None
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def attach_source(self, source, start_seq: int):
+        """
+        Pasa el feed a modo externo: los seq siguen desde `start_seq` y los
+        cambios llegan solo por `extend`.
+        """
+        with self._lock:
+            self.source = source
+            self._seq = start_seq
+            self._buffer.clear()
+
+    def refresh(self):
+        """
+        Trae los cambios pendientes de la fuente externa (no hace nada sin fuente).
+        """
+        if self.source is not None:
+            self.source.refresh()
+
+    def publish(self, table: str, op: str, entity_id: Any, data: Optional[dict] = None) -> int:
+        """
+        Publica un cambio. Retorna: su seq
+        """
+        return self.publish_many(table, op, [(entity_id, data)])
+
+    def publish_many(self, table: str, op: str, rows: Iterable[Tuple[Any, Optional[dict]]]) -> int:
+        """
+        Publica varios cambios de la misma tabla con seq consecutivos.
+        Retorna: el seq del último
+        """
+        if op not in CHANGE_OPS:
+            raise ValueError(f"Operación de cambio desconocida: {op}")
+
+        if self.source is not None:
+            # Los triggers ya anotaron el cambio en la base: la fuente lo publica con su seq
+            self.source.notify()
+            return self._seq
+
+        with self._lock:
+            for entity_id, data in rows:
+                self._seq += 1
+                self._dispatch(Change(self._seq, table, op, entity_id, data))
+            return self._seq
+
+    def extend(self, events: Iterable[Tuple[int, str, str, Any, Optional[dict], float]]) -> int:
+        """
+        Publica cambios que ya traen su seq (de la fuente externa), en orden.
+        Si el primero no sigue al último publicado se perdieron eventos: el
+        buffer se vacía y los clientes con un seq anterior reciben un hueco.
+        Retorna: el seq del último
+        """
+        with self._lock:
+            for seq, table, op, entity_id, data, ts in events:
+                if seq <= self._seq:
+                    continue
+                if seq != self._seq + 1:
+                    self._buffer.clear()
+                self._seq = seq
+                self._dispatch(Change(seq, table, op, entity_id, data, ts))
+            return self._seq
+
+    def _dispatch(self, change: Change):
+        # Se llama dentro del lock: listeners y suscriptores reciben los seq en orden
+        self._buffer.append(change)
+        for listener in self._listeners:
+            listener(change)
+        for subscription in list(self._subscribers):
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, change)
+            except RuntimeError:
+                # El loop del suscriptor ya cerró
+                self._subscribers.discard(subscription)
+
+    def since(self, seq: int, tables: Optional[Set[str]] = None, limit: Optional[int] = None) -> Tuple[List[Change], bool]:
+        """
+        Cambios con seq > `seq` (filtrados por tabla si se indica), en orden.
+        Retorna: (cambios, hueco). `hueco` es True si faltan eventos (`seq` es
+        anterior al inicio del buffer o posterior al último) y el cliente debe
+        recargar desde cero.
+        """
+        with self._lock:
+            if seq > self._seq:
+                # Seq del futuro: el servidor se reinició y el buffer empezó de nuevo
+                return [], True
+            if seq == self._seq:
+                return [], False
+            oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+            gap = seq < oldest - 1
+            # Los seq del buffer son crecientes: búsqueda binaria del primero pendiente
+            start = bisect.bisect_right(self._buffer, seq, key=_change_seq)
+            changes = []
+            for change in islice(self._buffer, start, None):
+                if tables is None or change.table in tables:
+                    changes.append(change)
+                    if limit is not None and len(changes) >= limit:
+                        break
+            return changes, gap
+
+    def add_listener(self, listener: Callable[[Change], None]):
+        """
+        Registra una función que recibe cada cambio en orden de seq, de forma
+        síncrona dentro del lock del feed (debe ser rápida y no bloquear).
+        """
+        self._listeners.append(listener)
+
+    def subscribe(self) -> Subscription:
+        """
+        Registra un suscriptor en vivo (llamar desde el event loop que lo va a leer).
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.subscriber_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
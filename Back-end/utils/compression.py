@@ -0,0 +1,262 @@
+"""
+Compresión de respuestas (gzip y, si está instalado el paquete `brotli`, br)
+negociada con Accept-Encoding.
+
+- Solo se comprimen tipos de texto (JSON, NDJSON, CSV, ...) y cuerpos de al
+  menos COMPRESSION_MIN_SIZE bytes; por debajo el costo no compensa.
+- Las respuestas en streaming (exportaciones) se comprimen por partes: cada
+  chunk se vacía del compresor (flush) y el cliente lo recibe sin esperar al
+  resto. text/event-stream no se comprime: cada evento debe llegar al momento.
+- Si el handler ya envía Content-Encoding (entradas de caché precomprimidas,
+  ver `compressed_body`) la respuesta pasa sin tocar. El middleware deja su
+  umbral en el scope (MINIMUM_SIZE_SCOPE_KEY) para que esas entradas usen el
+  mismo que las respuestas al vuelo.
+- Un ETag fuerte pasa a débil (W/) al comprimir: el cuerpo ya no es idéntico
+  byte a byte, pero sí equivalente.
+"""
+
+import gzip
+import os
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tamaño mínimo del cuerpo para comprimir y nivel de cada codificación (respuestas al vuelo)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+
+# Clave del scope ASGI con el umbral del CompressionMiddleware que atiende la petición
+MINIMUM_SIZE_SCOPE_KEY = "compression.minimum_size"
+
+# Las entradas de caché se comprimen una sola vez: se usa el nivel máximo
+CACHED_GZIP_LEVEL = 9
+CACHED_BROTLI_QUALITY = 11
+
+# Preferencia del servidor cuando el cliente acepta varias con el mismo q
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+# ==================== NEGOCIACIÓN ====================
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Elige la codificación según Accept-Encoding (con valores q).
+    Retorna: "br", "gzip" o None (sin comprimir)
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+# ==================== COMPRESORES ====================
+
+def compress(body: bytes, encoding: str, gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY) -> bytes:
+    """
+    Comprime un cuerpo completo con la codificación indicada.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class StreamCompressor:
+    """
+    Compresor incremental: cada `chunk()` retorna los bytes comprimidos hasta ese
+    punto (flush) y `finish()` cierra el stream.
+    """
+
+    def __init__(self, encoding: str, gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31: formato gzip (cabecera + CRC)
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def compressed_body(entry, encoding: Optional[str], minimum_size: int = COMPRESSION_MIN_SIZE) -> Optional[bytes]:
+    """
+    Cuerpo precomprimido de una entrada de caché (CacheEntry) para `encoding`,
+    calculado la primera vez y guardado en la entrada.
+    Retorna: los bytes comprimidos o None si no corresponde comprimir
+    """
+    if encoding is None or len(entry.body) < minimum_size:
+        return None
+    body = entry.encoded.get(encoding)
+    if body is None:
+        body = compress(entry.body, encoding, CACHED_GZIP_LEVEL, CACHED_BROTLI_QUALITY)
+        entry.encoded[encoding] = body
+    return body
+
+
+# ==================== MIDDLEWARE ====================
+
+def _add_vary(headers: list) -> list:
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[index] = (name, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI de compresión. Las respuestas de un solo mensaje se
+    comprimen completas (con Content-Length); las de varios, por partes.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        scope[MINIMUM_SIZE_SCOPE_KEY] = self.minimum_size
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding)
+
+        start = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type, already_encoded = "", False
+                for name, value in headers:
+                    lowered = name.lower()
+                    if lowered == b"content-type":
+                        content_type = value.decode("latin-1")
+                    elif lowered == b"content-encoding":
+                        already_encoded = True
+
+                if already_encoded or message["status"] < 200 or message["status"] in (204, 304) \
+                        or not is_compressible(content_type):
+                    passthrough = True
+                    await send(message)
+                    return
+
+                # La respuesta depende de Accept-Encoding aunque esta vez no se comprima
+                message["headers"] = _add_vary(headers)
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+
+                # Se espera al primer chunk para decidir (tamaño y si hay más partes)
+                start = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                response_start, start = start, None
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(response_start)
+                    await send(message)
+                    return
+
+                headers = [
+                    (name, value) for name, value in response_start["headers"]
+                    if name.lower() != b"content-length"
+                ]
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+                for index, (name, value) in enumerate(headers):
+                    if name.lower() == b"etag" and not value.startswith(b"W/"):
+                        headers[index] = (name, b"W/" + value)
+
+                if not more_body:
+                    body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                    response_start["headers"] = headers
+                    await send(response_start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                compressor = StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                response_start["headers"] = headers
+                await send(response_start)
+
+            data = compressor.chunk(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
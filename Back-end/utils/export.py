@@ -0,0 +1,82 @@
+"""
+Exportación en streaming (NDJSON / CSV) de tablas completas.
+
+Las filas se leen del servidor en lotes (`yield_per`) y se codifican lote a
+lote hacia un StreamingResponse, de modo que la memoria usada no depende del
+tamaño de la tabla y el primer byte sale de inmediato.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from database.database import SessionLocal
+
+# ==================== CONFIGURACIÓN ====================
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+# ==================== CODIFICADORES ====================
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def _encode_ndjson(keys, rows) -> bytes:
+    lines = [
+        json.dumps(dict(zip(keys, row)), default=_json_default, ensure_ascii=False)
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+# ==================== STREAMING ====================
+
+def iter_export(columns, fmt: str, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Genera el contenido de la exportación en bloques de bytes.
+    Abre su propia sesión porque se consume después de que el endpoint retorna.
+    """
+    keys = [column.key for column in columns]
+
+    if fmt == "csv":
+        yield _encode_csv([keys])
+
+    db = SessionLocal()
+    try:
+        stmt = select(*columns).order_by(columns[0]).execution_options(yield_per=batch_size)
+        for rows in db.execute(stmt).partitions():
+            if fmt == "csv":
+                yield _encode_csv(rows)
+            else:
+                yield _encode_ndjson(keys, rows)
+    finally:
+        db.close()
+
+
+def export_response(columns, fmt: str, filename: str) -> StreamingResponse:
+    """
+    Construye la respuesta de exportación para las columnas indicadas.
+    La primera columna se usa como orden (debe ser la llave primaria).
+    """
+    return StreamingResponse(
+        iter_export(columns, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,411 @@
+"""
+Claves de idempotencia (header Idempotency-Key) para los POST de creación.
+
+Si un cliente reintenta un POST con la misma Idempotency-Key, la respuesta
+guardada del primer intento se devuelve tal cual (header Idempotent-Replayed: true).
+El handler no se vuelve a ejecutar, así que no se toca ninguna tabla principal.
+
+- Las respuestas se guardan por (método, path, clave) junto a un hash del
+  query string y del cuerpo. Si se reutiliza la misma clave con otro cuerpo u
+  otros parámetros (ej. /bulk?upsert=true y ?upsert=false), se responde 422.
+- Los duplicados concurrentes se coalescen: el primero ejecuta el handler y los
+  demás esperan su resultado. Dentro del proceso esperan un asyncio.Event. Entre
+  procesos, cuando hay persistencia, sondean la fila pendiente en SQLite.
+- Solo se guardan respuestas < 500. Ante un error del servidor la clave se
+  libera, así un reintento vuelve a ejecutar el handler.
+- Almacén: en memoria (TTL + LRU) y, de forma opcional, una tabla SQLite en un
+  archivo aparte, que sobrevive reinicios y se comparte entre workers.
+
+Configuración (variables de entorno, leídas en main.py):
+- IDEMPOTENCY_TTL: segundos que se guarda cada respuesta (default 86400).
+- IDEMPOTENCY_MAXSIZE: máximo de respuestas en memoria (default 10000).
+- IDEMPOTENCY_DB: ruta del archivo SQLite de persistencia (vacío = solo memoria).
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .serialization import dumps
+
+# Largo máximo aceptado para el header Idempotency-Key
+MAX_KEY_LENGTH = 255
+
+# Respuestas más grandes no se guardan (la clave se libera)
+MAX_STORED_BODY = 1024 * 1024
+
+# Segundos que una fila "pendiente" bloquea la clave a otros procesos
+PENDING_TTL = 60.0
+
+# Espera máxima de un duplicado concurrente y cada cuánto sondea SQLite
+WAIT_TIMEOUT = 30.0
+POLL_INTERVAL = 0.05
+
+# Cada cuántas escrituras se borran las filas vencidas de SQLite
+PURGE_EVERY = 1000
+
+# Resultado de claim() cuando otra petición ya está ejecutando la misma clave
+PENDING = object()
+
+# Headers de la respuesta original que no se guardan
+SKIPPED_HEADERS = {b"date", b"server", b"x-sql-profile"}
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status: int
+    headers: Tuple[Tuple[bytes, bytes], ...]
+    body: bytes
+
+
+# ==================== ALMACÉN ====================
+
+class IdempotencyStore:
+    """
+    Respuestas guardadas por clave, thread-safe.
+
+    `claim()` reserva la clave para quien va a ejecutar el handler. Después,
+    `complete()` guarda la respuesta o `release()` libera la clave si no se guarda.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 86400.0, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path or None
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._writes = 0
+        if self.path:
+            self._init_table()
+
+    # ---------- memoria ----------
+
+    def _get_memory(self, key: str) -> Optional[StoredResponse]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, stored = item
+        if expires_at < time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return stored
+
+    def _set_memory(self, key: str, stored: StoredResponse, expires_at: float):
+        self._data[key] = (expires_at, stored)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    # ---------- SQLite ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def _init_table(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency_keys ("
+                " key TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " status INTEGER,"
+                " headers BLOB,"
+                " body BLOB,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM idempotency_keys WHERE expires_at < ?", (time.time(),))
+        finally:
+            conn.close()
+
+    def _claim_persistent(self, key: str, fingerprint: str):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT fingerprint, status, headers, body, expires_at FROM idempotency_keys WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is not None and row[4] >= now:
+                conn.execute("COMMIT")
+                if row[1] is None:
+                    return PENDING
+                stored = StoredResponse(row[0], row[1], _decode_headers(row[2]), row[3])
+                with self._lock:
+                    self._set_memory(key, stored, row[4])
+                return stored
+            conn.execute(
+                "INSERT OR REPLACE INTO idempotency_keys (key, fingerprint, status, headers, body, expires_at)"
+                " VALUES (?, ?, NULL, NULL, NULL, ?)",
+                (key, fingerprint, now + PENDING_TTL)
+            )
+            conn.execute("COMMIT")
+            return None
+        finally:
+            conn.close()
+
+    # ---------- API ----------
+
+    def claim(self, key: str, fingerprint: str):
+        """
+        Retorna: StoredResponse si ya hay respuesta, PENDING si otra petición la
+        está ejecutando, o None si la clave queda reservada para quien llama.
+        """
+        with self._lock:
+            stored = self._get_memory(key)
+            if stored is not None:
+                return stored
+            if key in self._pending:
+                return PENDING
+            self._pending.add(key)
+
+        if not self.path:
+            return None
+        try:
+            result = self._claim_persistent(key, fingerprint)
+        except Exception:
+            self._discard_pending(key)
+            raise
+        if result is not None:
+            self._discard_pending(key)
+        return result
+
+    def complete(self, key: str, stored: StoredResponse):
+        expires_at = time.time() + self.ttl
+        if self.path:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO idempotency_keys (key, fingerprint, status, headers, body, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, stored.fingerprint, stored.status, _encode_headers(stored.headers), stored.body, expires_at)
+                )
+                self._writes += 1
+                if self._writes % PURGE_EVERY == 0:
+                    conn.execute("DELETE FROM idempotency_keys WHERE expires_at < ?", (time.time(),))
+            finally:
+                conn.close()
+        with self._lock:
+            self._set_memory(key, stored, expires_at)
+            self._pending.discard(key)
+
+    def release(self, key: str):
+        if self.path:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM idempotency_keys WHERE key = ? AND status IS NULL", (key,))
+            finally:
+                conn.close()
+        self._discard_pending(key)
+
+    def _discard_pending(self, key: str):
+        with self._lock:
+            self._pending.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        if self.path:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM idempotency_keys WHERE status IS NOT NULL")
+            finally:
+                conn.close()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _encode_headers(headers) -> bytes:
+    return b"\n".join(name + b":" + value for name, value in headers)
+
+
+def _decode_headers(raw: Optional[bytes]) -> tuple:
+    if not raw:
+        return ()
+    return tuple(tuple(line.split(b":", 1)) for line in raw.split(b"\n"))
+
+
+# ==================== MIDDLEWARE ====================
+
+class IdempotencyMiddleware:
+    """
+    Middleware ASGI que aplica Idempotency-Key a los `paths` indicados (solo POST).
+    Las peticiones sin el header pasan directo, sin costo adicional.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, paths: Iterable[str]):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(paths)
+        self._events: Dict[str, asyncio.Event] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        raw_key = None
+        for name, value in scope["headers"]:
+            if name == b"idempotency-key":
+                raw_key = value
+                break
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = raw_key.decode("latin-1").strip()
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, {
+                "detail": f"Idempotency-Key debe tener entre 1 y {MAX_KEY_LENGTH} caracteres"
+            })
+            return
+
+        body = await _read_body(receive)
+        key = f"{scope['method']} {scope['path']} {idempotency_key}"
+        fingerprint = request_fingerprint(scope.get("query_string", b""), body)
+
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while True:
+            if self.store.path:
+                claimed = await run_in_threadpool(self.store.claim, key, fingerprint)
+            else:
+                claimed = self.store.claim(key, fingerprint)
+
+            if claimed is None:
+                break
+            if claimed is not PENDING:
+                await self._replay(send, claimed, fingerprint)
+                return
+            if time.monotonic() >= deadline:
+                await _send_json(send, 409, {
+                    "detail": "Hay una petición en curso con la misma Idempotency-Key"
+                })
+                return
+            await self._wait(key, deadline)
+
+        await self._execute(scope, receive, send, body, key, fingerprint)
+
+    async def _wait(self, key: str, deadline: float):
+        """
+        Espera al dueño de la clave: el evento local si está en este proceso,
+        o un intervalo de sondeo si la tiene otro proceso (fila pendiente en SQLite).
+        """
+        event = self._events.get(key)
+        timeout = max(deadline - time.monotonic(), 0)
+        if event is None:
+            await asyncio.sleep(min(POLL_INTERVAL, timeout))
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _execute(self, scope, receive, send, body: bytes, key: str, fingerprint: str):
+        event = self._events[key] = asyncio.Event()
+        start = {}
+        chunks = []
+        stored = None
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+            content = b"".join(chunks)
+            status = start.get("status", 500)
+            if status < 500 and len(content) <= MAX_STORED_BODY:
+                headers = tuple(
+                    (bytes(name), bytes(value)) for name, value in start.get("headers", [])
+                    if name.lower() not in SKIPPED_HEADERS
+                )
+                stored = StoredResponse(fingerprint, status, headers, content)
+        finally:
+            try:
+                if stored is not None:
+                    await self._store_call(self.store.complete, key, stored)
+                else:
+                    await self._store_call(self.store.release, key)
+            finally:
+                del self._events[key]
+                event.set()
+
+    async def _store_call(self, fn, *args):
+        if self.store.path:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    @staticmethod
+    async def _replay(send, stored: StoredResponse, fingerprint: str):
+        if stored.fingerprint != fingerprint:
+            await _send_json(send, 422, {
+                "detail": "La Idempotency-Key ya se usó con un cuerpo o parámetros distintos"
+            })
+            return
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": list(stored.headers) + [(b"idempotent-replayed", b"true")],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+
+def request_fingerprint(query_string: bytes, body: bytes) -> str:
+    """
+    Hash de lo que define el resultado del POST: query string y cuerpo.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(query_string)
+    # Separador: el query string no puede contener un byte nulo sin codificar
+    digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _send_json(send, status: int, payload: dict):
+    body = dumps(payload)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
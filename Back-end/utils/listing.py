@@ -0,0 +1,68 @@
+"""
+Parámetros de los endpoints de listado: ?fields= (columnas) y ?sort= (orden).
+
+Ambos se traducen a SQL: `fields` reduce el SELECT a las columnas pedidas (y
+solo esas se serializan) y `sort` pasa al ORDER BY del keyset (ver
+utils/pagination.py). Los nombres se validan contra las columnas públicas de
+cada entidad, así nunca llega texto del cliente a la consulta.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+
+def _by_key(columns: Sequence) -> dict:
+    return {column.key: column for column in columns}
+
+
+def parse_fields(fields: Optional[str], columns: Sequence, pk_column, sort_column=None) -> Tuple:
+    """
+    Valida ?fields=a,b,c contra `columns`.
+    La PK y la columna de orden siempre se incluyen (las necesita el cursor).
+    Retorna: las columnas a seleccionar, en el orden de `columns`
+    """
+    if not fields:
+        return tuple(columns)
+
+    available = _by_key(columns)
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(available)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos: {', '.join(sorted(unknown))}. Opciones: {', '.join(available)}"
+        )
+
+    requested.add(pk_column.key)
+    if sort_column is not None:
+        requested.add(sort_column.key)
+    return tuple(column for column in columns if column.key in requested)
+
+
+def parse_sort(sort: Optional[str], columns: Sequence, pk_column):
+    """
+    Valida ?sort=columna (ascendente) o ?sort=-columna (descendente).
+    Solo se ordena por columnas NOT NULL: el keyset (columna, PK) no admite NULL.
+    Retorna: (columna de orden o None para el orden por PK, descendente)
+    """
+    if not sort:
+        return None, False
+
+    descending = sort.startswith("-")
+    name = sort[1:] if descending else sort
+    sortable = {
+        key: column for key, column in _by_key(columns).items()
+        if column is pk_column or not column.nullable
+    }
+    if name not in sortable:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Orden no válido: {sort}. Opciones: {', '.join(sortable)} (con - para descendente)"
+        )
+
+    column = sortable[name]
+    if column is pk_column and not descending:
+        # Igual al orden por defecto (y al mismo formato de cursor)
+        return None, False
+    return column, descending
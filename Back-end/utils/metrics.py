@@ -0,0 +1,164 @@
+"""
+Métricas HTTP por ruta en formato de texto de Prometheus.
+
+`MetricsMiddleware` es un middleware ASGI puro (sin BaseHTTPMiddleware) que
+registra, por método y plantilla de ruta (`/api/users/{user_id}`, no el path
+concreto, para no disparar la cardinalidad):
+
+- histograma de latencia (`http_request_duration_seconds`)
+- contador de respuestas por código de estado (`http_requests_total`)
+- peticiones en curso (`http_requests_in_flight`)
+
+Todo se actualiza desde el event loop (un solo hilo), así que no hace falta
+lock: el costo por petición es una búsqueda en dict y unas sumas.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+
+# Buckets por defecto de los clientes de Prometheus (segundos)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Plantilla usada cuando ninguna ruta coincide (404): evita una serie por path
+UNMATCHED_ROUTE = "unmatched"
+
+# Tope de paths concretos memorizados para resolver su plantilla
+MAX_CACHED_PATHS = 10000
+
+
+# ==================== REGISTRO ====================
+
+class MetricsRegistry:
+    """
+    Acumula las métricas por (método, plantilla) y las exporta en texto de Prometheus.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # (método, ruta) -> [conteos por bucket (+Inf al final), suma, total]
+        self._latency: Dict[Tuple[str, str], list] = {}
+        self._status: Dict[Tuple[str, str, int], int] = {}
+        self._in_flight: Dict[Tuple[str, str], int] = {}
+
+    def start(self, key: Tuple[str, str]):
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def finish(self, key: Tuple[str, str], status: int, duration: float):
+        self._in_flight[key] -= 1
+
+        stats = self._latency.get(key)
+        if stats is None:
+            stats = self._latency[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        stats[0][bisect_left(self.buckets, duration)] += 1
+        stats[1] += duration
+        stats[2] += 1
+
+        status_key = (key[0], key[1], status)
+        self._status[status_key] = self._status.get(status_key, 0) + 1
+
+    def render(self) -> str:
+        """
+        Retorna todas las métricas en el formato de exposición de texto 0.0.4.
+        """
+        lines: List[str] = [
+            "# HELP http_requests_total Respuestas HTTP por método, ruta y código de estado.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self._status.items()):
+            lines.append(
+                f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+            )
+
+        lines += [
+            "# HELP http_requests_in_flight Peticiones HTTP en curso por método y ruta.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for (method, route), value in sorted(self._in_flight.items()):
+            lines.append(f'http_requests_in_flight{{method="{method}",route="{_escape(route)}"}} {value}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Latencia de las peticiones HTTP por método y ruta.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), (counts, total_sum, total) in sorted(self._latency.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {total_sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {total}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        self._latency.clear()
+        self._status.clear()
+        self._in_flight = {key: value for key, value in self._in_flight.items() if value}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+# ==================== MIDDLEWARE ====================
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide cada petición HTTP y la registra en `registry`.
+    `routes` es la lista de rutas de la app (app.router.routes) para resolver la plantilla.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry, routes: list):
+        self.app = app
+        self.registry = registry
+        self.routes = routes
+        self._templates: Dict[Tuple[str, str], str] = {}
+
+    def _route_template(self, scope) -> str:
+        cache_key = (scope["method"], scope["path"])
+        template = self._templates.get(cache_key)
+        if template is not None:
+            return template
+
+        # Misma resolución que el router (regex del path + método), sin construir el scope hijo
+        template = UNMATCHED_ROUTE
+        method, path = cache_key
+        for route in self.routes:
+            path_regex = getattr(route, "path_regex", None)
+            if path_regex is None or not path_regex.match(path):
+                continue
+            methods = getattr(route, "methods", None)
+            if not methods or method in methods:
+                template = route.path
+                break
+            if template == UNMATCHED_ROUTE:
+                template = route.path
+
+        if len(self._templates) >= MAX_CACHED_PATHS:
+            self._templates.clear()
+        self._templates[cache_key] = template
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["method"], self._route_template(scope))
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        self.registry.start(key)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.finish(key, status_holder[0], time.perf_counter() - start)
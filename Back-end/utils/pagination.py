@@ -0,0 +1,156 @@
+"""
+Paginación por cursor (keyset) para los endpoints de listado.
+
+En lugar de OFFSET se filtra por la llave primaria (`WHERE id > ultimo_id
+ORDER BY id LIMIT n`), así cada página usa el índice de la PK y su costo no
+depende del tamaño de la tabla ni de qué tan lejos esté la página.
+
+Con `?sort=` el keyset es (columna de orden, PK): `WHERE (k, id) > (:k, :id)`
+(o `<` en orden descendente), que SQLite resuelve con el índice de la columna
+si existe. El cursor guarda también la columna de orden para rechazar cursores
+de otro orden.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+# ==================== CONFIGURACIÓN ====================
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+# ==================== CURSORES ====================
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Codifica el último ID entregado como un cursor opaco para el cliente.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Decodifica un cursor recibido del cliente.
+    Retorna: el último ID entregado, None si no hay cursor o 400 si es inválido
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = data["id"]
+        # "s" marca un cursor de un listado con ?sort= (ver encode_sort_cursor)
+        if not isinstance(last_id, int) or "s" in data:
+            raise ValueError(last_id)
+        return last_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
+
+
+def _sort_name(sort_column, descending: bool) -> str:
+    return ("-" if descending else "") + sort_column.key
+
+
+def encode_sort_cursor(sort_column, descending: bool, value: Any, last_id: int) -> str:
+    """
+    Codifica la posición (valor de la columna de orden, último ID) de un listado con ?sort=.
+    """
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    data = {"s": _sort_name(sort_column, descending), "k": value, "id": last_id}
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sort_cursor(cursor: Optional[str], sort_column, descending: bool) -> Optional[Tuple[Any, int]]:
+    """
+    Decodifica un cursor de `encode_sort_cursor` para el mismo orden.
+    Retorna: (valor de la columna de orden, último ID), None si no hay cursor o 400 si es inválido
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data["s"] != _sort_name(sort_column, descending) or not isinstance(data["id"], int):
+            raise ValueError(data)
+        value = data["k"]
+        python_type = sort_column.type.python_type
+        if python_type in (date, datetime):
+            value = python_type.fromisoformat(value)
+        elif not isinstance(value, python_type):
+            raise ValueError(value)
+        return value, data["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
+
+
+# ==================== CONSULTA ====================
+
+def _keyset(pk_column, cursor: Optional[str], sort_column, descending: bool):
+    """
+    Retorna: (condición WHERE para continuar desde el cursor o None, columnas ORDER BY)
+    """
+    if sort_column is None or sort_column is pk_column:
+        order = pk_column.desc() if descending else pk_column
+        if sort_column is None:
+            last_id = decode_cursor(cursor)
+        else:
+            position = decode_sort_cursor(cursor, pk_column, descending)
+            last_id = position[1] if position else None
+        if last_id is None:
+            return None, (order,)
+        return (pk_column < last_id if descending else pk_column > last_id), (order,)
+
+    order = (sort_column.desc(), pk_column.desc()) if descending else (sort_column, pk_column)
+    position = decode_sort_cursor(cursor, sort_column, descending)
+    if position is None:
+        return None, order
+    keyset, after = tuple_(sort_column, pk_column), tuple_(*position)
+    return (keyset < after if descending else keyset > after), order
+
+
+def _next_cursor(rows, limit: int, pk_column, sort_column, descending: bool):
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last_id = getattr(rows[-1], pk_column.key)
+    if sort_column is None:
+        return rows, encode_cursor(last_id)
+    return rows, encode_sort_cursor(sort_column, descending, getattr(rows[-1], sort_column.key), last_id)
+
+
+def paginate(query, pk_column, cursor: Optional[str], limit: int, sort_column=None, descending: bool = False):
+    """
+    Aplica la paginación keyset a una consulta ordenada por `pk_column`, o por
+    (`sort_column`, `pk_column`) si se indica. La consulta debe seleccionar ambas columnas.
+    Retorna: (filas de la página, next_cursor o None si es la última página)
+    """
+    condition, order = _keyset(pk_column, cursor, sort_column, descending)
+    if condition is not None:
+        query = query.filter(condition)
+
+    # Se pide una fila extra para saber si existe una página siguiente
+    rows = query.order_by(*order).limit(limit + 1).all()
+    return _next_cursor(rows, limit, pk_column, sort_column, descending)
+
+
+async def paginate_async(db, stmt, pk_column, cursor: Optional[str], limit: int, sort_column=None, descending: bool = False):
+    """
+    Versión asíncrona de `paginate` para un `select()` ejecutado con AsyncSession.
+    Retorna: (filas de la página, next_cursor o None si es la última página)
+    """
+    condition, order = _keyset(pk_column, cursor, sort_column, descending)
+    if condition is not None:
+        stmt = stmt.where(condition)
+
+    result = await db.execute(stmt.order_by(*order).limit(limit + 1))
+    rows = result.all()
+    return _next_cursor(rows, limit, pk_column, sort_column, descending)
@@ -0,0 +1,76 @@
+"""
+Búsqueda de texto completo y por prefijo sobre las tablas FTS5.
+
+El texto del usuario se normaliza a términos entre comillas con `*` (prefijo),
+así "kev cor" encuentra "Kevin Correa" y caracteres como `"` o `:` no rompen la
+sintaxis de MATCH. Los resultados se ordenan por relevancia (bm25).
+
+Calcular bm25 exige puntuar todas las coincidencias, lo que con prefijos muy
+cortos ("ma") son cientos de miles de filas. Si la consulta tiene más de
+RANK_CANDIDATE_LIMIT coincidencias se devuelve en orden de id (sin ranking),
+que FTS5 entrega sin puntuar; el typeahead se vuelve a ordenar por relevancia
+en cuanto el texto es más específico.
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import column, table, text
+
+from utils.pagination import decode_cursor, encode_cursor
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_SEARCH_LIMIT = 20
+RANK_CANDIDATE_LIMIT = 500
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_fts_query(q: str) -> Optional[str]:
+    """
+    Convierte el texto libre en una consulta FTS5 de prefijos (AND implícito).
+    Retorna: la consulta o None si no hay términos buscables
+    """
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def fts_search(db, columns, pk_column, fts_name: str, q: str, cursor: Optional[str], limit: int):
+    """
+    Busca `q` en la tabla FTS `fts_name` y retorna las filas (`columns`) por relevancia.
+    El cursor es opaco (codifica la posición dentro del ranking).
+    Retorna: (filas de la página, next_cursor o None si es la última página)
+    """
+    fts_query = build_fts_query(q)
+    if fts_query is None:
+        return [], None
+
+    offset = decode_cursor(cursor) or 0
+    candidates = db.execute(
+        text(f"SELECT COUNT(*) FROM (SELECT 1 FROM {fts_name} WHERE {fts_name} MATCH :fts_query LIMIT :cap)"),
+        {"fts_query": fts_query, "cap": RANK_CANDIDATE_LIMIT + 1},
+    ).scalar()
+    if not candidates:
+        return [], None
+
+    fts = table(fts_name, column("rowid"), column("rank"))
+    order = fts.c.rank if candidates <= RANK_CANDIDATE_LIMIT else fts.c.rowid
+    rows = (
+        db.query(*columns)
+        .select_from(fts)
+        .join(pk_column.class_, pk_column == fts.c.rowid)
+        .filter(text(f"{fts_name} MATCH :fts_query"))
+        .params(fts_query=fts_query)
+        .order_by(order)
+        .offset(offset)
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(offset + limit)
+
+    return rows, next_cursor
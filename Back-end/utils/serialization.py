@@ -0,0 +1,45 @@
+"""
+Serialización rápida de respuestas.
+
+Los listados seleccionan columnas (tuplas) en vez de entidades ORM completas y
+el resultado se codifica directo a bytes JSON con orjson, sin pasar por
+`jsonable_encoder`. La forma de las respuestas no cambia: las fechas salen en
+ISO 8601 igual que con el codificador por defecto de FastAPI.
+"""
+
+from typing import Any, Dict, Iterable, List
+
+import orjson
+from fastapi.responses import Response
+
+
+class FastJSONResponse(Response):
+    """
+    JSONResponse que codifica con orjson (datetime/date nativos, sin jsonable_encoder).
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+def rows_to_dicts(rows: Iterable) -> List[Dict[str, Any]]:
+    """
+    Convierte filas de columnas (Row de SQLAlchemy) en dicts {columna: valor}.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def entity_dict(entity, columns) -> Dict[str, Any]:
+    """
+    Convierte una entidad ORM en dict usando solo las columnas públicas indicadas.
+    """
+    return {column.key: getattr(entity, column.key) for column in columns}
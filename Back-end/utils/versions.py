@@ -0,0 +1,244 @@
+"""
+Versiones por tabla y por fila para GET condicionales (ETag / 304 Not Modified).
+
+Cada cambio publicado en el feed (ver utils/changes.py) sube la versión de su
+tabla y la de su fila: la versión es el `seq` del último cambio. Con eso:
+
+- listados: ETag = versión de las tablas que lee el endpoint + hash del query string
+- detalle: ETag = versión de la fila (más las tablas de ?expand)
+
+`ConditionalGetMiddleware` compara If-None-Match con el ETag actual antes de
+entrar al router. Si coincide responde 304 sin validar parámetros, sin abrir
+sesión y sin consultar ninguna fila, así que el polling sin cambios casi no
+cuesta. Si no coincide, deja pasar la petición y agrega ETag y Last-Modified
+a la respuesta 200.
+
+Las versiones viven en memoria del proceso. `epoch` (inicio del proceso) va en
+el ETag, así un reinicio invalida todos los ETag emitidos antes. Con varios
+workers las versiones salen del registro de cambios de la base
+(database/change_log.py): `rebase` pone el epoch de la base y el seq desde el
+que se sigue, y el middleware se pone al día con el registro antes de comparar.
+"""
+
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+
+
+# Filas con versión propia que se recuerdan; las más viejas comparten la versión "piso"
+MAX_ROW_VERSIONS = 100000
+
+# Tope de paths concretos memorizados para resolver su ruta
+MAX_CACHED_PATHS = 10000
+
+
+# ==================== VERSIONES ====================
+
+class TableVersions:
+    """
+    Versión (seq, momento) por tabla y por fila. Se alimenta con `record`,
+    que se registra como listener del ChangeFeed.
+    """
+
+    def __init__(self, max_rows: int = MAX_ROW_VERSIONS):
+        self.max_rows = max_rows
+        self.started_at = time.time()
+        self.epoch = format(int(self.started_at * 1000), "x")
+        self._tables: Dict[str, Tuple[int, float]] = {}
+        self._rows: "OrderedDict[Tuple[str, str], Tuple[int, float]]" = OrderedDict()
+        # Por tabla: la versión más alta de las filas desalojadas de `_rows`
+        self._floors: Dict[str, Tuple[int, float]] = {}
+        # Versión de lo que no cambió desde que se empezó a contar
+        self._base: Tuple[int, float] = (0, self.started_at)
+
+    def rebase(self, epoch: str, seq: int, moment: float):
+        """
+        Empieza a contar desde `seq` del registro compartido: todas las tablas y
+        filas sin cambios posteriores tienen esa versión (igual en cada worker
+        que use el mismo `seq`).
+        """
+        self.epoch = epoch
+        self.started_at = moment
+        self._base = (seq, moment)
+        self._tables.clear()
+        self._rows.clear()
+        self._floors.clear()
+
+    def record(self, change):
+        """
+        Listener del feed de cambios (se llama dentro de su lock, en orden de seq).
+        """
+        version = (change.seq, change.ts)
+        self._tables[change.table] = version
+        key = (change.table, str(change.event["id"]))
+        self._rows[key] = version
+        self._rows.move_to_end(key)
+        if len(self._rows) > self.max_rows:
+            (table, _), evicted = self._rows.popitem(last=False)
+            self._floors[table] = max(self._floors.get(table, self._base), evicted)
+
+    def table(self, table: str) -> Tuple[int, float]:
+        return self._tables.get(table, self._base)
+
+    def row(self, table: str, row_id: str) -> Tuple[int, float]:
+        version = self._rows.get((table, row_id))
+        if version is not None:
+            return version
+        # Sin versión propia: no cambió desde el inicio o ya se desalojó (se usa el piso)
+        return self._floors.get(table, self._base)
+
+
+# ==================== MARCA DE ENDPOINTS ====================
+
+@dataclass(frozen=True)
+class VersionSpec:
+    tables: Tuple[str, ...] = ()
+    row: Optional[Tuple[str, str]] = None
+    expand: Dict[str, str] = field(default_factory=dict)
+
+
+def versioned(*tables: str, row: Optional[Tuple[str, str]] = None, expand: Optional[Dict[str, str]] = None):
+    """
+    Marca un endpoint GET para responder con ETag por versión.
+    - tables: tablas que lee el endpoint
+    - row: (tabla, parámetro del path con el id) para los endpoints de detalle
+    - expand: valor de ?expand -> tabla que se suma si se pide
+    """
+    spec = VersionSpec(tuple(tables), row, dict(expand or {}))
+
+    def decorator(endpoint):
+        endpoint.__version_spec__ = spec
+        return endpoint
+
+    return decorator
+
+
+# ==================== MIDDLEWARE ====================
+
+def etag_matches_header(header: str, etag: str) -> bool:
+    """
+    Compara el valor de If-None-Match con el ETag (comparación débil: ignora W/).
+    """
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+class ConditionalGetMiddleware:
+    """
+    Middleware ASGI de GET condicional para los endpoints marcados con @versioned.
+    `routes` es la lista de rutas de la app (app.router.routes). `source` es el
+    seguidor del registro de cambios compartido (varios workers) o None.
+    """
+
+    def __init__(self, app, versions: TableVersions, routes: list, cache_control: str = "no-cache", source=None):
+        self.app = app
+        self.versions = versions
+        self.routes = routes
+        self.source = source
+        self.cache_control = cache_control.encode("latin-1")
+        self._resolved: Dict[str, Optional[tuple]] = {}
+
+    def _resolve(self, path: str) -> Optional[tuple]:
+        """
+        Retorna: (spec, parámetros del path) de la ruta GET que atiende `path`,
+        o None si esa ruta no está marcada. Misma precedencia que el router.
+        """
+        if path in self._resolved:
+            return self._resolved[path]
+
+        resolved = None
+        for route in self.routes:
+            path_regex = getattr(route, "path_regex", None)
+            methods = getattr(route, "methods", None)
+            if path_regex is None or (methods and "GET" not in methods):
+                continue
+            match = path_regex.match(path)
+            if match:
+                spec = getattr(getattr(route, "endpoint", None), "__version_spec__", None)
+                if spec is not None:
+                    resolved = (spec, match.groupdict())
+                break
+
+        if len(self._resolved) >= MAX_CACHED_PATHS:
+            self._resolved.clear()
+        self._resolved[path] = resolved
+        return resolved
+
+    def _etag(self, scope, spec: VersionSpec, params: dict) -> Tuple[str, float]:
+        versions = [self.versions.table(table) for table in spec.tables]
+        if spec.row is not None:
+            table, param = spec.row
+            versions.append(self.versions.row(table, params.get(param, "")))
+
+        query_string = scope.get("query_string", b"")
+        if spec.expand and query_string:
+            expand = parse_qs(query_string.decode("latin-1")).get("expand", [""])[0]
+            for name in expand.split(","):
+                table = spec.expand.get(name.strip())
+                if table is not None:
+                    versions.append(self.versions.table(table))
+
+        tag = ".".join(str(seq) for seq, _ in versions)
+        etag = '"%s-%s-%x"' % (self.versions.epoch, tag, zlib.crc32(query_string))
+        modified_at = max((moment for _, moment in versions), default=self.versions.started_at)
+        return etag, modified_at
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        resolved = self._resolve(scope["path"])
+        if resolved is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Otro worker pudo escribir: si el registro avanzó se aplica antes de calcular el ETag
+        # (también vacía la caché de planes). Sin cambios es una sola consulta de MAX(seq),
+        # pero sigue siendo E/S de SQLite: va al threadpool para no bloquear el event loop.
+        if self.source is not None:
+            await run_in_threadpool(self.source.refresh)
+
+        # La versión se lee antes de consultar: si hay una escritura en medio, el
+        # ETag queda más viejo que los datos y el siguiente GET descarga de nuevo
+        etag, modified_at = self._etag(scope, *resolved)
+        headers = [
+            (b"etag", b"W/" + etag.encode("latin-1")),
+            (b"last-modified", formatdate(modified_at, usegmt=True).encode("latin-1")),
+        ]
+
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+        if if_none_match and etag_matches_header(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": headers + [(b"cache-control", self.cache_control)],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                # El ETag por versión reemplaza cualquier ETag del handler
+                existing = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in (b"etag", b"last-modified")
+                ]
+                if not any(name.lower() == b"cache-control" for name, _ in existing):
+                    existing.append((b"cache-control", self.cache_control))
+                message["headers"] = existing + headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
-import { reservasAPI } from '../services/api';
+import { reservasAPI, subscribeChanges } from '../services/api';
 import { validations } from '../utils/validations';
+import { applyChange } from '../utils/applyChange';
 
 export const useReservas = () => {
   const [reservas, setReservas] = useState([]);
@@ -16,6 +17,11 @@ export const useReservas = () => {
 
   useEffect(() => {
     fetchReservas();
+    // Las escrituras (propias o de otros clientes) llegan como deltas por SSE
+    return subscribeChanges('reservas', {
+      onChange: (change) => setReservas(prev => applyChange(prev, change, 'id_reserva')),
+      onReset: fetchReservas
+    });
   }, []);
 
   const fetchReservas = async () => {
@@ -76,7 +82,6 @@ export const useReservas = () => {
         alert('Reserva creada exitosamente');
       }
       resetForm();
-      fetchReservas();
     } catch (error) {
       console.error('Error saving reserva:', error);
       const errorMessage = error.response?.data?.detail || 'Error al guardar la reserva';
@@ -99,7 +104,6 @@ export const useReservas = () => {
       try {
         await reservasAPI.delete(id);
         alert('Reserva eliminada exitosamente');
-        fetchReservas();
       } catch (error) {
         console.error('Error deleting reserva:', error);
         const errorMessage = error.response?.data?.detail || 'Error al eliminar la reserva';
@@ -4,8 +4,9 @@
  */
 
 import { useState, useEffect } from 'react';
-import { usersAPI } from '../services/api';
+import { usersAPI, subscribeChanges } from '../services/api';
 import { validations } from '../utils/validations';
+import { applyChange } from '../utils/applyChange';
 
 export const useUsers = () => {
   // ==================== ESTADOS ====================
@@ -26,6 +27,11 @@ export const useUsers = () => {
   // ==================== EFECTOS ====================
   useEffect(() => {
     fetchUsers();
+    // Las escrituras (propias o de otros clientes) llegan como deltas por SSE
+    return subscribeChanges('users', {
+      onChange: (change) => setUsers(prev => applyChange(prev, change, 'id_usuario')),
+      onReset: fetchUsers
+    });
   }, []);
 
   // ==================== FUNCIONES DE CARGA ====================
@@ -99,7 +105,6 @@ export const useUsers = () => {
         alert('Usuario creado exitosamente');
       }
       resetForm();
-      fetchUsers();
     } catch (error) {
       console.error('Error saving user:', error);
       // Mostrar mensaje de error específico del backend
@@ -125,7 +130,6 @@ export const useUsers = () => {
       try {
         await usersAPI.delete(id);
         alert('Usuario eliminado exitosamente');
-        fetchUsers();
       } catch (error) {
         console.error('Error deleting user:', error);
         // Mostrar mensaje de error específico del backend
@@ -9,9 +9,29 @@ const api = axios.create({
   },
 });
 
+// Columnas que muestran las tablas (?fields=): el backend solo consulta y envía esas
+const USER_FIELDS = 'nombre_usuario,correo_usuario,telefono_usuario';
+const RESERVA_FIELDS = 'nombre_destino,monto_reserva,cuotas_reserva';
+
+// Máximo de filas por página que acepta el backend (MAX_LIMIT en utils/pagination.py)
+const PAGE_LIMIT = 1000;
+
+// Los listados van por páginas (cursor): se siguen los next_cursor hasta el final
+const getAllPages = async (path, key, fields) => {
+  const rows = [];
+  let cursor = null;
+  do {
+    const params = { fields, limit: PAGE_LIMIT, ...(cursor ? { cursor } : {}) };
+    const { data } = await api.get(path, { params });
+    rows.push(...(data[key] || []));
+    cursor = data.next_cursor;
+  } while (cursor);
+  return rows;
+};
+
 // ==================== USERS API ====================
 export const usersAPI = {
-  getAll: () => api.get('/users/').then(res => res.data.usuarios || []),
+  getAll: () => getAllPages('/users/', 'usuarios', USER_FIELDS),
   getById: (id) => api.get(`/users/${id}`).then(res => res.data),
   create: (data) => api.post('/users/', data).then(res => res.data),
   update: (id, data) => api.put(`/users/${id}`, data).then(res => res.data),
@@ -21,9 +41,21 @@ export const usersAPI = {
 
 // ==================== RESERVAS API ====================
 export const reservasAPI = {
-  getAll: () => api.get('/reservas/').then(res => res.data.reservas || []),
+  getAll: () => getAllPages('/reservas/', 'reservas', RESERVA_FIELDS),
   create: (data) => api.post('/reservas/', data).then(res => res.data),
   update: (id, data) => api.put(`/reservas/${id}`, data).then(res => res.data),
   delete: (id) => api.delete(`/reservas/${id}`).then(res => res.data),
 };
+
+// ==================== CAMBIOS (SSE) ====================
+// Recibe los cambios de una tabla en vivo. El navegador reconecta solo y el
+// backend reenvía los eventos perdidos (Last-Event-ID). onReset avisa que se
+// perdieron eventos y hay que recargar la tabla. Retorna la función para cerrar.
+export const subscribeChanges = (table, { onChange, onReset }) => {
+  const source = new EventSource(`${API_URL}/changes/stream?tables=${table}`);
+  source.addEventListener('change', (event) => onChange(JSON.parse(event.data)));
+  source.addEventListener('reset', () => onReset());
+  return () => source.close();
+};
+
 export default api;
@@ -0,0 +1,14 @@
+// Aplica un evento del feed de cambios a una lista de entidades.
+// insert/update reemplazan (o agregan) la entidad por su id; delete la quita.
+export const applyChange = (items, change, idKey) => {
+  if (change.op === 'delete') {
+    return items.filter(item => item[idKey] !== change.id);
+  }
+  const index = items.findIndex(item => item[idKey] === change.id);
+  if (index === -1) {
+    return [...items, change.data];
+  }
+  const next = [...items];
+  next[index] = change.data;
+  return next;
+};